@@ -0,0 +1,321 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+from bitmap_index import BITMAP_MAX_CARDINALITY, normalize_value
+
+# 분위수 스케치의 상대 오차 (구간을 로그 간격으로 나눠, 분위수를 실제 값의 ±1% 이내로 근사)
+SKETCH_RELATIVE_ACCURACY = 0.01
+# 절댓값이 이보다 작은 값은 0 구간에 모음
+SKETCH_MIN_VALUE = 1e-9
+# 히스토그램 차트의 표시 구간 수
+HISTOGRAM_BINS = 64
+
+_GAMMA = (1 + SKETCH_RELATIVE_ACCURACY) / (1 - SKETCH_RELATIVE_ACCURACY)
+_LOG_GAMMA = np.log(_GAMMA)
+
+
+def sketch_keys(magnitudes):
+    """양수 값의 로그 구간 번호 (구간 k는 (gamma^(k-1), gamma^k])"""
+    return np.ceil(np.log(magnitudes) / _LOG_GAMMA).astype(np.int64)
+
+
+def sketch_values(keys):
+    """로그 구간의 대표값 (구간 안의 모든 값과의 상대 오차가 SKETCH_RELATIVE_ACCURACY 이하)"""
+    return 2 * np.power(_GAMMA, np.asarray(keys, dtype=np.float64)) / (_GAMMA + 1)
+
+
+class SketchBuckets:
+    """
+    그룹별 로그 구간 개수 (부호별로 하나씩 사용).
+
+    모든 그룹이 같은 구간 범위(offset부터 연속된 구간 번호)를 공유하므로 그룹 간 합치기는 행을 더하는 것이고,
+    범위 밖 값이 추가되면 양 끝으로 배열을 넓혀 값을 끝 구간에 몰아넣지 않습니다.
+    """
+
+    def __init__(self, num_groups, offset=0, width=0):
+        self.offset = offset
+        self.counts = np.zeros((num_groups, width), dtype=np.int64)
+
+    def add(self, group_index, keys):
+        if len(keys) == 0:
+            return
+        self.widen(int(keys.min()), int(keys.max()))
+        num_groups, width = self.counts.shape
+        counts = np.bincount(group_index * width + (keys - self.offset), minlength=num_groups * width)
+        self.counts += counts.reshape(num_groups, width)
+
+    def widen(self, low, high):
+        """구간 번호 low~high가 들어가도록 범위를 넓힘"""
+        width = self.counts.shape[1]
+        if width:
+            if self.offset <= low and high < self.offset + width:
+                return
+            low, high = min(low, self.offset), max(high, self.offset + width - 1)
+        widened = np.zeros((self.counts.shape[0], high - low + 1), dtype=np.int64)
+        widened[:, self.offset - low:self.offset - low + width] = self.counts
+        self.offset, self.counts = low, widened
+
+    def grow(self, num_groups):
+        """그룹 수를 늘림 (새 그룹은 빈 구간)"""
+        grown = SketchBuckets(num_groups, self.offset, self.counts.shape[1])
+        grown.counts[:len(self.counts)] = self.counts
+        return grown
+
+    def merge(self, groups, cells, num_groups):
+        """cells의 구간 개수를 groups 번호별로 더한 새 SketchBuckets"""
+        merged = SketchBuckets(num_groups, self.offset, self.counts.shape[1])
+        np.add.at(merged.counts, groups, self.counts[cells])
+        return merged
+
+    def values(self):
+        return sketch_values(np.arange(self.offset, self.offset + self.counts.shape[1]))
+
+
+class MetricSummary:
+    """
+    그룹(조작 변인 값)별 지표 요약.
+
+    행 수/합/제곱합/최소/최대와 로그 간격 분위수 스케치(DDSketch 방식)만 보관하므로 여러 셀의 요약을
+    더해서 합칠 수 있고, 분위수는 값 분포와 관계없이 실제 값의 상대 오차 SKETCH_RELATIVE_ACCURACY 이내입니다.
+    """
+
+    def __init__(self, groups, rows, count, total, sumsq, minimum, maximum, positive, negative, zeros):
+        self.groups = list(groups)
+        self.rows = rows
+        self.count = count
+        self.total = total
+        self.sumsq = sumsq
+        self.minimum = minimum
+        self.maximum = maximum
+        self.positive = positive
+        self.negative = negative
+        self.zeros = zeros
+
+    @classmethod
+    def from_values(cls, groups, group_index, values):
+        """그룹 번호 배열과 지표 값 배열로 요약 생성 (큐브가 없는 조건일 때 선택된 행으로 계산)"""
+        summary = cls.empty(groups)
+        summary._add(np.asarray(group_index, dtype=np.int64), np.asarray(values, dtype=np.float64))
+        return summary
+
+    @classmethod
+    def empty(cls, groups):
+        num_groups = len(groups)
+        return cls(groups,
+                   rows=np.zeros(num_groups, dtype=np.int64),
+                   count=np.zeros(num_groups, dtype=np.int64),
+                   total=np.zeros(num_groups),
+                   sumsq=np.zeros(num_groups),
+                   minimum=np.full(num_groups, np.inf),
+                   maximum=np.full(num_groups, -np.inf),
+                   positive=SketchBuckets(num_groups),
+                   negative=SketchBuckets(num_groups),
+                   zeros=np.zeros(num_groups, dtype=np.int64))
+
+    def _add(self, group_index, values):
+        num_groups = len(self.groups)
+        self.rows += np.bincount(group_index, minlength=num_groups)
+
+        valid = np.isfinite(values)
+        group_index, values = group_index[valid], values[valid]
+        self.count += np.bincount(group_index, minlength=num_groups)
+        self.total += np.bincount(group_index, weights=values, minlength=num_groups)
+        self.sumsq += np.bincount(group_index, weights=values * values, minlength=num_groups)
+        np.minimum.at(self.minimum, group_index, values)
+        np.maximum.at(self.maximum, group_index, values)
+
+        positive, negative = values > SKETCH_MIN_VALUE, values < -SKETCH_MIN_VALUE
+        self.positive.add(group_index[positive], sketch_keys(values[positive]))
+        self.negative.add(group_index[negative], sketch_keys(-values[negative]))
+        self.zeros += np.bincount(group_index[~(positive | negative)], minlength=num_groups)
+
+    def _buckets(self):
+        # 값 오름차순으로 나열한 (구간 대표값, 그룹별 개수): 음수(절댓값 큰 순) → 0 → 양수
+        values = np.concatenate([-self.negative.values()[::-1], [0.0], self.positive.values()])
+        counts = np.hstack([self.negative.counts[:, ::-1], self.zeros[:, None], self.positive.counts])
+        return values, counts
+
+    def present(self):
+        """행이 하나 이상 있는 그룹 번호"""
+        return np.flatnonzero(self.rows > 0)
+
+    def mean(self):
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return self.total / self.count
+
+    def std(self):
+        """표본 표준편차"""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            variance = (self.sumsq - self.total * self.total / self.count) / (self.count - 1)
+        return np.sqrt(np.maximum(variance, 0))
+
+    def quantile(self, q):
+        """그룹별 근사 분위수 (numpy와 같이 q * (개수 - 1) 순위 앞뒤 값 사이를 선형 보간, 값은 구간 대표값)"""
+        result = np.full(len(self.groups), np.nan)
+        values, counts = self._buckets()
+        cumulative = np.cumsum(counts, axis=1)
+        for g in np.flatnonzero(self.count > 0):
+            rank = q * (self.count[g] - 1)
+            lower, upper = np.searchsorted(cumulative[g], [np.floor(rank), np.ceil(rank)], side='right')
+            lower, upper = np.clip([values[lower], values[upper]], self.minimum[g], self.maximum[g])
+            result[g] = lower + (rank - np.floor(rank)) * (upper - lower)
+        return result
+
+    def histogram(self, bins=HISTOGRAM_BINS):
+        """표시용 같은 간격 히스토그램 (구간 경계, 그룹별 개수): 스케치 구간을 대표값 기준으로 다시 나눔"""
+        present = self.count > 0
+        low, high = (self.minimum[present].min(), self.maximum[present].max()) if present.any() else (0.0, 1.0)
+        if low == high:
+            low, high = low - 0.5, high + 0.5
+        edges = np.linspace(low, high, bins + 1)
+        values, counts = self._buckets()
+        bin_index = np.clip(np.searchsorted(edges, values, side='right') - 1, 0, bins - 1)
+        hist = np.zeros((len(self.groups), bins), dtype=np.int64)
+        np.add.at(hist, (slice(None), bin_index), counts)
+        return edges, hist
+
+
+class AggCube:
+    """
+    독립변수 조합(셀)별로 지표를 미리 집계한 큐브.
+
+    셀마다 행 수/합/제곱합/최소/최대/분위수 스케치를 보관하므로, 통제 변인 조건과 조작 변인 값별
+    막대/선/박스/히스토그램 요약은 원본 행을 읽지 않고 조건에 맞는 셀만 더해서 계산합니다.
+    고유값이 많은 컬럼은 차원에서 제외하며, 그런 컬럼이 조건에 있으면 `summarize`가 None을 반환합니다.
+    """
+
+    def __init__(self, dimensions, measures):
+        self.dimensions = list(dimensions)
+        self.measures = list(measures)
+        self.num_rows = 0
+        # 차원별 값 → 코드
+        self._codes = {dim: {} for dim in self.dimensions}
+        # 셀별 차원 코드 (셀 수 x 차원 수)와 코드 조합 → 셀 번호
+        self._cell_codes = np.empty((0, len(self.dimensions)), dtype=np.int32)
+        self._cells = {}
+        self._summaries = {measure: MetricSummary.empty([]) for measure in self.measures}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def build(cls, store, columns, measures, max_cardinality=BITMAP_MAX_CARDINALITY):
+        """저장소의 고유값이 적은 컬럼들을 차원으로 큐브 생성"""
+        dimensions = [col for col in columns
+                      if col in store and pd.unique(store.column(col)).size <= max_cardinality]
+        measures = [col for col in measures if col in store]
+        cube = cls(dimensions, measures)
+        cube.extend(store, 0)
+        return cube
+
+    def extend(self, store, start):
+        """start 이후에 추가된 행만 읽어 셀별 집계에 더함"""
+        end = len(store)
+        if end <= start or not self.dimensions:
+            self.num_rows = max(self.num_rows, end)
+            return
+
+        with self._lock:
+            # 행별 차원 코드 (새 값은 코드를 새로 부여)
+            row_codes = np.empty((end - start, len(self.dimensions)), dtype=np.int32)
+            for j, dim in enumerate(self.dimensions):
+                codes, uniques = pd.factorize(store.column(dim)[start:end], use_na_sentinel=False)
+                value_codes = self._codes[dim]
+                mapping = np.array([value_codes.setdefault(self._key(value), len(value_codes))
+                                    for value in uniques], dtype=np.int32)
+                row_codes[:, j] = mapping[codes]
+
+            # 코드 조합별로 셀 번호를 찾고, 처음 나온 조합은 셀을 새로 추가
+            combos, inverse = np.unique(row_codes, axis=0, return_inverse=True)
+            combo_cells = np.empty(len(combos), dtype=np.int64)
+            new_cells = []
+            for i, combo in enumerate(map(tuple, combos.tolist())):
+                cell = self._cells.get(combo)
+                if cell is None:
+                    cell = self._cells[combo] = len(self._cells)
+                    new_cells.append(combo)
+                combo_cells[i] = cell
+            if new_cells:
+                self._cell_codes = np.vstack([self._cell_codes, np.array(new_cells, dtype=np.int32)])
+            row_cells = combo_cells[inverse.ravel()]
+
+            cells = list(range(len(self._cells)))
+            for measure in self.measures:
+                summary = self._summaries[measure]
+                if new_cells:
+                    summary = self._grow(summary, cells)
+                summary._add(row_cells, np.asarray(store.column(measure)[start:end], dtype=np.float64))
+                self._summaries[measure] = summary
+            self.num_rows = end
+
+    def _grow(self, summary, cells):
+        grown = MetricSummary.empty(cells)
+        n = len(summary.groups)
+        for name in ('rows', 'count', 'total', 'sumsq', 'minimum', 'maximum', 'zeros'):
+            getattr(grown, name)[:n] = getattr(summary, name)
+        grown.positive = summary.positive.grow(len(cells))
+        grown.negative = summary.negative.grow(len(cells))
+        return grown
+
+    def covers(self, columns):
+        return all(col in self._codes for col in columns)
+
+    def summarize(self, conditions, group_by, group_values, measure):
+        """
+        조건에 맞는 셀을 group_by 값별로 합친 MetricSummary.
+        차원이 아닌 컬럼이 조건/그룹에 있거나 지표가 큐브에 없으면 None.
+        """
+        if measure not in self._summaries or not self.covers(list(conditions) + [group_by]):
+            return None
+
+        with self._lock:
+            cell_codes = self._cell_codes
+            mask = np.ones(len(cell_codes), dtype=bool)
+            for column, value in conditions.items():
+                values = value if isinstance(value, (list, tuple)) else [value]
+                mask &= np.isin(cell_codes[:, self.dimensions.index(column)], self._lookup(column, values))
+
+            # 셀별 그룹 번호 (group_values에 없는 셀은 제외)
+            group_column = cell_codes[:, self.dimensions.index(group_by)]
+            group_of_code = np.full(len(self._codes[group_by]) + 1, -1, dtype=np.int64)
+            for position, code in enumerate(self._lookup(group_by, group_values, keep_missing=True)):
+                if code >= 0:
+                    group_of_code[code] = position
+            group_index = group_of_code[group_column]
+            mask &= group_index >= 0
+
+            cells = np.flatnonzero(mask)
+            groups = group_index[cells]
+            cube = self._summaries[measure]
+            summary = MetricSummary.empty(group_values)
+            num_groups = len(group_values)
+            summary.rows = np.bincount(groups, weights=cube.rows[cells], minlength=num_groups).astype(np.int64)
+            summary.count = np.bincount(groups, weights=cube.count[cells], minlength=num_groups).astype(np.int64)
+            summary.total = np.bincount(groups, weights=cube.total[cells], minlength=num_groups)
+            summary.sumsq = np.bincount(groups, weights=cube.sumsq[cells], minlength=num_groups)
+            np.minimum.at(summary.minimum, groups, cube.minimum[cells])
+            np.maximum.at(summary.maximum, groups, cube.maximum[cells])
+            summary.zeros = np.bincount(groups, weights=cube.zeros[cells], minlength=num_groups).astype(np.int64)
+            summary.positive = cube.positive.merge(groups, cells, num_groups)
+            summary.negative = cube.negative.merge(groups, cells, num_groups)
+        return summary
+
+    def summarize_frame(self, data_df, group_by, group_values, measure):
+        """선택된 행 DataFrame으로 같은 형식의 요약 계산 (큐브로 답할 수 없는 조건일 때 사용)"""
+        positions = {normalize_value(value): i for i, value in enumerate(group_values)}
+        group_index = np.array([positions.get(normalize_value(value), -1) for value in data_df[group_by]],
+                               dtype=np.int64)
+        keep = group_index >= 0
+        values = pd.to_numeric(data_df[measure], errors='coerce').to_numpy(dtype=np.float64)
+        return MetricSummary.from_values(group_values, group_index[keep], values[keep])
+
+    @staticmethod
+    def _key(value):
+        # NaN은 매번 다른 객체이므로 None 하나로 모음
+        value = normalize_value(value)
+        return None if isinstance(value, float) and value != value else value
+
+    def _lookup(self, column, values, keep_missing=False):
+        codes = self._codes[column]
+        result = [codes.get(self._key(value), -1) for value in values]
+        return result if keep_missing else [code for code in result if code >= 0]
@@ -0,0 +1,176 @@
+import threading
+import wave
+
+import numpy as np
+
+from media_server import local_media_path
+
+# soundfile 임포트 (WAV 외 형식(FLAC/OGG 등) 읽기용)
+try:
+    import soundfile as sf
+    SOUNDFILE_AVAILABLE = True
+except ImportError:
+    SOUNDFILE_AVAILABLE = False
+    print("Warning: soundfile not available. Install with: pip install soundfile")
+
+# 저장소에 추가되는 계산 컬럼 이름
+AUDIO_DURATION_COLUMN = 'audio_duration'
+AUDIO_WAVEFORM_COLUMN = 'audio_waveform'
+# 파형 요약 구간 수 (구간별 최대 진폭을 0~255로 저장)
+WAVEFORM_POINTS = 64
+# 오디오 파일을 나눠 읽는 프레임 수
+READ_BLOCK_FRAMES = 65536
+
+
+def read_audio_summary(path, points=WAVEFORM_POINTS):
+    """오디오 파일의 (재생 시간(초), 구간별 최대 진폭 uint8 배열)"""
+    if SOUNDFILE_AVAILABLE:
+        with sf.SoundFile(path) as f:
+            total_frames, sample_rate = f.frames, f.samplerate
+            blocks = f.blocks(blocksize=READ_BLOCK_FRAMES, dtype='float32', always_2d=True)
+            peaks = _block_peaks(blocks, total_frames, points)
+    else:
+        with wave.open(path, 'rb') as f:
+            total_frames, sample_rate = f.getnframes(), f.getframerate()
+            peaks = _block_peaks(_wave_blocks(f), total_frames, points)
+
+    duration = total_frames / sample_rate if sample_rate else 0.0
+    return duration, np.round(peaks * 255).astype(np.uint8)
+
+
+def _wave_blocks(f):
+    """wave 파일을 (프레임, 채널) float 배열 블록으로 읽기 (-1~1)"""
+    channels, sample_width = f.getnchannels(), f.getsampwidth()
+    while True:
+        data = f.readframes(READ_BLOCK_FRAMES)
+        if not data:
+            return
+        if sample_width == 1:
+            samples = (np.frombuffer(data, dtype=np.uint8).astype(np.float32) - 128) / 128
+        elif sample_width == 3:
+            raw = np.frombuffer(data, dtype=np.uint8).reshape(-1, 3)
+            # 24비트 값을 32비트 정수의 상위 바이트에 채워 부호 유지
+            padded = np.zeros((len(raw), 4), dtype=np.uint8)
+            padded[:, 1:] = raw
+            samples = padded.view('<i4').ravel().astype(np.float32) / 2 ** 31
+        else:
+            dtype = {2: '<i2', 4: '<i4'}[sample_width]
+            samples = np.frombuffer(data, dtype=dtype).astype(np.float32) / 2 ** (8 * sample_width - 1)
+        yield samples.reshape(-1, channels)
+
+
+def _block_peaks(blocks, total_frames, points):
+    # 블록 단위로 읽으면서 각 프레임이 속한 구간의 최대 진폭만 갱신 (파일 전체를 메모리에 올리지 않음)
+    peaks = np.zeros(points, dtype=np.float32)
+    start = 0
+    for block in blocks:
+        if len(block) == 0:
+            continue
+        amplitude = np.abs(block).max(axis=1)
+        buckets = np.minimum((np.arange(start, start + len(block)) * points) // max(total_frames, 1), points - 1)
+        bounds = np.flatnonzero(np.diff(buckets)) + 1
+        starts = np.concatenate(([0], bounds))
+        np.maximum.at(peaks, buckets[starts], np.maximum.reduceat(amplitude, starts))
+        start += len(block)
+    return np.clip(peaks, 0, 1)
+
+
+def waveform_svg(peaks, width=120, height=24, color='#1f77b4'):
+    """파형 요약을 막대형 SVG 스파크라인 문자열로 변환"""
+    if peaks is None or len(peaks) == 0:
+        return ''
+    step = width / len(peaks)
+    middle = height / 2
+    # 구간마다 가운데를 기준으로 위아래 대칭인 세로선 하나
+    path = ''.join(
+        f"M{(i + 0.5) * step:.1f} {middle - h:.1f}V{middle + h:.1f}"
+        for i, h in enumerate(np.maximum(np.asarray(peaks) / 255 * middle, 0.5))
+    )
+    return (f'<svg width="{width}" height="{height}" viewBox="0 0 {width} {height}" class="audio-waveform">'
+            f'<path d="{path}" stroke="{color}" stroke-width="{max(step * 0.6, 1):.1f}" fill="none" /></svg>')
+
+
+def format_duration(seconds):
+    """재생 시간을 m:ss 형식으로 표시 (계산 전이면 빈 문자열)"""
+    if seconds is None or not np.isfinite(seconds):
+        return ''
+    minutes, seconds = divmod(int(round(seconds)), 60)
+    return f"{minutes}:{seconds:02d}"
+
+
+class AudioSummaryJob:
+    """
+    결과 저장소의 오디오 파일별 재생 시간과 파형 요약을 백그라운드에서 계산하는 작업.
+
+    결과는 저장소의 계산 컬럼(`audio_duration`, `audio_waveform`)에 채우며, 저장소에 행이
+    추가되면 다음 주기에 새 행만 계산합니다. 로컬 파일만 읽고 원격 URL은 건너뜁니다.
+    """
+
+    def __init__(self, store, column='audio_url', points=WAVEFORM_POINTS, batch_size=256, poll_interval=5.0):
+        self.store = store
+        self.column = column
+        self.points = points
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.num_rows = 0
+        self._summaries = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """백그라운드 스레드에서 계산 시작"""
+        self._thread = threading.Thread(target=self._run, name='audio-summary', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        while True:
+            try:
+                self.run_once()
+            except Exception as e:
+                print(f"Warning: failed to compute audio summaries: {e}")
+            if self._stop.wait(self.poll_interval):
+                return
+
+    def run_once(self):
+        """아직 계산하지 않은 행을 배치 단위로 계산하고, 계산한 행 수를 반환"""
+        start = self.num_rows
+        end = len(self.store)
+        for batch_start, urls_df in self.store.scan([self.column], start, self.batch_size):
+            if self._stop.is_set() or batch_start >= end:
+                break
+            urls_df = urls_df.loc[:end - 1]
+            rows = urls_df.index.to_numpy()
+            urls = urls_df[self.column].tolist()
+
+            durations = np.full(len(rows), np.nan)
+            waveforms = [None] * len(rows)
+            for i, url in enumerate(urls):
+                summary = self._summary(url)
+                if summary is not None:
+                    durations[i], waveforms[i] = summary
+
+            self.store.set_values(AUDIO_DURATION_COLUMN, rows, durations)
+            self.store.set_values(AUDIO_WAVEFORM_COLUMN, rows, waveforms, fill_value=None, dtype=object)
+            self.num_rows = int(rows[-1]) + 1
+        return self.num_rows - start
+
+    def _summary(self, url):
+        # 같은 파일을 여러 행이 참조하면 한 번만 계산
+        if not isinstance(url, str) or not url:
+            return None
+        if url not in self._summaries:
+            path = local_media_path(url)
+            summary = None
+            if path is not None:
+                try:
+                    summary = read_audio_summary(path, self.points)
+                except Exception as e:
+                    print(f"Warning: failed to read audio '{url}': {e}")
+            self._summaries[url] = summary
+        return self._summaries[url]
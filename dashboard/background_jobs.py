@@ -0,0 +1,86 @@
+import threading
+import uuid
+
+from dash import DiskcacheManager
+from dash.background_callback.managers import BaseBackgroundCallbackManager
+
+# 작업 상태(실행 중/취소 요청) 키 유지 시간 (초, 작업을 실행하던 프로세스가 종료되어 남은 키도 이후 정리됨)
+JOB_STATE_EXPIRE = 3600
+
+
+class JobCancelled(BaseException):
+    """
+    취소된 작업의 진행 상황 함수가 발생시키는 예외.
+    Dash의 작업 함수는 Exception을 잡아 오류 결과로 기록하므로, 결과를 남기지 않도록 BaseException을 상속합니다.
+    """
+
+
+class ThreadJobManager(DiskcacheManager):
+    """
+    백그라운드 콜백을 서버 프로세스의 스레드에서 실행하는 작업 관리자.
+
+    진행 상황/결과/취소 요청은 DiskcacheManager와 같이 diskcache로 주고받으므로 어느 워커가 확인 요청을 받아도 되고,
+    작업은 하위 프로세스를 만들지 않고 서버 프로세스 안에서 실행되므로 필터/diff 캐시와 라벨 저장소를 그대로 사용합니다.
+    스레드는 강제로 멈출 수 없어, 취소된 작업은 다음 진행 상황을 보고할 때 중단됩니다.
+    """
+
+    def __init__(self, cache, expire=None):
+        # DiskcacheManager.__init__은 하위 프로세스용 패키지(multiprocess, psutil)를 요구하므로 직접 초기화
+        self.handle = cache
+        self.expire = expire
+        self._local = threading.local()
+        BaseBackgroundCallbackManager.__init__(self, None)
+
+    def make_job_fn(self, fn, progress, key=None):
+        if not progress:
+            return super().make_job_fn(fn, progress, key)
+
+        def run(set_progress, *args, **kwargs):
+            job = self._local.job
+
+            def report(value):
+                if self._cancelled(job):
+                    raise JobCancelled(job)
+                set_progress(value)
+            return fn(report, *args, **kwargs)
+        return super().make_job_fn(run, progress, key)
+
+    def call_job_fn(self, key, job_fn, args, context):
+        job = uuid.uuid4().hex
+        self.handle.set(self._running_key(job), True, expire=JOB_STATE_EXPIRE)
+        threading.Thread(target=self._run_job, args=(job, key, job_fn, args, context),
+                         name=f'background-job-{job[:8]}', daemon=True).start()
+        return job
+
+    def _run_job(self, job, key, job_fn, args, context):
+        self._local.job = job
+        try:
+            job_fn(key, self._make_progress_key(key), args, context)
+        except JobCancelled:
+            pass
+        finally:
+            self.handle.delete(self._running_key(job))
+            self.handle.delete(self._cancel_key(job))
+
+    def terminate_job(self, job):
+        # 실행 중인 작업에만 취소 요청을 남김 (결과를 가져갈 때도 호출되므로 끝난 작업은 무시)
+        if job is not None and self.handle.get(self._running_key(job)) is not None:
+            self.handle.set(self._cancel_key(job), True, expire=JOB_STATE_EXPIRE)
+
+    def terminate_unhealthy_job(self, job):
+        return False
+
+    def job_running(self, job):
+        return job is not None and self.handle.get(self._running_key(job)) is not None \
+            and not self._cancelled(job)
+
+    def _cancelled(self, job):
+        return self.handle.get(self._cancel_key(job)) is not None
+
+    @staticmethod
+    def _running_key(job):
+        return f'job-{job}-running'
+
+    @staticmethod
+    def _cancel_key(job):
+        return f'job-{job}-cancel'
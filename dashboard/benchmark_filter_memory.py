@@ -0,0 +1,164 @@
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from result_store import ResultStore
+from bitmap_index import BitmapIndex
+from filter_engine import FilterEngine
+
+# 벤치마크용 독립변수와 표시 컬럼 (대시보드 기본값과 동일한 구성)
+INDEPENDENT_VARS = ['model', 'prompt_template_name', 'option-1', 'option-2', 'max_tokens']
+COLUMNS_TO_SHOW = ['test_case_id', 'model', 'answer', 'think', 'audio_url', 'image_url', 'video_url', 'response_time']
+
+# 요청마다 바꿔가며 사용할 필터 상태 (target_values, control_dict)
+REQUESTS = [
+    (['GPT-4', 'Claude-3'], {'option-1': 'low'}),
+    (['GPT-4', 'Claude-3'], {'option-2': 'fast', 'max_tokens': 2000}),
+    (['GPT-4', 'Claude-3', 'Gemini-Pro'], {'prompt_template_name': 'template_A'}),
+    (['Claude-3', 'Gemini-Pro'], {}),
+]
+
+
+def generate_benchmark_data(num_rows):
+    """긴 answer/think 텍스트를 포함한 대용량 샘플 데이터 생성"""
+    rng = np.random.default_rng(42)
+    text = 'This is a longer text to test the table display and wrapping behavior. ' * 20
+    return pd.DataFrame({
+        'test_case_id': np.arange(num_rows),
+        'model': rng.choice(['GPT-4', 'Claude-3', 'Gemini-Pro'], num_rows),
+        'prompt_template_name': rng.choice(['template_A', 'template_B', 'template_C'], num_rows),
+        'option-1': rng.choice(['low', 'medium', 'high'], num_rows),
+        'option-2': rng.choice(['fast', 'balanced', 'quality'], num_rows),
+        'temperature': rng.uniform(0.1, 1.0, num_rows),
+        'max_tokens': rng.choice([1000, 2000, 4000], num_rows),
+        'answer': [f'## Sample answer {i} \n {text}' for i in range(num_rows)],
+        'think': [f'Sample thinking process {i} - {text}' for i in range(num_rows)],
+        'response_time': rng.uniform(0.5, 5.0, num_rows),
+        'completion_tokens': rng.integers(100, 1000, num_rows),
+        'audio_url': np.where(np.arange(num_rows) % 3 == 0, 'https://example.com/audio.mp3', ''),
+        'image_url': np.where(np.arange(num_rows) % 4 == 0, 'https://example.com/image.png', ''),
+        'video_url': np.where(np.arange(num_rows) % 5 == 0, 'https://example.com/video.mp4', ''),
+        'human_label': '',
+    })
+
+
+def run_legacy_request(df, target_values, control_dict):
+    """기존 방식: df.copy() 후 통제 변인마다 DataFrame을 다시 슬라이스"""
+    filtered_df = df.copy()
+    for var, value in control_dict.items():
+        filtered_df = filtered_df[filtered_df[var] == value]
+    if len(target_values) == 2:
+        left = filtered_df[filtered_df['model'] == target_values[0]][COLUMNS_TO_SHOW]
+        right = filtered_df[filtered_df['model'] == target_values[1]][COLUMNS_TO_SHOW]
+        return len(left) + len(right)
+    return len(filtered_df[filtered_df['model'].isin(target_values)][COLUMNS_TO_SHOW])
+
+
+def run_engine_request(engine, target_values, control_dict):
+    """새 방식: 비트맵으로 행 번호만 계산한 뒤 표시할 행/컬럼만 모아옴"""
+    if len(target_values) == 2:
+        left_rows, right_rows = engine.split(control_dict, 'model', target_values)
+        left = engine.gather(left_rows, COLUMNS_TO_SHOW)
+        right = engine.gather(right_rows, COLUMNS_TO_SHOW)
+        return len(left) + len(right)
+    rows = engine.select(control_dict, 'model', target_values)
+    return len(engine.gather(rows, COLUMNS_TO_SHOW))
+
+
+def current_rss_mb():
+    # /proc/self/statm의 두 번째 값이 현재 RSS (페이지 단위)
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+
+
+def max_rss_mb():
+    # Linux에서 ru_maxrss 단위는 KB
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def request_peak_rss_mb(run, target_values, control_dict):
+    """
+    요청 하나를 fork한 자식 프로세스에서 실행하여 요청 처리 중 늘어난 최대 RSS를 측정.
+    자식의 ru_maxrss는 fork 시점의 RSS에서 시작하므로 (최대 RSS - 시작 RSS)가 요청당 최대 RSS입니다.
+    """
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        start_rss = current_rss_mb()
+        run(target_values, control_dict)
+        os.write(write_fd, str(max_rss_mb() - start_rss).encode())
+        os._exit(0)
+
+    os.close(write_fd)
+    with os.fdopen(read_fd) as f:
+        peak = float(f.read())
+    os.waitpid(pid, 0)
+    return peak
+
+
+def measure(mode, num_rows, repeat):
+    """한 프로세스에서 한 가지 방식만 실행하여 요청당 최대 RSS 증가량과 지연 시간 측정"""
+    df = generate_benchmark_data(num_rows)
+    if mode == 'legacy':
+        run = lambda target_values, control_dict: run_legacy_request(df, target_values, control_dict)
+    else:
+        store = ResultStore.from_dataframe(df, cache_columns=['test_case_id'] + INDEPENDENT_VARS)
+        del df
+        engine = FilterEngine(store, BitmapIndex.build(store, INDEPENDENT_VARS))
+        run = lambda target_values, control_dict: run_engine_request(engine, target_values, control_dict)
+
+    baseline_rss = current_rss_mb()
+
+    # 이전 요청이 해제한 메모리가 재사용되지 않도록 RSS 측정을 먼저 수행
+    peaks = [request_peak_rss_mb(run, target_values, control_dict)
+             for target_values, control_dict in REQUESTS]
+
+    latencies = []
+    for _ in range(repeat):
+        for target_values, control_dict in REQUESTS:
+            start = time.perf_counter()
+            run(target_values, control_dict)
+            latencies.append(time.perf_counter() - start)
+
+    return {
+        'mode': mode,
+        'rows': num_rows,
+        'baseline_rss_mb': round(baseline_rss, 1),
+        'request_peak_rss_mb': round(max(peaks), 1),
+        'mean_latency_ms': round(1000 * float(np.mean(latencies)), 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-request peak RSS of the dashboard filter path")
+    parser.add_argument('--rows', type=int, default=200_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--mode', choices=['legacy', 'engine'])
+    args = parser.parse_args()
+
+    if args.mode:
+        print(json.dumps(measure(args.mode, args.rows, args.repeat)))
+        return
+
+    # 방식마다 별도 프로세스에서 실행해야 ru_maxrss가 섞이지 않음
+    print(f"{'mode':<8} {'rows':>10} {'baseline RSS':>14} {'request peak RSS':>18} {'latency':>10}")
+    for mode in ['legacy', 'engine']:
+        output = subprocess.run(
+            [sys.executable, __file__, '--mode', mode, '--rows', str(args.rows), '--repeat', str(args.repeat)],
+            capture_output=True, text=True, check=True
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        print(f"{result['mode']:<8} {result['rows']:>10} {result['baseline_rss_mb']:>11} MB "
+              f"{result['request_peak_rss_mb']:>15} MB {result['mean_latency_ms']:>7} ms")
+
+
+if __name__ == '__main__':
+    main()
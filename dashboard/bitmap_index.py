@@ -0,0 +1,221 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+# 고유값이 이 개수 이하인 컬럼은 값마다 비트맵을 미리 만들고,
+# 그보다 많은 컬럼(content_id 등)은 값별 행 번호 목록(posting list)으로 보관
+BITMAP_MAX_CARDINALITY = 64
+
+# 인덱스 저장 시 컬럼/값 목록을 기록하는 파일
+BITMAP_MANIFEST_FILE = 'bitmap_index.json'
+
+# 바이트별 1비트 개수 (popcount) 조회 테이블
+_POPCOUNT_TABLE = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+
+def normalize_value(value):
+    """NumPy 스칼라를 파이썬 기본 타입으로 변환 (JSON으로 넘어온 값과 같은 키가 되도록)"""
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+class BitmapIndex:
+    """
+    컬럼별 값 → 행 비트맵 인덱스.
+
+    비트맵은 np.packbits로 압축한 uint8 배열(행 8개당 1바이트)이며,
+    여러 통제 변인 조건은 비트맵 AND로 한 번에 계산합니다.
+    """
+
+    def __init__(self, num_rows):
+        self.num_rows = num_rows
+        self._bitmaps = {}
+        self._postings = {}
+
+    @classmethod
+    def build(cls, store, columns):
+        """저장소의 지정한 컬럼들에 대해 인덱스 생성"""
+        index = cls(len(store))
+        for col in columns:
+            if col in store:
+                index.add_column(col, store.column(col))
+        return index
+
+    def save(self, directory):
+        """
+        인덱스를 디렉터리에 .npy 파일들로 저장.
+        컬럼별 비트맵은 (값 수 x 바이트 수) 배열 하나로, 행 번호 목록은 이어 붙인 배열과 오프셋으로 저장합니다.
+        """
+        manifest = {'num_rows': self.num_rows, 'bitmaps': {}, 'postings': {}}
+        for i, (name, bitmaps) in enumerate(self._bitmaps.items()):
+            matrix = (np.stack(list(bitmaps.values())) if bitmaps
+                      else np.zeros((0, (self.num_rows + 7) // 8), dtype=np.uint8))
+            np.save(os.path.join(directory, f'bitmap_{i}.npy'), matrix)
+            manifest['bitmaps'][name] = {'file': f'bitmap_{i}.npy', 'values': list(bitmaps)}
+        for i, (name, postings) in enumerate(self._postings.items()):
+            lengths = [len(rows) for rows in postings.values()]
+            rows = np.concatenate(list(postings.values())) if postings else np.empty(0, dtype=np.int64)
+            np.save(os.path.join(directory, f'postings_{i}.npy'), rows)
+            np.save(os.path.join(directory, f'postings_{i}_offsets.npy'), np.concatenate(([0], np.cumsum(lengths))))
+            manifest['postings'][name] = {'file': f'postings_{i}.npy', 'offsets': f'postings_{i}_offsets.npy',
+                                          'values': list(postings)}
+        with open(os.path.join(directory, BITMAP_MANIFEST_FILE), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f)
+
+    @classmethod
+    def load(cls, directory, mmap_mode='r'):
+        """
+        save로 저장한 인덱스를 엶.
+        mmap_mode가 있으면 배열을 메모리 매핑하므로 같은 파일을 연 프로세스들이 페이지 캐시를 공유합니다.
+        """
+        with open(os.path.join(directory, BITMAP_MANIFEST_FILE), encoding='utf-8') as f:
+            manifest = json.load(f)
+        index = cls(manifest['num_rows'])
+        for name, entry in manifest['bitmaps'].items():
+            matrix = np.asarray(np.load(os.path.join(directory, entry['file']), mmap_mode=mmap_mode))
+            index._bitmaps[name] = dict(zip(entry['values'], matrix))
+        for name, entry in manifest['postings'].items():
+            rows = np.asarray(np.load(os.path.join(directory, entry['file']), mmap_mode=mmap_mode))
+            offsets = np.load(os.path.join(directory, entry['offsets'])).tolist()
+            index._postings[name] = {value: rows[offsets[i]:offsets[i + 1]]
+                                     for i, value in enumerate(entry['values'])}
+        return index
+
+    def add_column(self, name, values):
+        postings = self._group(values)
+        if len(postings) <= BITMAP_MAX_CARDINALITY:
+            self._bitmaps[name] = {value: self._pack(rows) for value, rows in postings.items()}
+            self._postings.pop(name, None)
+        else:
+            self._postings[name] = postings
+            self._bitmaps.pop(name, None)
+
+    def extend(self, store, start):
+        """start 이후에 추가된 행만 읽어 인덱스에 반영 (기존 비트맵은 길이만 늘림)"""
+        num_rows = len(store)
+        bitmaps, postings = {}, {}
+        for name in self.columns:
+            new_postings = self._group(store.column(name)[start:num_rows], offset=start)
+
+            if name in self._postings:
+                merged = dict(self._postings[name])
+            else:
+                merged = self._bitmaps[name]
+                if len(set(merged) | set(new_postings)) <= BITMAP_MAX_CARDINALITY:
+                    bitmaps[name] = {
+                        value: self._grow(merged.get(value), new_postings.get(value), num_rows)
+                        for value in list(merged) + [v for v in new_postings if v not in merged]
+                    }
+                    continue
+                # 고유값이 많아지면 행 번호 목록으로 전환
+                merged = {value: self.rows(bitmap) for value, bitmap in merged.items()}
+
+            for value, rows in new_postings.items():
+                merged[value] = np.concatenate([merged[value], rows]) if value in merged else rows
+            postings[name] = merged
+
+        # 새 비트맵을 모두 만든 뒤 한 번에 교체
+        self._bitmaps, self._postings = bitmaps, postings
+        self.num_rows = num_rows
+
+    @staticmethod
+    def _group(values, offset=0):
+        """값 → 행 번호 배열 (값은 처음 등장한 순서)"""
+        codes, uniques = pd.factorize(values)
+        # 값 순서대로 행 번호를 정렬한 뒤 값별 구간으로 나눔
+        order = np.argsort(codes, kind='stable') + offset
+        counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]]) + np.count_nonzero(codes < 0)
+
+        postings = {}
+        for code, value in enumerate(uniques):
+            postings[normalize_value(value)] = order[starts[code]:starts[code] + counts[code]]
+        return postings
+
+    @staticmethod
+    def _grow(bitmap, rows, num_rows):
+        grown = np.zeros((num_rows + 7) // 8, dtype=np.uint8)
+        if bitmap is not None:
+            grown[:len(bitmap)] = bitmap
+        if rows is not None:
+            # np.packbits와 같은 비트 순서 (상위 비트가 앞 행)
+            np.bitwise_or.at(grown, rows >> 3, (0x80 >> (rows & 7)).astype(np.uint8))
+        return grown
+
+    def _pack(self, rows):
+        mask = np.zeros(self.num_rows, dtype=bool)
+        mask[rows] = True
+        return np.packbits(mask)
+
+    @property
+    def columns(self):
+        return list(self._bitmaps) + list(self._postings)
+
+    def __contains__(self, column):
+        return column in self._bitmaps or column in self._postings
+
+    def values(self, column):
+        """컬럼의 고유값 목록 (처음 등장한 순서)"""
+        if column in self._bitmaps:
+            return list(self._bitmaps[column])
+        return list(self._postings[column])
+
+    def all_rows(self):
+        """모든 행이 선택된 비트맵"""
+        return self._pack(slice(None))
+
+    def bitmap(self, column, value):
+        """단일 값에 해당하는 행 비트맵 (없는 값이면 빈 비트맵)"""
+        value = normalize_value(value)
+        if column in self._bitmaps:
+            bitmap = self._bitmaps[column].get(value)
+            if bitmap is None:
+                return np.zeros((self.num_rows + 7) // 8, dtype=np.uint8)
+            return bitmap
+        return self._pack(self._postings[column].get(value, np.empty(0, dtype=np.int64)))
+
+    def isin(self, column, values):
+        """여러 값 중 하나에 해당하는 행 비트맵 (비트맵 OR)"""
+        result = np.zeros((self.num_rows + 7) // 8, dtype=np.uint8)
+        for value in values:
+            np.bitwise_or(result, self.bitmap(column, value), out=result)
+        return result
+
+    def select(self, conditions):
+        """
+        {컬럼: 값} 조건을 모두 만족하는 행 비트맵 (비트맵 AND).
+        값이 리스트/튜플이면 그 중 하나와 일치하는 행을 선택합니다.
+        """
+        result = None
+        for column, value in conditions.items():
+            if isinstance(value, (list, tuple)):
+                bitmap = self.isin(column, value)
+            else:
+                bitmap = self.bitmap(column, value)
+            result = bitmap.copy() if result is None else np.bitwise_and(result, bitmap, out=result)
+        return self.all_rows() if result is None else result
+
+    def counts(self, column, bitmap):
+        """비트맵에 선택된 행 중 컬럼 값별 행 수"""
+        if column in self._bitmaps:
+            return {value: self.count(np.bitwise_and(bitmap, value_bitmap))
+                    for value, value_bitmap in self._bitmaps[column].items()}
+        mask = np.unpackbits(bitmap, count=self.num_rows).view(bool)
+        return {value: int(np.count_nonzero(mask[rows]))
+                for value, rows in self._postings[column].items()}
+
+    def rows(self, bitmap):
+        """비트맵을 행 번호 배열로 변환"""
+        return np.flatnonzero(np.unpackbits(bitmap, count=self.num_rows))
+
+    def from_rows(self, rows):
+        """행 번호 배열을 비트맵으로 변환 (rows의 역변환)"""
+        return self._pack(rows)
+
+    @staticmethod
+    def count(bitmap):
+        """비트맵에서 선택된 행 수"""
+        return int(_POPCOUNT_TABLE[bitmap].sum(dtype=np.int64))
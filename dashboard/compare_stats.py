@@ -0,0 +1,140 @@
+import numpy as np
+import pandas as pd
+
+# 부트스트랩 재표본 수
+BOOTSTRAP_SAMPLES = 1000
+# 순열 검정 재표본 수
+PERMUTATION_SAMPLES = 1000
+# 신뢰구간 수준
+CONFIDENCE_LEVEL = 0.95
+# 재표본 전에 값을 압축하는 최대 구간 수 (고유값이 이보다 적으면 압축하지 않음)
+RESAMPLE_BINS = 256
+# 대응 비교에 필요한 최소 쌍 수 (미만이면 독립 표본으로 비교)
+MIN_PAIRS = 10
+
+
+def compress(values, bins=RESAMPLE_BINS):
+    """
+    값 배열을 (구간 평균, 구간별 개수, 값별 구간 번호)로 압축.
+    고유값이 bins개 이하면 고유값 그대로(정확), 많으면 분위수 구간별 평균으로 근사합니다.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    centers, bin_of, counts = np.unique(values, return_inverse=True, return_counts=True)
+    if len(centers) <= bins:
+        return centers, counts, bin_of.ravel()
+
+    edges = np.quantile(values, np.linspace(0, 1, bins + 1)[1:-1])
+    bin_of = np.searchsorted(edges, values, side='right')
+    counts = np.bincount(bin_of, minlength=bins)
+    totals = np.bincount(bin_of, weights=values, minlength=bins)
+    # 같은 경계가 겹쳐 비는 구간은 제외하고 번호를 다시 매김
+    keep = counts > 0
+    renumber = np.cumsum(keep) - 1
+    return totals[keep] / counts[keep], counts[keep], renumber[bin_of]
+
+
+def bootstrap_means(centers, counts, samples, rng):
+    """압축된 표본의 부트스트랩 평균 배열 (행 단위 재표본 대신 구간별 개수를 다항분포로 뽑음)"""
+    n = counts.sum()
+    return rng.multinomial(n, counts / n, size=samples) @ centers / n
+
+
+def compare_samples(left, right, samples=BOOTSTRAP_SAMPLES, permutations=PERMUTATION_SAMPLES,
+                    confidence=CONFIDENCE_LEVEL, seed=0):
+    """
+    독립 두 표본의 평균 차이(right - left) 비교.
+    신뢰구간은 두 표본을 각각 부트스트랩하고, p값은 합친 표본을 나누는 순열 검정으로 계산합니다.
+    """
+    rng = np.random.default_rng(seed)
+    n_left, n_right = len(left), len(right)
+    delta = right.mean() - left.mean()
+
+    boot = (bootstrap_means(*compress(right)[:2], samples, rng)
+            - bootstrap_means(*compress(left)[:2], samples, rng))
+
+    # 합친 표본의 구간별로 left에 배정되는 개수를 다변량 초기하분포로 뽑음
+    pooled = np.concatenate([left, right])
+    centers, pooled_counts, bin_of = compress(pooled)
+    left_counts = np.bincount(bin_of[:n_left], minlength=len(centers))
+    total = pooled_counts @ centers
+
+    def mean_delta(left_sums):
+        return (total - left_sums) / n_right - left_sums / n_left
+
+    observed = mean_delta(left_counts @ centers)
+    draws = rng.multivariate_hypergeometric(pooled_counts, n_left, size=permutations, method='marginals')
+    null = mean_delta(draws @ centers)
+    return _result(delta, boot, null, observed, confidence)
+
+
+def compare_paired(differences, samples=BOOTSTRAP_SAMPLES, permutations=PERMUTATION_SAMPLES,
+                   confidence=CONFIDENCE_LEVEL, seed=0):
+    """
+    쌍별 차이(right - left)의 평균 비교.
+    신뢰구간은 차이의 부트스트랩, p값은 부호를 무작위로 바꾸는 순열 검정으로 계산합니다.
+    """
+    rng = np.random.default_rng(seed)
+    n = len(differences)
+    delta = differences.mean()
+
+    boot = bootstrap_means(*compress(differences)[:2], samples, rng)
+
+    # |차이| 구간별로 양수가 되는 개수를 이항분포로 뽑음
+    centers, counts, bin_of = compress(np.abs(differences))
+    positive = np.bincount(bin_of[differences > 0], minlength=len(centers))
+    negative = np.bincount(bin_of[differences < 0], minlength=len(centers))
+
+    observed = (positive - negative) @ centers / n
+    flips = rng.binomial(counts, 0.5, size=(permutations, len(centers)))
+    null = (2 * flips - counts) @ centers / n
+    return _result(delta, boot, null, observed, confidence)
+
+
+def _result(delta, boot, null, observed, confidence):
+    alpha = (1 - confidence) / 2
+    ci_low, ci_high = np.quantile(boot, [alpha, 1 - alpha])
+    # 관측값보다 극단적인 재표본 비율 (+1 보정으로 p값이 0이 되지 않음)
+    extreme = np.count_nonzero(np.abs(null) >= np.abs(observed) - 1e-12)
+    p_value = (extreme + 1) / (len(null) + 1)
+    return delta, ci_low, ci_high, p_value
+
+
+def compare_groups(left_df, right_df, metrics, pair_key=None, min_pairs=MIN_PAIRS, **options):
+    """
+    좌/우 결과의 지표별 비교표 (DataFrame).
+    pair_key 값이 양쪽에 모두 있는 쌍이 min_pairs개 이상이면 키별 평균의 차이로 대응 비교하고,
+    아니면 독립 두 표본으로 비교합니다.
+    """
+    rows = []
+    for metric in metrics:
+        left = pd.to_numeric(left_df[metric], errors='coerce')
+        right = pd.to_numeric(right_df[metric], errors='coerce')
+        left_mean, right_mean = left.mean(), right.mean()
+        row = {'metric': metric, 'left_mean': left_mean, 'right_mean': right_mean,
+               'n_left': int(left.notna().sum()), 'n_right': int(right.notna().sum()),
+               'pairs': 0, 'method': '', 'delta': right_mean - left_mean,
+               'ci_low': np.nan, 'ci_high': np.nan, 'p_value': np.nan}
+
+        pairs = None
+        if pair_key is not None and pair_key in left_df and pair_key in right_df:
+            # 같은 키에 여러 행이 있으면 키별 평균으로 묶어서 쌍을 만듦
+            left_by_key = left.groupby(left_df[pair_key]).mean().dropna()
+            right_by_key = right.groupby(right_df[pair_key]).mean().dropna()
+            pairs = pd.concat([left_by_key, right_by_key], axis=1, join='inner', keys=['left', 'right'])
+
+        if pairs is not None and len(pairs) >= min_pairs:
+            differences = (pairs['right'] - pairs['left']).to_numpy(dtype=np.float64)
+            row['pairs'], row['method'] = len(pairs), 'paired'
+            row['left_mean'], row['right_mean'] = pairs['left'].mean(), pairs['right'].mean()
+            row['delta'], row['ci_low'], row['ci_high'], row['p_value'] = compare_paired(differences, **options)
+        elif row['n_left'] >= 2 and row['n_right'] >= 2:
+            row['method'] = 'unpaired'
+            row['delta'], row['ci_low'], row['ci_high'], row['p_value'] = compare_samples(
+                left.dropna().to_numpy(dtype=np.float64), right.dropna().to_numpy(dtype=np.float64), **options)
+        rows.append(row)
+
+    result = pd.DataFrame(rows, columns=['metric', 'method', 'n_left', 'n_right', 'pairs', 'left_mean',
+                                         'right_mean', 'delta', 'ci_low', 'ci_high', 'p_value'])
+    with np.errstate(invalid='ignore', divide='ignore'):
+        result['delta_pct'] = result['delta'] / result['left_mean'].abs() * 100
+    return result
@@ -0,0 +1,366 @@
+import json
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from bitmap_index import normalize_value
+from text_index import TEXT_SEARCH_KEY
+
+
+class FilterEngine:
+    """
+    필터 조건을 행 번호 배열로 계산하고, 마지막에 필요한 행/컬럼만 모아오는 필터 파이프라인.
+
+    중간 단계에서는 DataFrame을 만들지 않고 비트맵/행 번호만 다루므로
+    요청당 메모리는 최종적으로 표시되는 행과 컬럼 크기에만 비례합니다.
+    """
+
+    def __init__(self, store, index, cache=None, text_index=None):
+        self.store = store
+        self.index = index
+        self.cache = cache
+        # 검색어 조건(TEXT_SEARCH_KEY)을 처리하는 전문 검색 인덱스
+        self.text_index = text_index
+        # 데이터가 추가될 때마다 증가 (이전 버전의 캐시 항목은 더 이상 조회되지 않음)
+        self.version = 0
+        # 키 컬럼 값 → 행 번호 조회용 해시 인덱스 (처음 조회할 때 생성)
+        self._key_indexes = {}
+        # 쌍 키 컬럼 조합 → 행별 조인 코드 (처음 쌍을 만들 때 생성)
+        self._join_codes = {}
+
+    def select(self, conditions, target_var=None, target_values=None):
+        """조건을 모두 만족하는 행 번호 배열 (target_values가 있으면 그 중 하나와 일치하는 행)"""
+        if target_var is not None and target_values is not None:
+            # 테이블(값별)과 차트(여러 값)가 같은 캐시 항목을 쓰도록 값별 결과를 합침
+            parts = self.split(conditions, target_var, list(dict.fromkeys(target_values)))
+            if not parts:
+                return np.empty(0, dtype=np.int64)
+            return np.sort(np.concatenate(parts))
+        
+        key = self._key(conditions)
+        rows = self.cache.get(key) if self.cache is not None else None
+        if rows is None:
+            rows = self._remember(key, self.index.rows(self._bitmap(conditions)))
+        return rows
+
+    def split(self, conditions, target_var, target_values):
+        """조작 변인 값별 행 번호 배열 (통제 변인 비트맵은 캐시에 없는 값이 있을 때 한 번만 계산)"""
+        keys = [self._key(conditions, target_var, [value]) for value in target_values]
+        results = [self.cache.get(key) if self.cache is not None else None for key in keys]
+        if all(rows is not None for rows in results):
+            return results
+        
+        base = self._bitmap(conditions)
+        return [
+            rows if rows is not None else
+            self._remember(key, self.index.rows(np.bitwise_and(base, self.index.bitmap(target_var, value))))
+            for key, value, rows in zip(keys, target_values, results)
+        ]
+
+    def sample(self, conditions, target_var, target_values, max_rows, seed=0):
+        """
+        조작 변인 값별 비율을 유지하며 최대 max_rows개 정도의 행 번호를 고름 (전체 행 수와 함께 반환).
+        행이 있는 값은 적어도 한 행을 남기며, 같은 조건이면 항상 같은 행을 고릅니다.
+        """
+        parts = self.split(conditions, target_var, list(dict.fromkeys(target_values)))
+        total = sum(len(rows) for rows in parts)
+        if total <= max_rows:
+            rows = np.sort(np.concatenate(parts)) if parts else np.empty(0, dtype=np.int64)
+            return rows, total
+
+        rng = np.random.default_rng(seed)
+        sampled = [
+            rng.choice(rows, max(1, len(rows) * max_rows // total), replace=False)
+            for rows in parts if len(rows)
+        ]
+        return np.sort(np.concatenate(sampled)), total
+
+    def pair(self, conditions, target_var, left_value, right_value, keys):
+        """
+        좌/우 값의 행을 keys 컬럼 값이 같은 행끼리 짝지은 (좌측 행 번호, 우측 행 번호) 배열.
+        같은 키의 행이 여러 개면 나온 순서대로 하나씩 짝지으며, 짝이 없는 행은 제외하고 좌측 순서를 유지합니다.
+        """
+        keys = list(keys)
+        key = self._key(conditions) + ':pair:' + json.dumps(
+            [target_var, normalize_value(left_value), normalize_value(right_value), keys], default=str)
+        pairs = self.cache.get(key) if self.cache is not None else None
+        if pairs is None:
+            left_rows, right_rows = self.split(conditions, target_var, [left_value, right_value])
+            codes = self.join_codes(keys)
+            left_keys = _occurrence_keys(codes[left_rows], len(self.store))
+            right_keys = _occurrence_keys(codes[right_rows], len(self.store))
+            
+            # 우측 (키, 순번) 해시 인덱스로 좌측 행의 짝을 찾음 (키 값이 없는 행은 짝이 없음)
+            right_valid = np.flatnonzero(right_keys >= 0)
+            matches = pd.Index(right_keys[right_valid]).get_indexer(left_keys)
+            matched = (matches >= 0) & (left_keys >= 0)
+            pairs = self._remember(key, np.vstack([left_rows[matched], right_rows[right_valid[matches[matched]]]]))
+        return pairs[0], pairs[1]
+
+    def join_codes(self, keys):
+        """keys 컬럼 값 조합별 정수 코드 배열 (값이 없는 컬럼이 있는 행은 -1)"""
+        keys = tuple(keys)
+        codes = self._join_codes.get(keys)
+        if codes is None or len(codes) != len(self.store):
+            # 데이터가 추가되어 길이가 달라졌으면 다시 생성
+            codes = np.zeros(len(self.store), dtype=np.int64)
+            for column in keys:
+                column_codes, uniques = pd.factorize(self.store.column(column))
+                codes = np.where((codes < 0) | (column_codes < 0), -1, codes * len(uniques) + column_codes)
+                # 조합 코드가 커지지 않도록 나온 조합만으로 다시 번호를 매김
+                valid = codes >= 0
+                codes[valid] = pd.factorize(codes[valid])[0]
+            codes.flags.writeable = False
+            self._join_codes[keys] = codes
+        return codes
+
+    def facet_counts(self, conditions, columns):
+        """
+        컬럼별 값 → 행 수. 각 컬럼은 자기 조건만 뺀 나머지 조건으로 계산하므로
+        해당 컬럼의 값을 바꿨을 때 남는 행 수가 됩니다.
+        """
+        items = list(conditions.items())
+        bitmaps = [self._bitmap({column: value}) for column, value in items]
+        
+        # 앞/뒤 누적 AND를 만들어 두면 "자기 조건만 뺀 AND"를 조건 수에 비례하는 연산으로 구할 수 있음
+        prefix = [self.index.all_rows()]
+        for bitmap in bitmaps:
+            prefix.append(np.bitwise_and(prefix[-1], bitmap))
+        suffix = [self.index.all_rows()]
+        for bitmap in reversed(bitmaps):
+            suffix.append(np.bitwise_and(suffix[-1], bitmap))
+        suffix.reverse()
+        
+        positions = {column: i for i, (column, _) in enumerate(items)}
+        counts = {}
+        for column in columns:
+            if column not in self.index:
+                counts[column] = {}
+                continue
+            i = positions.get(column)
+            base = prefix[-1] if i is None else np.bitwise_and(prefix[i], suffix[i + 1])
+            counts[column] = self.index.counts(column, base)
+        return counts
+
+    def _bitmap(self, conditions):
+        """조건 비트맵 (검색어 조건은 나머지 조건을 만족하는 행 중에서 전문 검색)"""
+        conditions = dict(conditions)
+        query = conditions.pop(TEXT_SEARCH_KEY, None)
+        bitmap = self.index.select(conditions)
+        if query and self.text_index is not None:
+            bitmap = self.index.from_rows(self.text_index.search(self.store, query, self.index.rows(bitmap)))
+        return bitmap
+
+    def _key(self, conditions, target_var=None, target_values=None):
+        return f"{self.version}:{filter_key(conditions, target_var, target_values)}"
+
+    def _remember(self, key, rows):
+        # 캐시된 배열은 여러 콜백이 공유하므로 읽기 전용으로 보관
+        rows.flags.writeable = False
+        if self.cache is not None:
+            self.cache.put(key, rows)
+        return rows
+
+    def find_row(self, column, value):
+        """키 컬럼(test_case_id 등) 값이 value인 첫 행 번호 (없으면 None)"""
+        key_index = self._key_indexes.get(column)
+        if key_index is None or len(key_index) != len(self.store):
+            # 데이터가 추가되어 길이가 달라졌으면 다시 생성
+            key_index = pd.Index(self.store.column(column))
+            self._key_indexes[column] = key_index
+        
+        positions = key_index.get_indexer_for([normalize_value(value)])
+        positions = positions[positions >= 0]
+        return int(positions[0]) if len(positions) else None
+
+    def gather(self, rows, columns):
+        """선택된 행과 컬럼만 읽어 DataFrame으로 반환"""
+        return self.store.take(rows, columns)
+
+    def query(self, rows, filter_query):
+        """DataTable filter_query 조건을 만족하는 행만 남김 (필요한 컬럼만 선택된 행에 대해 읽음)"""
+        if not filter_query:
+            return rows
+        
+        for filter_part in filter_query.split(' && '):
+            col_name, operator, value = split_filter_part(filter_part)
+            if col_name not in self.store or len(rows) == 0:
+                continue
+            
+            values = self.store.take(rows, [col_name])[col_name]
+            rows = rows[filter_mask(values, operator, value)]
+        return rows
+
+    def sort(self, rows, sort_by):
+        """DataTable sort_by 기준으로 행 번호 정렬"""
+        sort_by = [s for s in sort_by or [] if s['column_id'] in self.store]
+        if not sort_by or len(rows) == 0:
+            return rows
+        
+        sort_df = self.store.take(rows, [s['column_id'] for s in sort_by])
+        sort_df = sort_df.sort_values(
+            by=[s['column_id'] for s in sort_by],
+            ascending=[s['direction'] == 'asc' for s in sort_by],
+            kind='stable'
+        )
+        return sort_df.index.to_numpy()
+
+    @staticmethod
+    def page(rows, page_current, page_size):
+        """현재 페이지에 해당하는 행 번호만 반환"""
+        start = (page_current or 0) * page_size
+        return rows[start:start + page_size]
+
+
+def _occurrence_keys(codes, num_codes):
+    """조인 코드와 같은 코드 안에서의 순번을 합친 키 (코드가 -1이면 -1)"""
+    order = np.argsort(codes, kind='stable')
+    sorted_codes = codes[order]
+    starts = np.flatnonzero(np.concatenate(([True], sorted_codes[1:] != sorted_codes[:-1])))
+    occurrence = np.empty(len(codes), dtype=np.int64)
+    occurrence[order] = np.arange(len(codes)) - np.repeat(starts, np.diff(np.append(starts, len(codes))))
+    return np.where(codes < 0, -1, occurrence * num_codes + codes)
+
+
+class FilterCache:
+    """
+    필터 상태 → 행 번호 배열 LRU 캐시.
+
+    같은 필터 상태를 테이블/차트/페이지 콜백이 각각 다시 계산하지 않도록 공유하며,
+    보관한 배열 크기(nbytes)의 합이 max_bytes를 넘으면 가장 오래 사용하지 않은 항목부터 제거합니다.
+    max_bytes보다 큰 배열 하나는 캐시하지 않습니다.
+    """
+
+    def __init__(self, max_bytes=256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            rows = self._entries.get(key)
+            if rows is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return rows
+
+    def put(self, key, rows):
+        if rows.nbytes > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.nbytes -= previous.nbytes
+            self._entries[key] = rows
+            self.nbytes += rows.nbytes
+            while self.nbytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.nbytes -= evicted.nbytes
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+    def stats(self):
+        """모니터링용 캐시 통계"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self.nbytes,
+                'max_bytes': self.max_bytes,
+                'rows_cached': int(sum(rows.size for rows in self._entries.values())),
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+def filter_key(conditions, target_var=None, target_values=None):
+    """
+    필터 상태를 정규화한 캐시 키.
+    조건 순서와 target_values 순서(OR 조건이므로 결과와 무관)에 상관없이 같은 키가 됩니다.
+    """
+    def canonical(value):
+        if isinstance(value, (list, tuple)):
+            values = [normalize_value(v) for v in value]
+            return sorted(values, key=lambda v: json.dumps(v, default=str))
+        return normalize_value(value)
+    
+    state = {
+        'conditions': {str(col): canonical(value) for col, value in conditions.items()},
+        'target_var': target_var,
+        'target_values': canonical(list(target_values)) if target_values is not None else None,
+    }
+    return json.dumps(state, sort_keys=True, default=str)
+
+
+# DataTable filter_query 연산자 (컬럼 바로 뒤에서만 찾으며, 같은 기호로 시작하는 연산자는 긴 것부터 확인)
+FILTER_OPERATORS = [['ge ', '>='],
+                    ['le ', '<='],
+                    ['lt ', '<'],
+                    ['gt ', '>'],
+                    ['ne ', '!='],
+                    ['eq ', '='],
+                    ['contains '],
+                    ['datestartswith ']]
+
+
+def split_filter_part(filter_part):
+    """
+    '{col} op value' 형식의 필터 조건을 (컬럼, 연산자, 값 문자열)로 분리.
+    연산자는 컬럼 뒤의 맨 앞에서만 찾으므로 값 안의 단어(예: "simple"의 le)는 연산자로 보지 않습니다.
+    """
+    start = filter_part.find('{')
+    end = filter_part.find('}', start + 1)
+    if start < 0 or end < 0:
+        return [None] * 3
+    name = filter_part[start + 1:end]
+    rest = filter_part[end + 1:].lstrip()
+    
+    for operator_type in FILTER_OPERATORS:
+        for operator in operator_type:
+            if rest.startswith(operator):
+                value_part = rest[len(operator):].strip()
+                v0 = value_part[0] if value_part else ''
+                if len(value_part) > 1 and v0 == value_part[-1] and v0 in ("'", '"', '`'):
+                    value_part = value_part[1: -1].replace('\\' + v0, v0)
+                
+                return name, operator_type[0].strip(), value_part
+    
+    return [None] * 3
+
+
+def filter_mask(values, operator, value):
+    """컬럼 값 Series에 필터 조건을 적용한 bool 배열"""
+    if operator in ('contains', 'datestartswith'):
+        text = values.astype(str)
+        if operator == 'contains':
+            mask = text.str.contains(value, case=False, regex=False)
+        else:
+            mask = text.str.startswith(value)
+        return mask.fillna(False).to_numpy(dtype=bool)
+    
+    # 숫자 컬럼은 숫자로, 그 외 컬럼은 문자열로 비교
+    if pd.api.types.is_numeric_dtype(values):
+        try:
+            value = float(value)
+        except ValueError:
+            return np.zeros(len(values), dtype=bool)
+    else:
+        values = values.astype(str)
+    
+    compare = {'eq': values.eq, 'ne': values.ne, 'lt': values.lt,
+               'le': values.le, 'gt': values.gt, 'ge': values.ge}[operator]
+    return compare(value).fillna(False).to_numpy(dtype=bool)
@@ -0,0 +1,22 @@
+import multiprocessing
+import os
+
+# 여러 워커로 대시보드 실행:
+#   gunicorn -c gunicorn.conf.py testcase_analysis_dashboard:server
+# 워커들은 EVAL_SNAPSHOT_DIR의 스냅샷(Arrow IPC + .npy 인덱스)을 메모리 매핑으로 공유하므로
+# 워커 수를 늘려도 데이터/인덱스 메모리는 한 벌만 사용합니다.
+
+bind = os.environ.get('DASHBOARD_BIND', '0.0.0.0:8050')
+workers = int(os.environ.get('DASHBOARD_WORKERS', multiprocessing.cpu_count()))
+# 요청 처리 중 미디어/라벨 저장 등 입출력 대기가 있으므로 워커마다 스레드를 둠
+threads = int(os.environ.get('DASHBOARD_THREADS', 4))
+# 첫 워커가 스냅샷을 만드는 동안 다른 워커가 잠금을 기다릴 수 있도록 충분히 길게 설정
+timeout = 300
+
+# 앱은 워커마다 로드 (라벨 저장/결과 수집 등 백그라운드 스레드는 fork 후에 시작되어야 함).
+# 데이터는 스냅샷 파일을 공유하므로 preload 없이도 워커마다 복사되지 않음
+preload_app = False
+
+# 스냅샷 디렉터리를 지정하지 않았으면 기본 위치 사용
+os.environ.setdefault('EVAL_SNAPSHOT_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                        '.dashboard_snapshot'))
@@ -0,0 +1,118 @@
+import atexit
+import os
+import sqlite3
+import threading
+import time
+
+# 한 번에 조회할 최대 test_case_id 개수 (SQLite 변수 개수 제한)
+QUERY_CHUNK_SIZE = 500
+
+
+class LabelStore:
+    """
+    휴먼 라벨 저장소 (SQLite, WAL 모드).
+
+    변경된 라벨은 바로 쓰지 않고 대기열에 모았다가 백그라운드 스레드가 `flush_interval`마다
+    한 트랜잭션으로 저장합니다. 같은 셀을 여러 번 고치면 마지막 값만 저장되며,
+    여러 작업자/프로세스가 동시에 저장해도 수정 시각이 더 늦은 라벨이 남습니다.
+    """
+
+    def __init__(self, path, flush_interval=1.0, max_pending=500):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._wakeup = threading.Event()
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS human_labels (
+                    test_case_id NOT NULL PRIMARY KEY,
+                    label TEXT,
+                    annotator TEXT,
+                    updated_at REAL NOT NULL
+                )
+            """)
+
+        self._thread = threading.Thread(target=self._run, name='label-store', daemon=True)
+        self._thread.start()
+        atexit.register(self.flush)
+
+    def _connect(self):
+        # sqlite3 연결은 스레드 간에 공유하지 않음
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute('PRAGMA busy_timeout=30000')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def save(self, changes, annotator=None):
+        """{test_case_id: label} 변경분을 저장 대기열에 추가"""
+        now = time.time()
+        with self._lock:
+            for test_case_id, label in changes.items():
+                self._pending[test_case_id] = (label, annotator, now)
+            if len(self._pending) >= self.max_pending:
+                self._wakeup.set()
+
+    def get_many(self, test_case_ids):
+        """test_case_id 목록에 대해 저장된 라벨 반환 (저장 대기 중인 라벨 포함)"""
+        ids = list(dict.fromkeys(test_case_ids))
+        labels = {}
+        conn = self._connect()
+        for start in range(0, len(ids), QUERY_CHUNK_SIZE):
+            chunk = ids[start:start + QUERY_CHUNK_SIZE]
+            placeholders = ','.join('?' * len(chunk))
+            labels.update(conn.execute(
+                f'SELECT test_case_id, label FROM human_labels WHERE test_case_id IN ({placeholders})',
+                chunk
+            ).fetchall())
+
+        with self._lock:
+            for test_case_id in ids:
+                if test_case_id in self._pending:
+                    labels[test_case_id] = self._pending[test_case_id][0]
+        return labels
+
+    def flush(self):
+        """대기 중인 라벨을 한 트랜잭션으로 저장"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+
+        rows = [(test_case_id, label, annotator, updated_at)
+                for test_case_id, (label, annotator, updated_at) in pending.items()]
+        try:
+            with self._connect() as conn:
+                conn.executemany("""
+                    INSERT INTO human_labels (test_case_id, label, annotator, updated_at)
+                    VALUES (?, ?, ?, ?)
+                    ON CONFLICT(test_case_id) DO UPDATE SET
+                        label = excluded.label,
+                        annotator = excluded.annotator,
+                        updated_at = excluded.updated_at
+                    WHERE excluded.updated_at >= human_labels.updated_at
+                """, rows)
+        except sqlite3.Error:
+            # 저장에 실패하면 그 사이 들어온 더 새로운 변경을 덮어쓰지 않도록 되돌림
+            with self._lock:
+                for test_case_id, value in pending.items():
+                    self._pending.setdefault(test_case_id, value)
+            raise
+        return len(rows)
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except sqlite3.Error as e:
+                print(f"Warning: failed to save human labels to '{self.path}': {e}")
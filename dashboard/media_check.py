@@ -0,0 +1,246 @@
+import mimetypes
+import os
+import socket
+import sqlite3
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import numpy as np
+
+from media_server import local_media_path
+
+# 여러 프로세스 중 한 곳만 URL을 확인하도록 잡는 파일 잠금 (Windows에는 없으므로 프로세스마다 확인)
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# 확인 결과 컬럼 접미사 (예: image_status, image_bytes, image_content_type, image_latency_ms)
+CHECK_COLUMN_SUFFIXES = ('status', 'bytes', 'content_type', 'latency_ms')
+# 아직 확인하지 않은 행의 상태 값
+PENDING_STATUS = 'pending'
+# HEAD 요청을 지원하지 않는 서버는 첫 바이트만 GET으로 요청
+HEAD_UNSUPPORTED_CODES = (403, 405, 501)
+
+
+def check_column_names(media_type):
+    """미디어 컬럼(audio_url 등)의 확인 결과 컬럼 이름 목록"""
+    prefix = media_type[:-len('_url')] if media_type.endswith('_url') else media_type
+    return [f"{prefix}_{suffix}" for suffix in CHECK_COLUMN_SUFFIXES]
+
+
+def check_media_url(url, timeout=5.0):
+    """
+    미디어 URL 하나를 확인하여 (상태, 크기(바이트), content-type, 지연 시간(ms)) 반환.
+    상태는 'ok', 'missing'(로컬 파일 없음), 'unsupported'(지원하지 않는 스킴),
+    'http <코드>', 'timeout', 'error' 중 하나입니다.
+    """
+    started = time.perf_counter()
+    size, content_type = np.nan, ''
+    try:
+        path = local_media_path(url)
+        scheme = urlparse(url).scheme
+        if path is not None:
+            size = float(os.path.getsize(path))
+            content_type = mimetypes.guess_type(path)[0] or ''
+            status = 'ok'
+        elif scheme in ('http', 'https'):
+            size, content_type = _check_remote(url, timeout)
+            status = 'ok'
+        elif scheme == 'file' or len(scheme) <= 1:
+            status = 'missing'
+        else:
+            status = 'unsupported'
+    except urllib.error.HTTPError as e:
+        status = f'http {e.code}'
+    except (socket.timeout, TimeoutError):
+        status = 'timeout'
+    except urllib.error.URLError as e:
+        status = 'timeout' if isinstance(e.reason, (socket.timeout, TimeoutError)) else 'error'
+    except (OSError, ValueError):
+        status = 'error'
+    latency_ms = round((time.perf_counter() - started) * 1000, 1)
+    return status, size, content_type, latency_ms
+
+
+def _check_remote(url, timeout):
+    try:
+        response = urllib.request.urlopen(urllib.request.Request(url, method='HEAD'), timeout=timeout)
+    except urllib.error.HTTPError as e:
+        if e.code not in HEAD_UNSUPPORTED_CODES:
+            raise
+        response = urllib.request.urlopen(urllib.request.Request(url, headers={'Range': 'bytes=0-0'}), timeout=timeout)
+
+    with response:
+        headers = response.headers
+        # Range 응답이면 전체 크기는 Content-Range의 마지막 값
+        length = headers.get('Content-Range', '').rpartition('/')[2] or headers.get('Content-Length')
+        content_type = headers.get('Content-Type', '').split(';')[0].strip()
+    size = float(length) if length and length.isdigit() else np.nan
+    return size, content_type
+
+
+class MediaCheckJob:
+    """
+    결과 저장소의 미디어 URL을 스레드 풀로 병렬 확인하는 백그라운드 작업.
+
+    URL마다 상태/크기/content-type/지연 시간을 한 번만 확인하여 저장소의 계산 컬럼으로 채우며,
+    동시에 확인하는 URL 수는 `max_workers`로 제한합니다. 정상인 URL은 `prefetch(media_type, url)`로
+    미리 읽어 둘 수 있습니다 (예: 이미지 썸네일 생성).
+    `results_path`를 지정하면 확인 결과를 SQLite 파일로 공유하여, 같은 파일을 쓰는 여러 워커 중
+    잠금을 잡은 한 프로세스만 URL을 확인하고 나머지는 기록된 결과를 읽습니다.
+    """
+
+    def __init__(self, store, media_types, max_workers=8, timeout=5.0, prefetch=None,
+                 batch_size=1000, poll_interval=5.0, results_path=None):
+        self.store = store
+        self.media_types = [media_type for media_type in media_types if media_type in store]
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.prefetch = prefetch
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.results_path = results_path
+        self.num_rows = 0
+        self._results = {}
+        self._stop = threading.Event()
+        self._thread = None
+        # 공유 결과 파일 연결/잠금 (백그라운드 스레드에서만 사용)
+        self._conn = None
+        self._lock_file = None
+        self._last_rowid = 0
+
+        # 확인 전에도 테이블에서 선택할 수 있도록 컬럼을 미리 추가 (상태는 pending)
+        for media_type in self.media_types:
+            status_col, bytes_col, type_col, latency_col = check_column_names(media_type)
+            store.set_values(status_col, [], [], fill_value=PENDING_STATUS, dtype=object)
+            store.set_values(bytes_col, [], [])
+            store.set_values(type_col, [], [], fill_value='', dtype=object)
+            store.set_values(latency_col, [], [])
+
+    @property
+    def columns(self):
+        """저장소에 추가되는 확인 결과 컬럼 목록"""
+        return [col for media_type in self.media_types for col in check_column_names(media_type)]
+
+    def start(self):
+        """백그라운드 스레드에서 확인 시작"""
+        self._thread = threading.Thread(target=self._run, name='media-check', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='media-check') as executor:
+            while True:
+                try:
+                    self.run_once(executor)
+                except Exception as e:
+                    print(f"Warning: failed to check media URLs: {e}")
+                if self._stop.wait(self.poll_interval):
+                    return
+
+    def run_once(self, executor):
+        """아직 확인하지 않은 행을 배치 단위로 확인하고, 확인한 행 수를 반환"""
+        checker = self._acquire_checker()
+        self._load_shared_results()
+        start = self.num_rows
+        end = len(self.store)
+        for batch_start, urls_df in self.store.scan(self.media_types, start, self.batch_size):
+            if self._stop.is_set() or batch_start >= end:
+                break
+            urls_df = urls_df.loc[:end - 1]
+            rows = urls_df.index.to_numpy()
+
+            # 처음 보는 URL만 풀에 넣어 병렬로 확인
+            pending = list({(media_type, url) for media_type in self.media_types
+                            for url in urls_df[media_type].dropna().unique().tolist()
+                            if isinstance(url, str) and url and (media_type, url) not in self._results})
+            if pending and not checker:
+                # 다른 프로세스가 확인 중이면 결과가 기록된 뒤 다음 주기에 이 배치부터 다시 채움
+                break
+            checked = dict(zip(pending, executor.map(lambda key: self._check(*key), pending)))
+            self._results.update(checked)
+            self._save_shared_results(checked)
+
+            for media_type in self.media_types:
+                results = [self._results.get((media_type, url)) for url in urls_df[media_type].tolist()]
+                status_col, bytes_col, type_col, latency_col = check_column_names(media_type)
+                self.store.set_values(status_col, rows, [r[0] if r else '' for r in results])
+                self.store.set_values(bytes_col, rows, [r[1] if r else np.nan for r in results])
+                self.store.set_values(type_col, rows, [r[2] if r else '' for r in results])
+                self.store.set_values(latency_col, rows, [r[3] if r else np.nan for r in results])
+            self.num_rows = int(rows[-1]) + 1
+        return self.num_rows - start
+
+    def _acquire_checker(self):
+        # 공유 파일이 없거나 잠금을 잡았으면 직접 확인 (잠금을 잡은 프로세스가 종료되면 다른 프로세스가 이어받음)
+        if self.results_path is None or fcntl is None or self._lock_file is not None:
+            return True
+        lock_file = open(self.results_path + '.lock', 'w')
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        self._lock_file = lock_file
+        return True
+
+    def _connect(self):
+        if self._conn is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.results_path)), exist_ok=True)
+            self._conn = sqlite3.connect(self.results_path, timeout=30)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS media_checks (
+                    media_type TEXT NOT NULL,
+                    url TEXT NOT NULL,
+                    status TEXT,
+                    bytes REAL,
+                    content_type TEXT,
+                    latency_ms REAL,
+                    PRIMARY KEY (media_type, url)
+                )
+            """)
+        return self._conn
+
+    def _load_shared_results(self):
+        # 지난번 이후 기록된 결과만 읽음
+        if self.results_path is None:
+            return
+        rows = self._connect().execute(
+            'SELECT rowid, media_type, url, status, bytes, content_type, latency_ms FROM media_checks '
+            'WHERE rowid > ? ORDER BY rowid', (self._last_rowid,)
+        ).fetchall()
+        for rowid, media_type, url, status, size, content_type, latency_ms in rows:
+            self._results[(media_type, url)] = (status, np.nan if size is None else size, content_type or '',
+                                                np.nan if latency_ms is None else latency_ms)
+            self._last_rowid = rowid
+
+    def _save_shared_results(self, checked):
+        if self.results_path is None or not checked:
+            return
+        with self._connect() as conn:
+            conn.executemany(
+                'INSERT OR REPLACE INTO media_checks VALUES (?, ?, ?, ?, ?, ?)',
+                [(media_type, url, status, None if np.isnan(size) else size, content_type,
+                  None if np.isnan(latency_ms) else latency_ms)
+                 for (media_type, url), (status, size, content_type, latency_ms) in checked.items()]
+            )
+
+    def _check(self, media_type, url):
+        result = check_media_url(url, self.timeout)
+        if result[0] == 'ok' and self.prefetch is not None:
+            try:
+                self.prefetch(media_type, url)
+            except Exception as e:
+                print(f"Warning: failed to prefetch '{url}': {e}")
+        return result
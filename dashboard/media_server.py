@@ -0,0 +1,183 @@
+import hashlib
+import io
+import os
+import threading
+import urllib.request
+from collections import OrderedDict
+from urllib.parse import quote, urlparse
+
+try:
+    from PIL import Image
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+    print("Warning: Pillow not available. Install with: pip install Pillow")
+
+# 썸네일 요청 경로 (원본 URL은 src 쿼리 파라미터로 전달)
+THUMBNAIL_ROUTE = '/_media/thumbnail'
+# 로컬 미디어 파일 요청 경로 (Range 요청 지원)
+MEDIA_ROUTE = '/_media/file'
+# 고해상도 화면을 위해 표시 크기보다 크게 생성하는 배율
+RENDITION_SCALE = 2
+# 원본 이미지 최대 크기 (바이트)
+MAX_SOURCE_BYTES = 20 * 1024 * 1024
+# 원격 원본을 가져올 때 제한 시간 (초)
+FETCH_TIMEOUT = 10
+# 실패한 원본을 다시 시도하지 않고 기억하는 최대 개수
+MAX_FAILED_URLS = 1024
+
+
+def local_media_path(url):
+    """로컬 파일(경로 또는 file:// URL)이면 파일 경로, 원격 URL이거나 파일이 없으면 None"""
+    if not url:
+        return None
+    parsed = urlparse(url)
+    if parsed.scheme == 'file':
+        path = urllib.request.url2pathname(parsed.path)
+    elif len(parsed.scheme) <= 1:
+        # 스킴이 없거나 Windows 드라이브 문자인 경우
+        path = url
+    else:
+        return None
+    return path if os.path.isfile(path) else None
+
+
+def media_url(url):
+    """브라우저에서 재생할 URL (로컬 파일은 미디어 서버 경로, 원격 URL은 그대로)"""
+    scheme = urlparse(url).scheme
+    if scheme == 'file' or len(scheme) <= 1:
+        return f"{MEDIA_ROUTE}?src={quote(url, safe='')}"
+    return url
+
+
+class ThumbnailCache:
+    """
+    이미지 원본을 한 번만 읽어 지정한 크기들의 썸네일을 만들고 디스크에 캐시.
+
+    원본을 처음 요청할 때 모든 크기를 함께 생성하며, 캐시 디렉터리 전체 크기가
+    `max_bytes`를 넘으면 가장 오래 사용하지 않은 파일부터 삭제합니다.
+    """
+
+    def __init__(self, cache_dir, sizes, max_bytes=512 * 1024 * 1024):
+        self.cache_dir = os.path.abspath(cache_dir)
+        self.sizes = sorted(set(sizes))
+        self.max_bytes = max_bytes
+        self._files = OrderedDict()
+        self._total_bytes = 0
+        self._failed = set()
+        self._lock = threading.Lock()
+        self._inflight = {}
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # 재시작 후에도 기존 캐시 파일을 수정 시각 순서로 이어서 사용
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            if os.path.isfile(path) and not name.startswith('.'):
+                stat = os.stat(path)
+                entries.append((stat.st_mtime, name, stat.st_size))
+        for _, name, size in sorted(entries):
+            self._files[name] = size
+            self._total_bytes += size
+        self._evict()
+
+    def url_for(self, url, size):
+        """원본 URL의 썸네일 요청 경로"""
+        return f"{THUMBNAIL_ROUTE}/{size}?src={quote(url, safe='')}"
+
+    def get(self, url, size):
+        """썸네일 파일 경로 (만들 수 없는 원본이면 None)"""
+        digest = hashlib.sha256(url.encode('utf-8')).hexdigest()[:32]
+        path = self._lookup(digest, size)
+        if path is not None:
+            return path
+
+        # 같은 원본을 동시에 여러 번 가져오지 않도록 원본별로 한 요청만 생성
+        with self._lock:
+            if url in self._failed:
+                return None
+            inflight = self._inflight.setdefault(digest, threading.Lock())
+        with inflight:
+            path = self._lookup(digest, size)
+            if path is None:
+                try:
+                    self._render_all(digest, self._fetch(url))
+                except Exception as e:
+                    print(f"Warning: failed to create thumbnail for '{url}': {e}")
+                    with self._lock:
+                        if len(self._failed) >= MAX_FAILED_URLS:
+                            self._failed.clear()
+                        self._failed.add(url)
+                path = self._lookup(digest, size)
+        with self._lock:
+            self._inflight.pop(digest, None)
+        return path
+
+    def _lookup(self, digest, size):
+        with self._lock:
+            for ext in ('.jpg', '.png'):
+                name = f"{digest}_{size}{ext}"
+                if name in self._files:
+                    self._files.move_to_end(name)
+                    return os.path.join(self.cache_dir, name)
+        return None
+
+    def _fetch(self, url):
+        path = local_media_path(url)
+        if path is not None:
+            with open(path, 'rb') as f:
+                data = f.read(MAX_SOURCE_BYTES + 1)
+        elif urlparse(url).scheme in ('http', 'https'):
+            with urllib.request.urlopen(url, timeout=FETCH_TIMEOUT) as response:
+                data = response.read(MAX_SOURCE_BYTES + 1)
+        else:
+            raise FileNotFoundError(url)
+        if len(data) > MAX_SOURCE_BYTES:
+            raise ValueError(f"image is larger than {MAX_SOURCE_BYTES} bytes")
+        return data
+
+    def _render_all(self, digest, data):
+        with Image.open(io.BytesIO(data)) as image:
+            image.load()
+            # 투명도가 있으면 PNG, 나머지는 JPEG으로 저장
+            has_alpha = image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info)
+            image = image.convert('RGBA' if has_alpha else 'RGB')
+
+            for size in self.sizes:
+                rendition = image.copy()
+                rendition.thumbnail((size * RENDITION_SCALE, size * RENDITION_SCALE))
+                name = f"{digest}_{size}{'.png' if has_alpha else '.jpg'}"
+                path = os.path.join(self.cache_dir, name)
+
+                # 다른 프로세스가 읽는 중일 수 있으므로 임시 파일에 쓴 뒤 교체
+                tmp_path = os.path.join(self.cache_dir, f".{name}.{threading.get_ident()}")
+                if has_alpha:
+                    rendition.save(tmp_path, format='PNG', optimize=True)
+                else:
+                    rendition.save(tmp_path, format='JPEG', quality=85, optimize=True)
+                os.replace(tmp_path, path)
+
+                with self._lock:
+                    self._total_bytes += os.path.getsize(path) - self._files.pop(name, 0)
+                    self._files[name] = os.path.getsize(path)
+        self._evict()
+
+    def _evict(self):
+        with self._lock:
+            while self._total_bytes > self.max_bytes and self._files:
+                name, size = self._files.popitem(last=False)
+                self._total_bytes -= size
+                try:
+                    os.remove(os.path.join(self.cache_dir, name))
+                except OSError:
+                    pass
+
+    def stats(self):
+        """모니터링용 캐시 통계"""
+        with self._lock:
+            return {
+                'files': len(self._files),
+                'bytes': self._total_bytes,
+                'max_bytes': self.max_bytes,
+                'failed': len(self._failed),
+            }
@@ -0,0 +1,121 @@
+import json
+import os
+import threading
+
+import pandas as pd
+
+from result_store import ARROW_EXTENSIONS, PARQUET_EXTENSIONS, load_result_store
+
+# 디렉터리 수집 시 읽는 샤드 파일 확장자 (JSONL은 이어 쓰는 중에도 읽고, 나머지는 완성된 파일만 읽음)
+JSONL_EXTENSIONS = ('.jsonl',)
+SHARD_EXTENSIONS = JSONL_EXTENSIONS + ('.csv',) + PARQUET_EXTENSIONS + ARROW_EXTENSIONS
+
+
+class ResultTailer:
+    """
+    JSONL 결과 파일이나 결과 샤드 디렉터리를 따라가며 새로 추가된 결과를 배치로 넘겨주는 수집기.
+
+    JSONL 파일은 마지막으로 읽은 위치부터 완성된 줄만 읽고, 그 외 샤드(Parquet/Arrow/CSV)는
+    두 번 연속 크기가 같을 때(쓰기가 끝난 뒤) 한 번만 읽습니다.
+    새 행은 `batch_size`개씩 DataFrame으로 `on_batch`에 전달됩니다.
+    """
+
+    def __init__(self, path, on_batch, batch_size=1000, poll_interval=2.0, skip_existing=False):
+        self.path = path
+        self.on_batch = on_batch
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self._offsets = {}
+        self._sizes = {}
+        self._done = set()
+        self._stop = threading.Event()
+        self._thread = None
+
+        if skip_existing:
+            # 이미 로드한 내용은 건너뛰고 이후에 추가되는 결과만 수집
+            for file_path in self._files():
+                if file_path.lower().endswith(JSONL_EXTENSIONS):
+                    self._offsets[file_path] = os.path.getsize(file_path)
+                else:
+                    self._done.add(file_path)
+
+    def start(self):
+        """백그라운드 스레드에서 주기적으로 수집 시작"""
+        self._thread = threading.Thread(target=self._run, name='result-tailer', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        while True:
+            try:
+                self.poll()
+            except Exception as e:
+                print(f"Warning: failed to ingest results from '{self.path}': {e}")
+            if self._stop.wait(self.poll_interval):
+                return
+
+    def poll(self):
+        """새 결과를 한 번 읽어 배치로 전달하고, 전달한 행 수를 반환"""
+        delivered = 0
+        for file_path in self._files():
+            if file_path.lower().endswith(JSONL_EXTENSIONS):
+                records = self._read_new_lines(file_path)
+                for start in range(0, len(records), self.batch_size):
+                    delivered += self._deliver(pd.DataFrame.from_records(records[start:start + self.batch_size]))
+            elif file_path not in self._done and self._is_complete(file_path):
+                self._done.add(file_path)
+                shard_store = load_result_store(file_path)
+                shard_df = shard_store.frame(shard_store.columns)
+                for start in range(0, len(shard_df), self.batch_size):
+                    delivered += self._deliver(shard_df.iloc[start:start + self.batch_size])
+        return delivered
+
+    def _files(self):
+        if os.path.isdir(self.path):
+            names = sorted(os.listdir(self.path))
+            # 숨김/임시 파일은 쓰기가 끝나기 전일 수 있으므로 제외
+            return [os.path.join(self.path, name) for name in names
+                    if not name.startswith('.') and name.lower().endswith(SHARD_EXTENSIONS)]
+        return [self.path] if os.path.isfile(self.path) else []
+
+    def _read_new_lines(self, file_path):
+        offset = self._offsets.get(file_path, 0)
+        if os.path.getsize(file_path) < offset:
+            # 파일이 잘렸거나 교체된 경우 처음부터 다시 읽음
+            print(f"Warning: '{file_path}' was truncated; reading it from the beginning")
+            offset = 0
+
+        with open(file_path, 'rb') as f:
+            f.seek(offset)
+            chunk = f.read()
+
+        # 아직 쓰는 중인 마지막 줄은 다음 수집 때 읽음
+        end = chunk.rfind(b'\n') + 1
+        self._offsets[file_path] = offset + end
+
+        records = []
+        for line in chunk[:end].splitlines():
+            if not line.strip():
+                continue
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                print(f"Warning: skipping malformed line in '{file_path}'")
+        return records
+
+    def _is_complete(self, file_path):
+        size = os.path.getsize(file_path)
+        previous = self._sizes.get(file_path)
+        self._sizes[file_path] = size
+        return previous == size
+
+    def _deliver(self, batch_df):
+        if len(batch_df) == 0:
+            return 0
+        self.on_batch(batch_df)
+        return len(batch_df)
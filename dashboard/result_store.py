@@ -0,0 +1,343 @@
+import itertools
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+# pyarrow 임포트 (Parquet/Arrow 파일 메모리 매핑용)
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+    print("Warning: pyarrow not available. Install with: pip install pyarrow")
+
+# 확장자별 파일 형식
+ARROW_EXTENSIONS = ('.arrow', '.feather', '.ipc')
+PARQUET_EXTENSIONS = ('.parquet', '.pq')
+
+# 스트리밍으로 추가된 행의 Arrow 청크가 이 개수를 넘으면 하나로 합침
+TAIL_MAX_CHUNKS = 32
+
+
+class ResultStore:
+    """
+    테스트 결과를 컬럼 단위로 보관하는 저장소.
+
+    Arrow IPC 파일은 메모리 매핑으로 열어 복사 없이 읽고, Parquet 파일은 필요한 컬럼만
+    그때그때 읽습니다. 콜백은 전체 DataFrame 대신 필요한 행/컬럼만 꺼내 사용합니다.
+    `cache_columns`에 지정한 컬럼(필터링/지표용 좁은 컬럼)만 NumPy 배열로 캐시하고,
+    `answer`/`think` 같은 넓은 텍스트 컬럼은 캐시하지 않습니다. Parquet의 넓은 컬럼은 요청한 행이 있는
+    row group만 읽으며, 전체 행을 차례로 읽을 때는 `scan`으로 row group마다 한 번씩만 읽습니다.
+    원본 파일에 없는 계산 컬럼(오디오 길이/파형 등)은 `set_values`로 추가하며 NumPy 배열로만 보관합니다.
+    """
+
+    def __init__(self, table=None, parquet_file=None, frame=None, cache_columns=None):
+        self._table = table
+        self._parquet_file = parquet_file
+        self._frame = frame
+        self._cache_columns = set(cache_columns or [])
+        self._arrow_columns = {}
+        self._numpy_columns = {}
+        self._numpy_buffers = {}
+        # 스트리밍으로 추가된 행 (원본 파일과 별도로 메모리에 보관)
+        self._tail = None
+        # 계산 컬럼 이름 → 아직 계산되지 않은 행의 값
+        self._derived = {}
+        self._lock = threading.Lock()
+
+        if table is not None:
+            self._columns = list(table.column_names)
+            self._num_rows = table.num_rows
+        elif parquet_file is not None:
+            self._columns = list(parquet_file.schema_arrow.names)
+            self._num_rows = parquet_file.metadata.num_rows
+            # row group별 첫 행 번호 (마지막 값은 파일의 전체 행 수)
+            metadata = parquet_file.metadata
+            self._row_group_starts = np.concatenate(
+                ([0], np.cumsum([metadata.row_group(i).num_rows for i in range(metadata.num_row_groups)])))
+        else:
+            self._columns = frame.columns.tolist()
+            self._num_rows = len(frame)
+
+    @classmethod
+    def from_dataframe(cls, data_df, cache_columns=None):
+        """메모리에 있는 DataFrame으로 저장소 생성 (pyarrow가 있으면 Arrow 테이블로 변환)"""
+        data_df = data_df.reset_index(drop=True)
+        if PYARROW_AVAILABLE:
+            return cls(table=pa.Table.from_pandas(data_df, preserve_index=False),
+                       cache_columns=cache_columns)
+        return cls(frame=data_df, cache_columns=cache_columns)
+
+    @property
+    def columns(self):
+        """원본 결과 컬럼 목록 (계산 컬럼 제외)"""
+        return list(self._columns)
+
+    @property
+    def derived_columns(self):
+        return list(self._derived)
+
+    def __len__(self):
+        return self._num_rows
+
+    def __contains__(self, column):
+        return column in self._columns or column in self._derived
+
+    def _arrow_column(self, name):
+        if self._table is not None:
+            column = self._table.column(name)
+        else:
+            column = self._arrow_columns.get(name)
+            if column is None:
+                # Parquet는 요청된 컬럼만 디코딩 (좁은 컬럼만 Arrow 버퍼로 보관하고 넓은 컬럼은 매번 읽음)
+                column = self._parquet_file.read(columns=[name]).column(0)
+                if name in self._cache_columns:
+                    self._arrow_columns[name] = column
+
+        tail = self._tail
+        if tail is None:
+            return column
+        # 원본 청크 뒤에 추가된 청크를 이어 붙임 (복사 없음)
+        return pa.chunked_array(column.chunks + tail.column(name).chunks, type=column.type)
+
+    def append(self, data_df):
+        """
+        새 결과 행을 뒤에 추가합니다 (스트리밍 수집용).
+        저장소에 없는 컬럼은 버리고, 빠진 컬럼은 빈 값으로 채웁니다.
+        """
+        if len(data_df) == 0:
+            return
+        data_df = data_df.reindex(columns=self._columns).reset_index(drop=True)
+
+        if self._frame is not None:
+            frame = pd.concat([self._frame, data_df], ignore_index=True)
+        else:
+            schema = self._table.schema if self._table is not None else self._parquet_file.schema_arrow
+            batch = pa.Table.from_pandas(data_df, preserve_index=False).cast(schema)
+            tail = batch if self._tail is None else pa.concat_tables([self._tail, batch])
+            if tail.column(0).num_chunks > TAIL_MAX_CHUNKS:
+                # 작은 배치가 많이 쌓이면 take가 느려지므로 추가된 부분만 하나로 합침
+                tail = tail.combine_chunks()
+
+        with self._lock:
+            # 캐시된 컬럼 목록은 잠금 안에서 확인 (column()이 그 사이에 캐시한 컬럼도 새 행을 받도록)
+            cached_columns = [col for col in self._numpy_columns if col not in self._derived]
+            if self._frame is not None:
+                new_values = {col: data_df[col].to_numpy() for col in cached_columns}
+                self._frame = frame
+            else:
+                new_values = {col: batch.column(col).to_numpy() for col in cached_columns}
+                self._tail = tail
+            # 계산 컬럼은 새 행을 계산 전 값으로 채움
+            for col, fill_value in self._derived.items():
+                new_values[col] = np.full(len(data_df), fill_value, dtype=self._numpy_columns[col].dtype)
+            # 캐시된 NumPy 컬럼은 새 행만 변환하여 이어 붙임
+            for col, values in new_values.items():
+                self._extend_cached(col, values)
+            self._num_rows += len(data_df)
+
+    def set_values(self, name, rows, values, fill_value=np.nan, dtype=float):
+        """
+        계산 컬럼의 지정한 행 값을 채웁니다 (처음 호출하면 모든 행이 fill_value인 컬럼을 추가).
+        dtype이 object이면 행마다 배열 같은 값을 그대로 보관합니다.
+        """
+        if name in self._columns:
+            raise ValueError(f"'{name}' is a result column and cannot be overwritten")
+        with self._lock:
+            if name not in self._derived:
+                self._numpy_columns[name] = np.full(self._num_rows, fill_value, dtype=dtype)
+                self._derived[name] = fill_value
+            column = self._numpy_columns[name]
+            if column.dtype == object:
+                for row, value in zip(rows, values):
+                    column[row] = value
+            else:
+                column[np.asarray(rows, dtype=np.int64)] = values
+
+    def _extend_cached(self, name, values):
+        current = self._numpy_columns[name]
+        buffer = self._numpy_buffers.get(name)
+        start, end = len(current), len(current) + len(values)
+        dtype = np.result_type(current.dtype, values.dtype)
+
+        if buffer is None or len(buffer) < end or buffer.dtype != dtype:
+            # 용량을 두 배씩 늘려 배치마다 전체 컬럼을 복사하지 않도록 함
+            buffer = np.empty(max(end, 2 * start), dtype=dtype)
+            buffer[:start] = current
+            self._numpy_buffers[name] = buffer
+        buffer[start:end] = values
+        # 기존 뷰를 들고 있는 콜백에는 영향이 없도록 새 뷰로 교체
+        self._numpy_columns[name] = buffer[:end]
+
+    def column(self, name):
+        """컬럼 전체를 NumPy 배열로 반환 (cache_columns에 포함된 컬럼은 캐시)"""
+        values = self._numpy_columns.get(name)
+        if values is not None:
+            return values
+        if name not in self._cache_columns:
+            return self._read_column(name)
+
+        # 캐시할 컬럼은 append와 같은 잠금 안에서 읽어 넣음 (새 행이 빠진 배열이 캐시되지 않도록)
+        with self._lock:
+            if name not in self._numpy_columns:
+                self._numpy_columns[name] = self._read_column(name)
+            return self._numpy_columns[name]
+
+    def _read_column(self, name):
+        if self._frame is not None:
+            return self._frame[name].to_numpy()
+        return self._arrow_column(name).to_numpy()
+
+    def frame(self, columns):
+        """지정한 컬럼만 포함하는 DataFrame 반환 (모든 행)"""
+        columns = [col for col in dict.fromkeys(columns) if col in self]
+        if self._frame is not None and not any(col in self._derived for col in columns):
+            return self._frame[columns]
+        return pd.DataFrame({col: self.column(col) for col in columns})
+
+    def write_ipc(self, path):
+        """
+        원본 컬럼 전체(추가된 행 포함, 계산 컬럼 제외)를 압축하지 않은 Arrow IPC 파일로 저장.
+        압축하지 않은 IPC 파일은 load_result_store가 메모리 매핑으로 열어 여러 프로세스가 복사 없이 공유합니다.
+        """
+        if not PYARROW_AVAILABLE:
+            raise ImportError(f"pyarrow is required to write '{path}'")
+
+        if self._frame is not None:
+            tables = [pa.Table.from_pandas(self._frame, preserve_index=False)]
+        elif self._table is not None:
+            tables = [self._table]
+        else:
+            # Parquet는 row group 단위로 읽어 기록 (파일 전체를 한 번에 메모리에 올리지 않음)
+            tables = (self._parquet_file.read_row_group(i) for i in range(self._parquet_file.num_row_groups))
+        schema = self._parquet_file.schema_arrow if self._parquet_file is not None else None
+
+        with pa.OSFile(path, 'wb') as sink:
+            writer = None
+            for table in itertools.chain(tables, [self._tail] if self._tail is not None else []):
+                if writer is None:
+                    writer = pa.ipc.new_file(sink, schema or table.schema)
+                writer.write_table(table)
+            if writer is None:
+                writer = pa.ipc.new_file(sink, schema)
+            writer.close()
+
+    def take(self, rows, columns):
+        """선택된 행과 컬럼만 읽어 DataFrame으로 반환 (인덱스는 원래 행 번호)"""
+        rows = np.asarray(rows, dtype=np.int64)
+        columns = [col for col in dict.fromkeys(columns) if col in self]
+        source_columns = [col for col in columns if col in self._columns]
+
+        if self._frame is not None:
+            col_positions = [self._frame.columns.get_loc(col) for col in source_columns]
+            result = self._frame.iloc[rows, col_positions].copy()
+        elif source_columns:
+            indices = pa.array(rows)
+            # Parquet의 넓은 컬럼은 요청한 행이 있는 row group만 읽음
+            wide_columns = [col for col in source_columns
+                            if self._parquet_file is not None and col not in self._cache_columns]
+            wide_table = self._take_row_groups(rows, wide_columns) if wide_columns else None
+            result = pa.table({col: wide_table.column(col) if col in wide_columns
+                               else self._arrow_column(col).take(indices)
+                               for col in source_columns}).to_pandas()
+        else:
+            result = pd.DataFrame(index=range(len(rows)))
+
+        result.index = pd.Index(rows)
+        if len(source_columns) < len(columns):
+            # 계산 컬럼은 NumPy 배열에서 바로 읽음
+            for col in columns:
+                if col in self._derived:
+                    result[col] = self._numpy_columns[col][rows]
+            result = result[columns]
+        return result
+
+    def _take_row_groups(self, rows, columns):
+        # 행 번호 순서로 정렬하여 row group마다 한 번만 읽고, 마지막에 요청한 순서로 되돌림
+        order = np.argsort(rows, kind='stable')
+        sorted_rows = rows[order]
+        starts = self._row_group_starts
+        groups = np.searchsorted(starts, sorted_rows, side='right') - 1
+
+        pieces = []
+        group_values, group_starts = np.unique(groups, return_index=True)
+        group_ends = np.append(group_starts[1:], len(sorted_rows))
+        for group, begin, end in zip(group_values, group_starts, group_ends):
+            local_rows = sorted_rows[begin:end] - starts[group]
+            if group < len(starts) - 1:
+                table = self._parquet_file.read_row_group(int(group), columns=columns)
+            else:
+                # 파일 뒤에 스트리밍으로 추가된 행
+                table = self._tail.select(columns)
+            pieces.append(table.take(pa.array(local_rows)))
+
+        if not pieces:
+            return self._parquet_file.schema_arrow.empty_table().select(columns)
+        inverse = np.empty_like(order)
+        inverse[order] = np.arange(len(order))
+        return pa.concat_tables(pieces).take(pa.array(inverse))
+
+    def scan(self, columns, start=0, batch_size=10000):
+        """
+        start 이후의 행을 차례로 읽어 (첫 행 번호, DataFrame)을 batch_size 행 이하씩 반환하는 반복자.
+        Parquet 파일의 행은 row group마다 한 번씩만 디코딩하므로 넓은 컬럼도 전체를 메모리에 올리지 않습니다.
+        """
+        columns = [col for col in dict.fromkeys(columns) if col in self]
+        end = len(self)
+        position = start
+        if self._parquet_file is not None and position < self._row_group_starts[-1]:
+            starts = self._row_group_starts
+            first_group = int(np.searchsorted(starts, position, side='right') - 1)
+            batch_start = int(starts[first_group])
+            batches = self._parquet_file.iter_batches(
+                batch_size=batch_size, row_groups=range(first_group, len(starts) - 1),
+                columns=[col for col in columns if col in self._columns])
+            for batch in batches:
+                batch_end = batch_start + batch.num_rows
+                if batch_end > position:
+                    rows = np.arange(position, batch_end)
+                    batch_df = batch.slice(position - batch_start).to_pandas()
+                    batch_df.index = pd.Index(rows)
+                    for col in columns:
+                        if col in self._derived:
+                            batch_df[col] = self._numpy_columns[col][rows]
+                    yield position, batch_df[columns]
+                    position = batch_end
+                batch_start = batch_end
+
+        for batch_start in range(position, end, batch_size):
+            yield batch_start, self.take(np.arange(batch_start, min(batch_start + batch_size, end)), columns)
+
+
+def load_result_store(path, cache_columns=None):
+    """
+    결과 파일을 열어 ResultStore로 반환합니다.
+
+    Args:
+        path (str): 결과 파일 경로 (.parquet, .arrow/.feather, .jsonl, .csv).
+        cache_columns (list): NumPy 배열로 캐시할 컬럼 리스트.
+    """
+    ext = os.path.splitext(path)[1].lower()
+
+    if ext in ARROW_EXTENSIONS + PARQUET_EXTENSIONS and not PYARROW_AVAILABLE:
+        raise ImportError(f"pyarrow is required to read '{path}'")
+
+    if ext in ARROW_EXTENSIONS:
+        # 메모리 매핑된 IPC 파일은 페이지 캐시를 그대로 사용 (복사 없음)
+        source = pa.memory_map(path, 'r')
+        table = pa.ipc.open_file(source).read_all()
+        return ResultStore(table=table, cache_columns=cache_columns)
+    if ext in PARQUET_EXTENSIONS:
+        parquet_file = pq.ParquetFile(path, memory_map=True)
+        return ResultStore(parquet_file=parquet_file, cache_columns=cache_columns)
+    if ext in ('.jsonl', '.json'):
+        return ResultStore.from_dataframe(pd.read_json(path, lines=ext == '.jsonl'),
+                                          cache_columns=cache_columns)
+    if ext == '.csv':
+        return ResultStore.from_dataframe(pd.read_csv(path, keep_default_na=False),
+                                          cache_columns=cache_columns)
+
+    raise ValueError(f"Unsupported result file format: '{path}'")
@@ -0,0 +1,82 @@
+import hashlib
+import json
+import os
+import shutil
+
+from bitmap_index import BitmapIndex
+from result_store import load_result_store
+from text_index import TextIndex
+
+# 여러 워커가 동시에 스냅샷을 만들지 않도록 잠그는 파일 잠금 (Windows에는 없으므로 잠금 없이 진행)
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# 스냅샷 파일 형식 버전 (형식이 바뀌면 올려서 이전 스냅샷을 다시 만들게 함)
+SNAPSHOT_FORMAT_VERSION = 1
+# 결과 테이블 파일 (압축하지 않은 Arrow IPC)
+SNAPSHOT_TABLE_FILE = 'results.arrow'
+# 스냅샷 생성이 끝났음을 나타내는 파일 (마지막에 기록)
+SNAPSHOT_MANIFEST_FILE = 'manifest.json'
+SNAPSHOT_LOCK_FILE = '.lock'
+
+
+def snapshot_key(source, index_columns, text_fields):
+    """원본 파일(경로/크기/수정 시각)과 인덱스 구성이 같으면 같은 키 (원본이 없으면 샘플 데이터)"""
+    if source:
+        stat = os.stat(source)
+        source_state = [os.path.abspath(source), stat.st_size, stat.st_mtime_ns]
+    else:
+        source_state = None
+    state = [SNAPSHOT_FORMAT_VERSION, source_state, list(index_columns), list(text_fields)]
+    return hashlib.sha1(json.dumps(state).encode('utf-8')).hexdigest()[:16]
+
+
+def open_snapshot(directory, source, load_source, index_columns, text_fields, cache_columns=None):
+    """
+    데이터와 인덱스 스냅샷을 열어 (store, index, text_index)로 반환.
+
+    스냅샷이 없거나 원본이 바뀌었으면 load_source()로 읽은 저장소로 새로 만듭니다. 여러 워커가 동시에 시작해도
+    파일 잠금으로 한 프로세스만 만들고, 나머지는 기다렸다가 같은 파일을 엽니다.
+    테이블과 인덱스 배열은 메모리 매핑으로 열기 때문에 워커 수가 늘어도 한 벌의 페이지 캐시를 공유합니다.
+    """
+    path = os.path.join(directory, snapshot_key(source, index_columns, text_fields))
+    if not os.path.exists(os.path.join(path, SNAPSHOT_MANIFEST_FILE)):
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, SNAPSHOT_LOCK_FILE), 'w') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            # 잠금을 기다리는 동안 다른 워커가 만들었으면 그대로 사용
+            if not os.path.exists(os.path.join(path, SNAPSHOT_MANIFEST_FILE)):
+                write_snapshot(path, load_source(), source, index_columns, text_fields)
+
+    store = load_result_store(os.path.join(path, SNAPSHOT_TABLE_FILE), cache_columns=cache_columns)
+    return store, BitmapIndex.load(path), TextIndex.load(path)
+
+
+def write_snapshot(path, store, source, index_columns, text_fields):
+    """저장소와 인덱스를 임시 디렉터리에 기록한 뒤 이름을 바꿔 한 번에 공개 (이전 스냅샷은 삭제)"""
+    temp_path = f'{path}.tmp{os.getpid()}'
+    shutil.rmtree(temp_path, ignore_errors=True)
+    os.makedirs(temp_path)
+
+    store.write_ipc(os.path.join(temp_path, SNAPSHOT_TABLE_FILE))
+    BitmapIndex.build(store, index_columns).save(temp_path)
+    TextIndex.build(store, text_fields).save(temp_path)
+    manifest = {'source': os.path.abspath(source) if source else None,
+                'index_columns': list(index_columns), 'text_fields': list(text_fields)}
+    with open(os.path.join(temp_path, SNAPSHOT_MANIFEST_FILE), 'w', encoding='utf-8') as f:
+        json.dump({**manifest, 'version': SNAPSHOT_FORMAT_VERSION, 'rows': len(store)}, f)
+    os.replace(temp_path, path)
+
+    # 같은 원본/인덱스 구성의 이전 스냅샷 삭제 (이미 메모리 매핑한 프로세스는 파일이 삭제되어도 계속 읽을 수 있음)
+    directory = os.path.dirname(path)
+    for name in os.listdir(directory):
+        old_path = os.path.join(directory, name)
+        if old_path == path or not os.path.isfile(os.path.join(old_path, SNAPSHOT_MANIFEST_FILE)):
+            continue
+        with open(os.path.join(old_path, SNAPSHOT_MANIFEST_FILE), encoding='utf-8') as f:
+            old_manifest = json.load(f)
+        if all(old_manifest.get(key) == value for key, value in manifest.items()):
+            shutil.rmtree(old_path, ignore_errors=True)
@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from agg_cube import SKETCH_RELATIVE_ACCURACY, AggCube, MetricSummary
+from result_store import ResultStore
+
+QUANTILES = [0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99]
+
+
+def skewed_frame(size, seed=0, scale=1.0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'model': rng.choice(['A', 'B'], size),
+        'temperature': rng.choice([0.0, 0.7], size),
+        'response_time': rng.lognormal(0.0, 1.5, size) * scale,
+    })
+
+
+def assert_close_quantiles(summary, data_df, groups):
+    for q in QUANTILES:
+        estimates = summary.quantile(q)
+        for g, group in enumerate(groups):
+            expected = np.quantile(data_df.loc[data_df['model'] == group, 'response_time'], q)
+            # 스케치 오차에 numpy 보간과 순위 반올림 차이만큼 여유를 둠
+            assert abs(estimates[g] - expected) <= 2 * SKETCH_RELATIVE_ACCURACY * expected, (q, group)
+
+
+def test_quantiles_on_skewed_data():
+    data_df = skewed_frame(20000)
+    cube = AggCube.build(ResultStore.from_dataframe(data_df), ['model', 'temperature'], ['response_time'])
+
+    summary = cube.summarize({}, 'model', ['A', 'B'], 'response_time')
+    assert_close_quantiles(summary, data_df, ['A', 'B'])
+    assert summary.count.sum() == len(data_df)
+    np.testing.assert_allclose(summary.mean(), data_df.groupby('model')['response_time'].mean().to_numpy())
+
+
+def test_extend_widens_range_instead_of_clamping():
+    data_df = skewed_frame(5000)
+    store = ResultStore.from_dataframe(data_df)
+    cube = AggCube.build(store, ['model', 'temperature'], ['response_time'])
+
+    # 처음 범위보다 훨씬 큰 값들이 추가됨
+    added_df = skewed_frame(5000, seed=1, scale=1000.0)
+    store.append(added_df)
+    cube.extend(store, len(data_df))
+
+    all_df = pd.concat([data_df, added_df], ignore_index=True)
+    summary = cube.summarize({'temperature': 0.7}, 'model', ['A', 'B'], 'response_time')
+    assert_close_quantiles(summary, all_df[all_df['temperature'] == 0.7], ['A', 'B'])
+
+
+def test_negative_and_zero_values():
+    values = np.array([-100.0, -10.0, -1.0, 0.0, 0.0, 1.0, 10.0, 100.0])
+    summary = MetricSummary.from_values(['all'], np.zeros(len(values), dtype=np.int64), values)
+
+    assert summary.quantile(0.0)[0] == -100.0
+    assert summary.quantile(0.5)[0] == 0.0
+    assert summary.quantile(1.0)[0] == 100.0
+    assert summary.quantile(0.25)[0] == pytest.approx(np.quantile(values, 0.25), rel=SKETCH_RELATIVE_ACCURACY)
+
+
+def test_histogram_counts_all_values():
+    data_df = skewed_frame(2000)
+    cube = AggCube.build(ResultStore.from_dataframe(data_df), ['model'], ['response_time'])
+
+    summary = cube.summarize({}, 'model', ['A', 'B', 'C'], 'response_time')
+    edges, hist = summary.histogram(bins=16)
+    assert len(edges) == 17 and hist.shape == (3, 16)
+    np.testing.assert_array_equal(hist.sum(axis=1), summary.count)
+    assert edges[0] == data_df['response_time'].min() and edges[-1] == data_df['response_time'].max()
@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from bitmap_index import BITMAP_MAX_CARDINALITY, BitmapIndex
+from result_store import ResultStore
+
+
+@pytest.fixture
+def store():
+    return ResultStore.from_dataframe(pd.DataFrame({
+        'model': ['A', 'B', 'A', 'C', 'B', 'A', 'C', 'A', 'B', 'A'],
+        'temperature': [0.1, 0.1, 0.7, 0.7, 0.1, 0.1, 0.7, 0.7, 0.1, 0.1],
+        'content_id': [f'c{i}' for i in range(10)],
+    }))
+
+
+def test_select_and_counts(store):
+    index = BitmapIndex.build(store, ['model', 'temperature'])
+
+    assert index.rows(index.select({})).tolist() == list(range(10))
+    assert index.rows(index.select({'model': 'A'})).tolist() == [0, 2, 5, 7, 9]
+    assert index.rows(index.select({'model': ['B', 'C'], 'temperature': 0.1})).tolist() == [1, 4, 8]
+    assert index.rows(index.select({'model': 'D'})).tolist() == []
+    # NumPy 스칼라도 JSON으로 넘어온 값과 같은 키
+    assert index.count(index.select({'temperature': np.float64(0.7)})) == 4
+    assert index.counts('model', index.select({'temperature': 0.1})) == {'A': 3, 'B': 3, 'C': 0}
+    assert index.rows(index.from_rows(np.array([3, 9]))).tolist() == [3, 9]
+
+
+def test_extend_appended_rows(store):
+    index = BitmapIndex.build(store, ['model', 'temperature'])
+    store.append(pd.DataFrame({'model': ['D', 'A'], 'temperature': [0.1, 0.7], 'content_id': ['c10', 'c11']}))
+    index.extend(store, 10)
+
+    assert index.num_rows == 12
+    assert index.values('model') == ['A', 'B', 'C', 'D']
+    assert index.rows(index.select({'model': ['A', 'D']})).tolist() == [0, 2, 5, 7, 9, 10, 11]
+    assert index.rows(index.select({'temperature': 0.7})).tolist() == [2, 3, 6, 7, 11]
+
+
+def test_extend_switches_to_postings_past_max_cardinality():
+    store = ResultStore.from_dataframe(pd.DataFrame({'content_id': ['a', 'b', 'a']}))
+    index = BitmapIndex.build(store, ['content_id'])
+    values = [f'v{i}' for i in range(BITMAP_MAX_CARDINALITY)]
+    store.append(pd.DataFrame({'content_id': values}))
+    index.extend(store, 3)
+
+    assert 'content_id' in index._postings and 'content_id' not in index._bitmaps
+    assert index.rows(index.select({'content_id': 'a'})).tolist() == [0, 2]
+    assert index.rows(index.select({'content_id': ['b', 'v0']})).tolist() == [1, 3]
+
+
+def test_save_and_load(store, tmp_path):
+    index = BitmapIndex.build(store, ['model', 'content_id'])
+    index.save(tmp_path)
+    loaded = BitmapIndex.load(tmp_path)
+
+    assert loaded.columns == index.columns
+    for conditions in ({'model': 'B'}, {'content_id': ['c3', 'c4']}, {'model': 'A', 'content_id': 'c5'}):
+        assert loaded.rows(loaded.select(conditions)).tolist() == index.rows(index.select(conditions)).tolist()
@@ -0,0 +1,206 @@
+import importlib
+import json
+import sqlite3
+import sys
+import time
+import urllib.parse
+
+import pytest
+
+DASHBOARD_MODULES = ['testcase_analysis_dashboard', 'testcase_analysis_dashboard_advanced']
+TABLES_OUTPUT = 'tables-rebuild-store.data'
+RENDER_OUTPUT = 'comparison-tables-container.children'
+TABLE_SUFFIXES = ['left', 'right']
+
+
+@pytest.fixture(scope='module', params=DASHBOARD_MODULES)
+def client(request, tmp_path_factory):
+    # 라벨/캐시 파일은 임시 디렉터리에 생성 (환경 변수는 모듈 테스트가 끝나면 되돌림)
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv('EVAL_DATA_DIR', str(tmp_path_factory.mktemp('dashboard_data')))
+        module = importlib.import_module(request.param)
+        yield module.app.server.test_client()
+
+
+def get_dependency(client, output):
+    dependencies = client.get('/_dash-dependencies').get_json()
+    return next(dependency for dependency in dependencies if dependency['output'].startswith(f'..{output}')
+                or dependency['output'] == output)
+
+
+def expand(item, values, with_value=True):
+    # ALL 패턴은 values['_tables']의 테이블들(기본은 좌우 두 개)과 일치하는 것으로 요청 항목을 만듦
+    prop = item['property'].split('@')[0]
+    if item['id'].startswith('{'):
+        pattern = json.loads(item['id'])
+        key = next(name for name, value in pattern.items() if value == ['ALL'])
+        ids = [{**pattern, key: suffix} for suffix in values.get('_tables', TABLE_SUFFIXES)]
+        entries = [{'id': component_id, 'property': prop} for component_id in ids]
+        if with_value:
+            for entry in entries:
+                entry['value'] = entry['id'] if prop == 'id' else values.get(f"{pattern['type']}.{prop}")
+        return entries
+    entry = {'id': item['id'], 'property': prop}
+    if with_value:
+        entry['value'] = values.get(f"{item['id']}.{prop}")
+    return entry
+
+
+def dispatch(client, output, values, changed, **kwargs):
+    """렌더러와 같은 형식으로 콜백을 호출 (백그라운드 작업이면 결과가 나올 때까지 확인)"""
+    dependency = get_dependency(client, output)
+    outputs = [expand({'id': part.rsplit('.', 1)[0], 'property': part.rsplit('.', 1)[1]}, values, False)
+               for part in dependency['output'].strip('.').split('...')]
+    payload = {
+        'output': dependency['output'],
+        'outputs': outputs if len(outputs) > 1 else outputs[0],
+        'inputs': [expand(item, values) for item in dependency['inputs']],
+        'state': [expand(item, values) for item in dependency['state']],
+        'changedPropIds': changed,
+    }
+    response = client.post('/_dash-update-component', json=payload, **kwargs)
+    if response.status_code != 200 or 'cacheKey' not in response.get_json():
+        return response
+
+    query = urllib.parse.urlencode({'cacheKey': response.get_json()['cacheKey'], 'job': response.get_json()['job']})
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        time.sleep(0.05)
+        response = client.post(f'/_dash-update-component?{query}', json=payload, **kwargs)
+        if response.status_code != 200 or 'response' in response.get_json():
+            break
+    return response
+
+
+TABLE_VALUES = {
+    'target-var-dropdown.value': 'model',
+    'target-values-dropdown.value': ['Claude-3', 'GPT-4'],
+    'table-columns-dropdown.value': ['test_case_id', 'model', 'answer'],
+    'control-values-store.data': {},
+    'pair-keys-dropdown.value': [],
+    'table-options-checklist.value': ['show_filter'],
+    'results-table-state.data': {'conditions': {}, 'target_var': 'model', 'target_values': ['Claude-3', 'GPT-4']},
+}
+
+
+def request_rebuild(client, values):
+    # 테이블 구성이 바뀌면 설정만 기록하고, 레이아웃은 백그라운드 콜백이 다시 만듦
+    response = dispatch(client, TABLES_OUTPUT, values, ['target-values-dropdown.value'])
+    assert response.status_code == 200
+    rebuild = response.get_json()['response']['tables-rebuild-store']['data']
+    response = dispatch(client, RENDER_OUTPUT, {'tables-rebuild-store.data': rebuild}, ['tables-rebuild-store.data'])
+    assert response.status_code == 200
+    return response.get_json()['response']['comparison-tables-container']['children']
+
+
+def test_first_render_builds_tables(client):
+    children = request_rebuild(client, {**TABLE_VALUES, '_tables': []})
+    assert 'results-table' in json.dumps(children)
+
+
+def test_rebuild_with_existing_tables(client):
+    children = request_rebuild(client, {**TABLE_VALUES, 'target-values-dropdown.value': ['GPT-4']})
+    assert '"suffix": "single"' in json.dumps(children)
+
+
+def test_incomplete_settings_with_existing_tables(client):
+    children = request_rebuild(client, {**TABLE_VALUES, 'target-values-dropdown.value': []})
+    assert 'Please complete the settings.' in json.dumps(children)
+
+
+def test_partial_updates_are_not_background_jobs(client):
+    assert not get_dependency(client, TABLES_OUTPUT)['background']
+
+
+def test_column_change_updates_columns_only(client):
+    response = dispatch(client, TABLES_OUTPUT, TABLE_VALUES, ['table-columns-dropdown.value'])
+    assert response.status_code == 200
+    updated = response.get_json()['response']
+    assert 'tables-rebuild-store' not in updated
+    assert all('columns' in updated[json.dumps({'suffix': suffix, 'type': 'results-table'}, separators=(',', ':'))]
+               for suffix in TABLE_SUFFIXES)
+
+
+def test_control_change_resets_pages(client):
+    response = dispatch(client, TABLES_OUTPUT, {**TABLE_VALUES, 'control-values-store.data': {'temperature': [0.7]}},
+                        ['control-values-store.data'])
+    assert response.status_code == 200
+    updated = response.get_json()['response']
+    assert 'tables-rebuild-store' not in updated
+    assert all(updated[json.dumps({'suffix': suffix, 'type': 'results-table'}, separators=(',', ':'))]
+               ['page_current'] == 0 for suffix in TABLE_SUFFIXES)
+
+
+@pytest.mark.parametrize('table_options', [['show_filter'], []])
+def test_table_options(client, table_options):
+    try:
+        get_dependency(client, '{"panel":["ALL"],"type":"table-panel"}.style')
+    except StopIteration:
+        pytest.skip('table options are only in the advanced dashboard')
+    response = dispatch(client, '{"panel":["ALL"],"type":"table-panel"}.style',
+                        {**TABLE_VALUES, 'table-options-checklist.value': table_options},
+                        ['table-options-checklist.value'])
+    assert response.status_code == 200
+
+
+def get_module(client):
+    return next(sys.modules[name] for name in DASHBOARD_MODULES
+                if name in sys.modules and sys.modules[name].app.server is client.application)
+
+
+def save_label(client, test_case_id, label, annotator):
+    changed = json.dumps({'suffix': 'left', 'type': 'label-changes'}, separators=(',', ':')) + '.data'
+    response = dispatch(client, 'hidden-div.children',
+                        {'label-changes.data': [{'id': test_case_id, 'human_label': label}], '_tables': ['left']},
+                        [changed], environ_base={'REMOTE_ADDR': annotator})
+    assert response.status_code == 200
+
+
+def test_label_changes_are_sent_only_on_user_edits(client):
+    dependency = get_dependency(client, '{"suffix":["MATCH"],"type":"label-changes"}.data')
+    assert [item['property'] for item in dependency['inputs']] == ['data_timestamp']
+    assert 'active_cell' in [item['property'] for item in dependency['state']]
+
+
+def test_unchanged_label_is_not_saved_again(client):
+    label_store = get_module(client).label_store
+
+    def saved():
+        label_store.flush()
+        with sqlite3.connect(label_store.path) as conn:
+            return conn.execute('SELECT label, annotator FROM human_labels WHERE test_case_id = ?',
+                                ('label-test',)).fetchone()
+
+    save_label(client, 'label-test', 'good', '10.0.0.1')
+    assert saved() == ('good', '10.0.0.1')
+    # 같은 라벨이 다시 전송되어도 다른 작업자의 라벨로 바뀌지 않음
+    save_label(client, 'label-test', 'good', '10.0.0.2')
+    assert saved() == ('good', '10.0.0.1')
+    save_label(client, 'label-test', 'bad', '10.0.0.2')
+    assert saved() == ('bad', '10.0.0.2')
+
+
+def test_ingested_media_file_supports_range_requests(client, tmp_path):
+    module = get_module(client)
+    audio_path = tmp_path / 'ingested.wav'
+    audio_path.write_bytes(bytes(range(256)) * 4)
+    url = f'{module.MEDIA_ROUTE}?src={urllib.parse.quote(str(audio_path), safe="")}'
+    assert client.get(url).status_code == 404
+
+    # 스트리밍으로 추가된 행의 로컬 파일은 바로 제공됨
+    num_rows, version = len(module.store), module.engine.version
+    batch_df = module.store.take([0], module.store.columns)
+    batch_df['test_case_id'] = num_rows + 100000
+    batch_df['audio_url'] = str(audio_path)
+    module.ingest_results(batch_df)
+    assert len(module.store) == num_rows + 1 and module.engine.version == version + 1
+    assert module.engine.find_row('audio_url', str(audio_path)) == num_rows
+
+    response = client.get(url, headers={'Range': 'bytes=10-19'})
+    assert response.status_code == 206
+    assert response.headers['Content-Range'] == 'bytes 10-19/1024'
+    assert response.data == bytes(range(10, 20))
+
+    response = client.get(url, headers={'Range': 'bytes=2000-'})
+    assert response.status_code == 416
+    assert client.get(url).data == audio_path.read_bytes()
@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from bitmap_index import BitmapIndex
+from filter_engine import FilterCache, FilterEngine, split_filter_part
+from result_store import ResultStore
+
+
+@pytest.mark.parametrize('filter_part, expected', [
+    ('{answer} contains "simple test"', ('answer', 'contains', 'simple test')),
+    ('{answer} contains "big cage here"', ('answer', 'contains', 'big cage here')),
+    ('{answer} contains "one two"', ('answer', 'contains', 'one two')),
+    ('{answer} contains "same eq sign"', ('answer', 'contains', 'same eq sign')),
+    ('{answer} eq "a ne b"', ('answer', 'eq', 'a ne b')),
+    ('{response_time} ge 1.5', ('response_time', 'ge', '1.5')),
+    ('{response_time} >= 1.5', ('response_time', 'ge', '1.5')),
+    ('{response_time} > 1.5', ('response_time', 'gt', '1.5')),
+    ('{response_time} le 2', ('response_time', 'le', '2')),
+    ('{response_time} < 2', ('response_time', 'lt', '2')),
+    ('{model} != GPT-4', ('model', 'ne', 'GPT-4')),
+    ("{model} = 'Claude-3'", ('model', 'eq', 'Claude-3')),
+    ('{date} datestartswith 2024-01', ('date', 'datestartswith', '2024-01')),
+])
+def test_split_filter_part(filter_part, expected):
+    assert tuple(split_filter_part(filter_part)) == expected
+
+
+def test_split_filter_part_without_column_or_operator():
+    assert split_filter_part('contains "simple test"') == [None] * 3
+    assert split_filter_part('{answer} "simple test"') == [None] * 3
+
+
+@pytest.fixture
+def engine():
+    data_df = pd.DataFrame({
+        'model': ['A', 'A', 'B', 'B'],
+        'answer': ['a simple test', 'big cage here', 'simple', 'one eq two'],
+        'response_time': [0.5, 1.5, 2.5, 3.5],
+    })
+    store = ResultStore.from_dataframe(data_df, cache_columns=['model', 'response_time'])
+    return FilterEngine(store, BitmapIndex.build(store, ['model']), cache=FilterCache())
+
+
+@pytest.mark.parametrize('filter_query, expected', [
+    ('{answer} contains "simple test"', [0]),
+    ('{answer} contains "big cage here"', [1]),
+    ('{answer} contains "one eq two"', [3]),
+    ('{answer} contains "simple" && {response_time} ge 2', [2]),
+    ('{response_time} le 1.5', [0, 1]),
+])
+def test_query_multi_word_values(engine, filter_query, expected):
+    rows = engine.query(np.arange(4), filter_query)
+    assert rows.tolist() == expected
+
+
+def test_filter_cache_is_bounded_by_bytes():
+    cache = FilterCache(max_bytes=3 * 800)
+    for i in range(4):
+        cache.put(f'key{i}', np.arange(100, dtype=np.int64))
+
+    stats = cache.stats()
+    assert stats['entries'] == 3 and stats['bytes'] == 2400 and stats['evictions'] == 1
+    assert cache.get('key0') is None and cache.get('key3') is not None
+
+    # 같은 키를 다시 넣으면 크기를 바꿔서 계산하고, 한도보다 큰 배열은 캐시하지 않음
+    cache.put('key3', np.arange(10, dtype=np.int64))
+    assert cache.stats()['bytes'] == 2 * 800 + 80
+    cache.put('huge', np.arange(1000, dtype=np.int64))
+    assert cache.get('huge') is None and cache.stats()['entries'] == 3
+    cache.clear()
+    assert cache.stats()['bytes'] == 0
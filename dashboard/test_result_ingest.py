@@ -0,0 +1,57 @@
+import json
+
+import pandas as pd
+
+from result_ingest import ResultTailer
+from result_store import ResultStore
+
+
+def write_lines(path, records, mode='a', partial=''):
+    with open(path, mode, encoding='utf-8') as f:
+        f.writelines(json.dumps(record) + '\n' for record in records)
+        f.write(partial)
+
+
+def test_jsonl_reads_only_complete_lines(tmp_path):
+    path = tmp_path / 'results.jsonl'
+    write_lines(path, [{'id': 0}, {'id': 1}], mode='w', partial='{"id": 2')
+    batches = []
+    tailer = ResultTailer(str(path), batches.append, batch_size=1)
+
+    assert tailer.poll() == 2
+    assert [batch['id'].tolist() for batch in batches] == [[0], [1]]
+
+    # 쓰던 줄이 끝나면 다음 수집에서 읽음
+    write_lines(path, [], partial='}\n{"id": 3}\n')
+    assert tailer.poll() == 2
+    assert pd.concat(batches)['id'].tolist() == [0, 1, 2, 3]
+    assert tailer.poll() == 0
+
+
+def test_jsonl_skip_existing_and_truncation(tmp_path):
+    path = tmp_path / 'results.jsonl'
+    write_lines(path, [{'id': 0}, {'id': 1}], mode='w')
+    batches = []
+    tailer = ResultTailer(str(path), batches.append, skip_existing=True)
+    assert tailer.poll() == 0
+
+    write_lines(path, [{'id': 2}, {'id': 3}])
+    assert tailer.poll() == 2
+
+    # 파일이 교체되면 처음부터 다시 읽음
+    write_lines(path, [{'id': 4}], mode='w')
+    assert tailer.poll() == 1
+    assert pd.concat(batches)['id'].tolist() == [2, 3, 4]
+
+
+def test_directory_shards_are_read_once_when_complete(tmp_path):
+    pd.DataFrame({'id': range(5)}).to_parquet(tmp_path / 'shard-0.parquet')
+    pd.DataFrame({'id': range(5, 8)}).to_parquet(tmp_path / '.shard-1.parquet.tmp')
+    store = ResultStore.from_dataframe(pd.DataFrame({'id': [-1]}))
+    tailer = ResultTailer(str(tmp_path), store.append, batch_size=2)
+
+    # 크기가 두 번 연속 같아야 쓰기가 끝난 샤드로 보고 읽음 (숨김 파일은 제외)
+    assert tailer.poll() == 0
+    assert tailer.poll() == 5
+    assert tailer.poll() == 0
+    assert store.column('id').tolist() == [-1, 0, 1, 2, 3, 4]
@@ -0,0 +1,78 @@
+import threading
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from result_store import ResultStore, load_result_store
+
+
+@pytest.fixture
+def data_df():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        'test_case_id': [f'tc_{i}' for i in range(1000)],
+        'model': rng.choice(['A', 'B', 'C'], 1000),
+        'response_time': rng.random(1000),
+        'answer': [f'answer {i} ' * 5 for i in range(1000)],
+    })
+
+
+@pytest.fixture
+def parquet_store(tmp_path, data_df):
+    path = tmp_path / 'results.parquet'
+    pq.write_table(pa.Table.from_pandas(data_df, preserve_index=False), path, row_group_size=128)
+    return load_result_store(str(path), cache_columns=['test_case_id', 'model', 'response_time'])
+
+
+def test_parquet_take_reads_wide_columns_without_caching(parquet_store, data_df):
+    rows = np.array([999, 3, 500, 3, 127, 128])
+    result = parquet_store.take(rows, ['model', 'answer'])
+    pd.testing.assert_frame_equal(result, data_df.loc[rows, ['model', 'answer']])
+    assert 'answer' not in parquet_store._arrow_columns
+    assert parquet_store.take([], ['answer']).empty
+
+
+def test_parquet_take_includes_appended_rows(parquet_store, data_df):
+    parquet_store.append(data_df.iloc[:10])
+    rows = np.array([1005, 2, 1000])
+    result = parquet_store.take(rows, ['test_case_id', 'answer'])
+    assert result['test_case_id'].tolist() == ['tc_5', 'tc_2', 'tc_0']
+    assert result['answer'].tolist() == data_df['answer'].iloc[[5, 2, 0]].tolist()
+
+
+@pytest.mark.parametrize('start', [0, 100, 128, 999])
+def test_scan_returns_rows_in_order(parquet_store, data_df, start):
+    parquet_store.append(data_df.iloc[:30])
+    batches = list(parquet_store.scan(['answer', 'model'], start, batch_size=50))
+    expected = pd.concat([data_df, data_df.iloc[:30]], ignore_index=True).iloc[start:][['answer', 'model']]
+    assert all(len(batch_df) <= 50 and batch_df.index[0] == batch_start for batch_start, batch_df in batches)
+    pd.testing.assert_frame_equal(pd.concat([batch_df for _, batch_df in batches]), expected)
+
+
+def test_write_ipc_round_trip(tmp_path, parquet_store, data_df):
+    parquet_store.append(data_df.iloc[:5])
+    path = tmp_path / 'results.arrow'
+    parquet_store.write_ipc(str(path))
+    reloaded = load_result_store(str(path))
+    assert len(reloaded) == 1005
+    pd.testing.assert_frame_equal(reloaded.frame(reloaded.columns),
+                                  pd.concat([data_df, data_df.iloc[:5]], ignore_index=True))
+
+
+def test_append_extends_columns_cached_concurrently():
+    columns = [f'c{i}' for i in range(20)]
+    data_df = pd.DataFrame({col: np.arange(1000) for col in columns})
+    store = ResultStore.from_dataframe(data_df, cache_columns=columns)
+
+    def append():
+        for _ in range(50):
+            store.append(data_df.iloc[:100])
+    thread = threading.Thread(target=append)
+    thread.start()
+    for col in columns:
+        store.column(col)
+    thread.join()
+    assert all(len(store.column(col)) == len(store) == 6000 for col in columns)
@@ -0,0 +1,31 @@
+from text_diff import TextDiffer, diff_html
+
+PAIRS = [(f'answer {i} is simple', f'answer {i} is not simple') for i in range(10)]
+
+
+def test_diff_html_marks_changes_and_escapes():
+    html = diff_html('a <b> c', 'a <b> d')
+    assert '<del' in html and '<ins' in html
+    assert '<b>' not in html
+
+
+def test_page_is_diffed_inline_and_cached():
+    differ = TextDiffer()
+    assert differ._executor is None
+
+    results = differ.diff_many(PAIRS + PAIRS[:1])
+    assert results[:10] == [diff_html(left, right) for left, right in PAIRS]
+    assert results[10] == results[0]
+    assert differ.stats()['misses'] == 10
+
+    differ.diff_many(PAIRS)
+    assert differ.stats()['hits'] == 10
+
+
+def test_worker_pool_matches_inline():
+    differ = TextDiffer(max_workers=2, inline_max=0)
+    try:
+        assert differ._executor is not None
+        assert differ.diff_many(PAIRS) == [diff_html(left, right) for left, right in PAIRS]
+    finally:
+        differ.shutdown()
@@ -1,15 +1,33 @@
 import dash
-from dash import dcc, html, dash_table, Input, Output, State, callback, ALL
+import flask
+from dash import dcc, html, dash_table, Input, Output, State, callback, ALL, MATCH, ctx
 import plotly.express as px
 import plotly.graph_objects as go
 import pandas as pd
 import numpy as np
 from datetime import datetime
-import json
 import base64
+import functools
 import io
+import math
 import os
 
+from result_store import ResultStore, load_result_store
+from snapshot import open_snapshot
+from bitmap_index import BitmapIndex
+from filter_engine import FilterEngine, FilterCache
+from text_index import TextIndex, TEXT_SEARCH_KEY
+from value_catalog import ValueCatalog
+from agg_cube import AggCube
+from compare_stats import compare_groups, CONFIDENCE_LEVEL
+from text_diff import TextDiffer
+from background_jobs import ThreadJobManager
+from result_ingest import ResultTailer
+from label_store import LabelStore
+from audio_summary import AudioSummaryJob, AUDIO_DURATION_COLUMN, AUDIO_WAVEFORM_COLUMN, waveform_svg, format_duration
+from media_check import MediaCheckJob
+from media_server import ThumbnailCache, THUMBNAIL_ROUTE, MEDIA_ROUTE, PIL_AVAILABLE, local_media_path, media_url
+
 # dash_player 임포트 (비디오 재생용)
 try:
     import dash_player as dp
@@ -18,6 +36,17 @@ except ImportError:
     DASH_PLAYER_AVAILABLE = False
     print("Warning: dash_player not available. Install with: pip install dash-player")
 
+# diskcache 임포트 (무거운 콜백을 별도 브로커 없이 백그라운드 작업으로 실행, 진행 상황/결과를 워커 간에 공유)
+try:
+    import diskcache
+    DISKCACHE_AVAILABLE = True
+except ImportError:
+    DISKCACHE_AVAILABLE = False
+    print("Warning: diskcache not available. Install with: pip install diskcache")
+
+# 대시보드가 실행 중에 만드는 파일의 기본 위치 (실행 위치와 관계없이 대시보드 폴더 아래)
+DATA_DIR = os.environ.get('EVAL_DATA_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.dashboard_data'))
+
 # 테이블 스타일 상수 정의
 TABLE_ROW_HEIGHT = 50  # 행 높이 (px)
 TABLE_CELL_PADDING = '8px'  # 셀 패딩
@@ -27,19 +56,66 @@ TABLE_MAX_HEIGHT = '400px'  # 테이블 최대 높이
 # 차트 및 섹션 표시 여부 설정 (True: 표시, False: 숨김)
 SHOW_CHARTS = False  # 우측 차트 표시 여부
 SHOW_VISUALIZATION_METRIC = False  # "Visualization of Metric" 섹션 표시 여부
+SHOW_COMPARISON_STATS = True  # 조작 변인 값이 2개일 때 지표별 차이/신뢰구간/p값 표시
+SHOW_TEXT_DIFF = True  # 행을 짝지은 좌우 비교에서 우측 테이블에 좌측 대비 텍스트 diff 컬럼 표시
+DIFF_TEXT_COLUMN = 'answer'  # diff를 표시할 텍스트 컬럼
+MAX_SCATTER_POINTS = 5000  # 산점도 최대 점 개수 (초과하면 조작 변인 값별 비율을 유지하며 샘플링)
+WEBGL_MIN_POINTS = 1000  # 점 개수가 이 값 이상이면 WebGL(scattergl)로 렌더링
 
 # 오디오 표시 설정
 SHOW_AUDIO_PLAYER_IN_TABLE = True  # True: 테이블에 오디오 플레이어 표시, False: 아이콘/파일명만 표시
 VISIBLE_AUDIO_FILE_NAME = True  # SHOW_AUDIO_PLAYER_IN_TABLE이 False일 때만 적용
+SHOW_AUDIO_WAVEFORM = True  # True: 플레이어 옆에 미리 계산한 파형/재생 시간 표시 (오디오는 재생할 때 로드)
+AUDIO_WAVEFORM_WIDTH = 120  # 파형 스파크라인 너비 (픽셀)
+AUDIO_WAVEFORM_HEIGHT = 24  # 파형 스파크라인 높이 (픽셀)
 
 # 이미지 표시 설정
 SHOW_IMAGE_THUMBNAILS = True  # True: 테이블에 썸네일 표시, False: 아이콘만 표시
 IMAGE_THUMBNAIL_SIZE = 40  # 테이블 내 이미지 썸네일 크기 (픽셀)
 IMAGE_HOVER_PREVIEW_SIZE = 200  # 호버 시 프리뷰 크기 (픽셀)
 
+# 이미지 썸네일 캐시 설정 (Pillow가 있으면 썸네일/프리뷰 크기로 줄인 이미지를 서버에서 제공)
+MEDIA_CACHE_DIR = os.environ.get('EVAL_MEDIA_CACHE_DIR', os.path.join(DATA_DIR, 'media_cache'))
+MEDIA_CACHE_MAX_BYTES = 512 * 1024 * 1024  # 디스크 캐시 최대 크기 (바이트)
+MEDIA_CACHE_MAX_AGE = 365 * 24 * 3600  # 브라우저 캐시 유지 시간 (초)
+
+# 로컬 미디어 파일 제공 설정 (로컬 경로/file:// URL은 대시보드 서버가 Range 요청을 지원하여 직접 전송)
+MEDIA_FILE_MAX_AGE = 3600  # 브라우저 캐시 유지 시간 (초, 이후에는 ETag로 재검증)
+MEDIA_USE_X_SENDFILE = os.environ.get('EVAL_MEDIA_X_SENDFILE') == '1'  # 앞단 웹 서버(nginx 등)가 파일을 직접 전송
+
+# 미디어 URL 확인 설정 (데이터 로드 후 백그라운드에서 확인하여 상태/크기/형식/지연 시간 컬럼 추가)
+# 결과 데이터에 있는 원격 호스트로 요청을 보내므로 EVAL_CHECK_MEDIA_URLS=1일 때만 실행
+CHECK_MEDIA_URLS = os.environ.get('EVAL_CHECK_MEDIA_URLS') == '1'
+MEDIA_CHECK_PATH = os.path.join(DATA_DIR, 'media_checks.db')  # 확인 결과 공유 파일 (여러 워커 중 한 프로세스만 확인)
+MEDIA_CHECK_WORKERS = 8  # 동시에 확인하는 최대 URL 수
+MEDIA_CHECK_TIMEOUT = 5.0  # URL당 확인 제한 시간 (초)
+
 # 테이블 복사 허용 설정 (True: 복사 허용, False: 복사 금지)
 ALLOW_COPY = True
 
+# 결과 테이블 처리 방식 (True: 서버에서 필터/정렬 후 현재 페이지만 전송, False: 전체 데이터를 브라우저로 전송)
+SERVER_SIDE_TABLE = True
+TABLE_PAGE_SIZE = 10  # 테이블 페이지당 행 수
+FILTER_CACHE_BYTES = 256 * 1024 * 1024  # 필터 결과(행 번호 배열) 캐시 최대 크기 (바이트)
+BACKGROUND_CALLBACKS = True  # 테이블 구성/차트 생성 콜백을 백그라운드 작업으로 실행 (diskcache 필요)
+BACKGROUND_POLL_MS = 300  # 백그라운드 작업 진행 상황/결과 확인 주기 (밀리초)
+BACKGROUND_JOB_DIR = os.environ.get('EVAL_JOB_DIR', os.path.join(DATA_DIR, 'jobs'))  # 작업 진행 상황/결과를 주고받는 diskcache 위치
+
+# 결과 파일 경로 (Parquet/Arrow/JSONL/CSV). 지정하지 않으면 샘플 데이터 사용
+RESULTS_PATH = os.environ.get('EVAL_RESULTS_PATH')
+# 데이터/인덱스 스냅샷 디렉터리. 지정하면 여러 워커(gunicorn)가 메모리 매핑한 같은 스냅샷을 공유
+SNAPSHOT_DIR = os.environ.get('EVAL_SNAPSHOT_DIR')
+
+# 스트리밍 결과 수집 경로 (JSONL 파일 또는 결과 샤드 디렉터리). 지정하면 새 결과를 주기적으로 반영
+INGEST_PATH = os.environ.get('EVAL_INGEST_PATH')
+INGEST_BATCH_SIZE = 1000  # 한 번에 반영할 최대 행 수
+INGEST_POLL_INTERVAL = 2.0  # 수집 주기 (초)
+DATA_VERSION_POLL_MS = 5000  # 열려 있는 대시보드가 새 데이터를 확인하는 주기 (밀리초)
+
+# 휴먼 라벨 저장 위치 (SQLite 파일)
+LABELS_PATH = os.environ.get('EVAL_LABELS_PATH', os.path.join(DATA_DIR, 'human_labels.db'))
+LABEL_FLUSH_INTERVAL = 1.0  # 변경된 라벨을 모아서 저장하는 주기 (초)
+
 # 샘플 데이터 생성
 def generate_sample_data():
     np.random.seed(42)
@@ -116,12 +192,53 @@ def extract_filename_from_url(url):
         filename = filename.split('?')[0]
     return filename
 
+# URL 컬럼 전체에서 파일명 추출 (extract_filename_from_url의 컬럼 연산 버전)
+def extract_filenames_from_urls(urls):
+    """URL Series에서 파일명(확장자 포함)만 추출"""
+    # 마지막 '/'까지 제거한 뒤 쿼리 파라미터 제거
+    return urls.str.replace(r'^.*/', '', regex=True).str.replace(r'\?.*$', '', regex=True)
+
 # 앱 초기화
 app = dash.Dash(__name__)
 app.config.suppress_callback_exceptions = True
+# WSGI 서버용 Flask 앱 (gunicorn -c gunicorn.conf.py <모듈 이름>:server)
+server = app.server
+
+# 백그라운드 작업 관리자 (작업은 서버 프로세스의 별도 스레드에서 실행되므로 요청 스레드를 붙잡지 않고,
+# 필터/diff 캐시와 라벨 저장소를 요청 콜백과 함께 사용)
+background_manager = (ThreadJobManager(diskcache.Cache(BACKGROUND_JOB_DIR))
+                      if BACKGROUND_CALLBACKS and DISKCACHE_AVAILABLE else None)
 
-# 데이터 로드
-df = generate_sample_data()
+# 무거운 콜백 등록 (백그라운드 작업 관리자가 있으면 작업으로 실행하고 진행 상황/취소 버튼 표시)
+# 콜백 함수는 첫 인자로 진행 상황 메시지 함수를 받음 (관리자가 없으면 아무것도 하지 않음)
+# 같은 콜백이 다시 호출되면 실행 중이던 이전 작업은 다음 진행 상황 보고 시점에 취소됨
+def heavy_callback(name, *dependencies, **kwargs):
+    def decorator(func):
+        if background_manager is None:
+            @functools.wraps(func)
+            def run(*args):
+                return func(lambda message: None, *args)
+            return app.callback(*dependencies, **kwargs)(run)
+        
+        return app.callback(
+            *dependencies,
+            background=True,
+            manager=background_manager,
+            interval=BACKGROUND_POLL_MS,
+            progress=Output(f'{name}-progress-text', 'children'),
+            running=[(Output(f'{name}-progress', 'style'), {'display': 'block', 'margin': '10px 0'},
+                      {'display': 'none'})],
+            cancel=[Input(f'{name}-cancel-button', 'n_clicks')],
+            **kwargs
+        )(func)
+    return decorator
+
+# 백그라운드 작업 진행 상황 표시 (작업 실행 중에만 보임)
+def create_progress_indicator(name):
+    return html.Div([
+        html.Span(id=f'{name}-progress-text', style={'color': '#666', 'font-style': 'italic', 'margin-right': '10px'}),
+        html.Button("Cancel", id=f'{name}-cancel-button', n_clicks=0)
+    ], id=f'{name}-progress', style={'display': 'none'})
 
 # 독립변수와 종속변수 정의
 independent_vars = ['model', 'prompt_template_name', 'option-1', 'option-2', 'temperature', 'max_tokens']
@@ -130,8 +247,116 @@ result_text_vars = ['answer', 'think']
 result_url_vars = ['audio_url', 'image_url', 'video_url']
 result_vars = result_text_vars + result_url_vars
 
-# 모든 컬럼 목록
-all_columns = df.columns.tolist()
+# 데이터 로드 (필터링/지표용 좁은 컬럼만 메모리에 캐시)
+store_cache_columns = ['test_case_id'] + independent_vars + result_metric_vars
+
+def load_store():
+    if RESULTS_PATH:
+        return load_result_store(RESULTS_PATH, cache_columns=store_cache_columns)
+    return ResultStore.from_dataframe(generate_sample_data(), cache_columns=store_cache_columns)
+
+if SNAPSHOT_DIR:
+    # 저장소와 두 인덱스를 스냅샷에서 메모리 매핑으로 열기 (스냅샷이 없으면 첫 워커가 한 번만 생성)
+    store, index, text_index = open_snapshot(SNAPSHOT_DIR, RESULTS_PATH, load_store, independent_vars,
+                                             result_text_vars, cache_columns=store_cache_columns)
+else:
+    store = load_store()
+    # 독립변수별 값 → 행 비트맵 인덱스 (모든 콜백에서 공유)
+    index = BitmapIndex.build(store, independent_vars)
+    # 결과 텍스트 단어 검색 인덱스 (검색어 조건은 필터 엔진이 다른 조건과 함께 처리)
+    text_index = TextIndex.build(store, result_text_vars)
+engine = FilterEngine(store, index, cache=FilterCache(FILTER_CACHE_BYTES), text_index=text_index)
+
+# 독립변수별 고유값/행 수 목록 (드롭다운 옵션을 미리 만들어 둠)
+catalog = ValueCatalog.build(store, independent_vars)
+
+# 독립변수 조합별 지표 요약 큐브 (차트 요약을 원본 행을 읽지 않고 계산)
+cube = AggCube.build(store, independent_vars, result_metric_vars)
+
+# 짝지은 행의 텍스트 diff 계산기 (두 텍스트의 해시로 캐시, 캐시에 없는 쌍은 워커 프로세스에서 계산)
+text_differ = TextDiffer()
+DIFF_COLUMN_ID = f'{DIFF_TEXT_COLUMN}_diff'
+
+# 휴먼 라벨 저장소 (변경된 셀만 모아서 저장)
+label_store = LabelStore(LABELS_PATH, flush_interval=LABEL_FLUSH_INTERVAL)
+
+# 오디오 재생 시간/파형 요약 (백그라운드에서 계산하여 저장소의 계산 컬럼으로 추가)
+audio_summary_job = (AudioSummaryJob(store).start()
+                     if SHOW_AUDIO_PLAYER_IN_TABLE and SHOW_AUDIO_WAVEFORM and 'audio_url' in store else None)
+
+# 필터 캐시 적중률 모니터링용 엔드포인트
+@app.server.route('/_filter-cache-stats')
+def filter_cache_stats():
+    return flask.jsonify(engine.cache.stats())
+
+# 이미지 썸네일 캐시 (원본을 한 번만 읽어 썸네일/프리뷰 크기로 디스크에 저장)
+thumbnail_cache = (ThumbnailCache(MEDIA_CACHE_DIR, [IMAGE_THUMBNAIL_SIZE, IMAGE_HOVER_PREVIEW_SIZE],
+                                  max_bytes=MEDIA_CACHE_MAX_BYTES)
+                   if PIL_AVAILABLE and SHOW_IMAGE_THUMBNAILS else None)
+
+# 이미지 썸네일 제공 (결과 데이터에 있는 이미지 URL만 처리)
+@app.server.route(f'{THUMBNAIL_ROUTE}/<int:size>')
+def serve_image_thumbnail(size):
+    url = flask.request.args.get('src', '')
+    if thumbnail_cache is None or size not in thumbnail_cache.sizes or not url \
+            or 'image_url' not in store or engine.find_row('image_url', url) is None:
+        flask.abort(404)
+    
+    path = thumbnail_cache.get(url, size)
+    if path is None:
+        # 썸네일을 만들 수 없으면 원본을 그대로 사용
+        return flask.redirect(media_url(url))
+    
+    # 같은 원본 URL의 썸네일은 바뀌지 않으므로 브라우저가 다시 요청하지 않도록 캐시
+    response = flask.send_file(path, etag=os.path.basename(path), conditional=True, max_age=MEDIA_CACHE_MAX_AGE)
+    response.headers['Cache-Control'] = f'public, max-age={MEDIA_CACHE_MAX_AGE}, immutable'
+    return response
+
+app.server.config['USE_X_SENDFILE'] = MEDIA_USE_X_SENDFILE
+
+# 로컬 미디어 파일 제공 (Range 요청으로 긴 오디오/비디오도 바로 탐색, 결과 데이터에 있는 파일만 처리)
+@app.server.route(MEDIA_ROUTE)
+def serve_media_file():
+    url = flask.request.args.get('src', '')
+    path = local_media_path(url)
+    if path is None or not any(media_type in store and engine.find_row(media_type, url) is not None
+                               for media_type in result_url_vars):
+        flask.abort(404)
+    
+    return flask.send_file(path, conditional=True, etag=True, max_age=MEDIA_FILE_MAX_AGE)
+
+# 확인된 미디어 미리 읽기 (이미지는 썸네일을 미리 만들어 첫 표시를 빠르게 함)
+def prefetch_media(media_type, url):
+    if media_type == 'image_url' and thumbnail_cache is not None:
+        thumbnail_cache.get(url, IMAGE_THUMBNAIL_SIZE)
+
+# 미디어 URL 상태/크기/형식/지연 시간 확인 (결과는 테이블에서 필터링할 수 있는 컬럼으로 추가)
+media_check_job = (MediaCheckJob(store, result_url_vars, max_workers=MEDIA_CHECK_WORKERS,
+                                 timeout=MEDIA_CHECK_TIMEOUT, prefetch=prefetch_media,
+                                 results_path=MEDIA_CHECK_PATH).start()
+                   if CHECK_MEDIA_URLS else None)
+
+# 스트리밍 결과 반영 (새 행만큼 저장소/인덱스/값 목록을 갱신한 뒤 데이터 버전 증가)
+def ingest_results(batch_df):
+    start = len(store)
+    store.append(batch_df)
+    index.extend(store, start)
+    text_index.extend(store, start)
+    catalog.refresh(store)
+    cube.extend(store, start)
+    engine.version += 1
+
+if INGEST_PATH:
+    result_tailer = ResultTailer(INGEST_PATH, ingest_results,
+                                 batch_size=INGEST_BATCH_SIZE,
+                                 poll_interval=INGEST_POLL_INTERVAL,
+                                 skip_existing=INGEST_PATH == RESULTS_PATH).start()
+
+# 모든 컬럼 목록 (미디어 확인 결과 컬럼 포함)
+all_columns = store.columns + (media_check_job.columns if media_check_job is not None else [])
+
+# 좌우 행 정렬에 쓸 수 있는 쌍 키 컬럼 (content_id 우선)
+pair_key_options = [col for col in dict.fromkeys(['content_id'] + independent_vars) if col in store]
 
 # 기본 표시 컬럼 (유용한 컬럼들 미리 선택)
 default_columns = ['test_case_id', 'model', 'answer', 'think', 'audio_url', 'image_url', 'video_url', 'response_time']
@@ -278,6 +503,14 @@ app.layout = html.Div([
             # 통제 변인 설정
             html.Div([
                 html.H4("Filtering Conditions", style={'margin-bottom': '10px'}),
+                html.Label(f"Search {' / '.join(result_text_vars)}:", style={'font-weight': 'bold'}),
+                dcc.Input(
+                    id='text-search-input',
+                    type='search',
+                    debounce=True,
+                    placeholder='words or "exact phrase"',
+                    style={'width': '100%', 'margin-bottom': '15px', 'box-sizing': 'border-box'}
+                ),
                 html.Div(id='control-vars-container'),
             ], style={'margin-bottom': '15px', 'padding': '10px', 
                      'border': '1px solid #ddd', 'border-radius': '5px'}),
@@ -319,14 +552,30 @@ app.layout = html.Div([
                     multi=True,
                     style={'margin-bottom': '15px'}
                 ),
+                # 좌우 비교 시 같은 키 값의 행끼리 나란히 표시
+                html.Label("Align rows by:"),
+                dcc.Dropdown(
+                    id='pair-keys-dropdown',
+                    options=[{'label': col, 'value': col} for col in pair_key_options],
+                    value=[],
+                    multi=True,
+                    placeholder="Independent filters (rows not aligned)",
+                    style={'margin-bottom': '15px'}
+                ),
             ]),
             
             # 필터링된 데이터 테이블들 - 좌우 분할 비교
+            create_progress_indicator('tables'),
             html.Div(id='comparison-tables-container'),
             
+            # 좌우 비교 통계
+            html.Div(id='comparison-stats-container'),
+            
             # 차트 섹션 (조건부 표시)
-            html.Div(id='charts-container', 
-                    style={'display': 'block' if SHOW_CHARTS and SHOW_VISUALIZATION_METRIC else 'none'}),
+            html.Div([
+                create_progress_indicator('charts'),
+                html.Div(id='charts-container')
+            ], style={'display': 'block' if SHOW_CHARTS and SHOW_VISUALIZATION_METRIC else 'none'}),
             
         ], style={'width': '78%', 'float': 'right', 'padding': '15px',
                  'height': '100vh', 'overflow-y': 'auto'}),
@@ -344,25 +593,52 @@ app.layout = html.Div([
     # 통제 변인 값들을 저장하는 숨겨진 store
     dcc.Store(id='control-values-store'),
     
-    # 미디어 URL을 저장하는 숨겨진 store들
-    dcc.Store(id='audio-data-store'),
-    dcc.Store(id='video-data-store'),
-    dcc.Store(id='image-data-store')
+    # 다시 만들 테이블 설정 (테이블 구성이 바뀔 때만 기록)
+    dcc.Store(id='tables-rebuild-store'),
+    
+    # 스트리밍으로 새 데이터가 들어왔는지 확인하는 데이터 버전 store (버전은 저장소의 행 수)
+    dcc.Store(id='data-version-store', data=len(store)),
+    dcc.Interval(id='data-version-interval', interval=DATA_VERSION_POLL_MS, disabled=not INGEST_PATH)
 ])
 
+# 데이터 버전 확인 (새 데이터가 반영된 경우에만 갱신하여 열린 화면을 새로고침)
+# 워커마다 수집 시점이 다르므로 프로세스별 카운터 대신 행 수를 버전으로 쓰고,
+# 화면이 본 것보다 많은 행을 반영한 워커에서만 갱신 (덜 반영한 워커로 가도 되돌아가지 않음)
+@app.callback(
+    Output('data-version-store', 'data'),
+    Input('data-version-interval', 'n_intervals'),
+    State('data-version-store', 'data'),
+    prevent_initial_call=True
+)
+def poll_data_version(n_intervals, current_version):
+    num_rows = len(store)
+    if num_rows <= (current_version or 0):
+        return dash.no_update
+    return num_rows
+
 # 조작 변인 선택에 따른 값 옵션 업데이트
 @app.callback(
     Output('target-values-dropdown', 'options'),
     Output('target-values-dropdown', 'value'),
-    Input('target-var-dropdown', 'value')
+    Input('target-var-dropdown', 'value'),
+    Input('data-version-store', 'data')
 )
-def update_target_values(target_var):
+def update_target_values(target_var, data_version):
     if not target_var:
         return [], []
     
-    unique_values = df[target_var].unique()
-    options = [{'label': str(val), 'value': val} for val in unique_values]
-    return options, list(unique_values)
+    # 새 데이터 반영 시에는 옵션만 갱신하고 선택된 값은 유지
+    if ctx.triggered_id == 'data-version-store':
+        return catalog.options(target_var), dash.no_update
+    return catalog.options(target_var), catalog.values(target_var)
+
+# 통제 변인 드롭다운 옵션 (값별 행 수 표시, 행이 없는 값은 비활성화)
+def get_control_options(var, counts):
+    options = [{'label': f"Any ({sum(counts.values())})", 'value': 'any'}]
+    for val in catalog.values(var):
+        count = counts.get(val, 0)
+        options.append({'label': f"{val} ({count})", 'value': val, 'disabled': count == 0})
+    return options
 
 # 통제 변인 컨트롤 생성 콜백
 @app.callback(
@@ -377,11 +653,8 @@ def update_control_vars(target_var):
     controls = []
     
     for var in control_vars:
-        unique_values = df[var].unique()
-        
-        if df[var].dtype == 'object':
-            options = [{'label': 'Any', 'value': 'any'}] + \
-                     [{'label': str(val), 'value': val} for val in unique_values]
+        if not catalog.is_numeric(var):
+            options = get_control_options(var, catalog.counts(var))
             control = dcc.Dropdown(
                 id={'type': 'control-dropdown', 'index': var},
                 options=options,
@@ -390,8 +663,7 @@ def update_control_vars(target_var):
             )
         else:
             # 숫자형 변수의 경우 범위 선택 또는 any
-            options = [{'label': 'Any', 'value': 'any'}] + \
-                     [{'label': str(val), 'value': val} for val in unique_values]
+            options = get_control_options(var, catalog.counts(var))
             control = dcc.Dropdown(
                 id={'type': 'control-dropdown', 'index': var},
                 options=options,
@@ -410,11 +682,12 @@ def update_control_vars(target_var):
 @app.callback(
     Output('control-values-store', 'data'),
     [Input('target-var-dropdown', 'value'),
-     Input({'type': 'control-dropdown', 'index': ALL}, 'value')],
+     Input({'type': 'control-dropdown', 'index': ALL}, 'value'),
+     Input('text-search-input', 'value')],
     [State({'type': 'control-dropdown', 'index': ALL}, 'id')],
     prevent_initial_call=True
 )
-def collect_control_values(target_var, control_values, control_ids):
+def collect_control_values(target_var, control_values, search_query, control_ids):
     if not target_var:
         return {}
     
@@ -424,19 +697,123 @@ def collect_control_values(target_var, control_values, control_ids):
         if i < len(control_values) and control_values[i] is not None:
             control_dict[var] = control_values[i]
     
+    # 검색어도 통제 변인과 같은 조건으로 전달 (필터 엔진이 전문 검색 인덱스로 처리)
+    if search_query and search_query.strip():
+        control_dict[TEXT_SEARCH_KEY] = search_query.strip()
+    
     return control_dict
 
-# 테이블 생성 헬퍼 함수
-def create_data_table(data_df, selected_columns, table_id_suffix):
-    if len(data_df) == 0:
-        return html.P("No data available for this condition.")
+# 통제 변인 값들을 인덱스 조건으로 변환 ('any'는 제외)
+def get_control_conditions(control_dict):
+    return {var: value for var, value in control_dict.items() 
+            if value is not None and value != 'any'}
+
+# 통제 변인 옵션별 행 수 갱신 콜백 (현재 선택된 조건 기준)
+@app.callback(
+    Output({'type': 'control-dropdown', 'index': ALL}, 'options'),
+    [Input('control-values-store', 'data'),
+     Input('target-values-dropdown', 'value'),
+     Input('data-version-store', 'data')],
+    [State('target-var-dropdown', 'value'),
+     State({'type': 'control-dropdown', 'index': ALL}, 'id')],
+    prevent_initial_call=True
+)
+def update_control_counts(control_dict, target_values, data_version, target_var, control_ids):
+    conditions = get_control_conditions(control_dict or {})
+    if target_var and target_values:
+        conditions[target_var] = target_values
+    
+    # 각 통제 변인은 자기 조건만 뺀 나머지 조건으로 행 수 계산 (비트맵 AND + popcount)
+    control_vars = [control_id['index'] for control_id in control_ids]
+    counts = engine.facet_counts(conditions, control_vars)
+    return [get_control_options(var, counts[var]) for var in control_vars]
+
+# 미디어 셀 렌더링 함수 (행 단위 반복 없이 컬럼 연산으로 한 번에 변환)
+def render_media_cells(display_df):
+    """
+    미디어 URL 컬럼을 표시용 셀(오디오 플레이어, 아이콘, 썸네일)로 변환합니다.
+    실제 URL은 셀을 클릭했을 때 행 id(test_case_id)로 저장소에서 조회합니다.
+    """
+    for media_type in result_url_vars:
+        if media_type not in display_df.columns:
+            continue
+        
+        urls = display_df[media_type].fillna('').astype(str)
+        has_url = (urls != '').to_numpy()
+        # 브라우저에서 읽을 URL (로컬 파일은 미디어 서버 경로)
+        playback_urls = urls.map(media_url)
+        
+        if media_type == 'audio_url':
+            if SHOW_AUDIO_PLAYER_IN_TABLE:
+                # 테이블에 오디오 플레이어 직접 표시 (파형을 표시하면 오디오는 재생할 때 로드)
+                preload = 'none' if SHOW_AUDIO_WAVEFORM else 'metadata'
+                cells = ("<audio controls style='width: 100%; height: 30px;' preload='" + preload + "' title='" 
+                         + extract_filenames_from_urls(urls) + "'><source src='" + playback_urls 
+                         + "' />Your browser does not support the audio element.</audio>")
+                if SHOW_AUDIO_WAVEFORM:
+                    cells = get_audio_waveform_cells(display_df.index) + cells
+            elif VISIBLE_AUDIO_FILE_NAME:
+                cells = "🔊 " + extract_filenames_from_urls(urls)
+            else:
+                cells = "🔊"
+        elif media_type == 'video_url':
+            cells = "📹"
+        elif SHOW_IMAGE_THUMBNAILS:
+            # 이미지 썸네일을 마크다운으로 표시 (썸네일 캐시가 있으면 크기를 줄인 이미지 사용)
+            thumbnail_urls = preview_urls = playback_urls
+            if thumbnail_cache is not None:
+                thumbnail_urls = urls.map(lambda url: thumbnail_cache.url_for(url, IMAGE_THUMBNAIL_SIZE))
+                preview_urls = urls.map(lambda url: thumbnail_cache.url_for(url, IMAGE_HOVER_PREVIEW_SIZE))
+            cells = ('<img src="' + thumbnail_urls + f'" width="{IMAGE_THUMBNAIL_SIZE}" height="{IMAGE_THUMBNAIL_SIZE}" '
+                     'style="object-fit: cover; cursor: pointer;" class="image-thumbnail" data-url="' + preview_urls + '" />')
+        else:
+            # 아이콘만 표시
+            cells = "🖼️ View"
+        
+        display_df[media_type] = np.where(has_url, cells, "")
+
+# 미리 계산된 오디오 파형/재생 시간 셀 (아직 계산되지 않은 행은 빈 문자열)
+def get_audio_waveform_cells(rows):
+    if AUDIO_WAVEFORM_COLUMN not in store:
+        return ''
     
-    # 미디어 데이터를 위한 딕셔너리들 생성
-    audio_data = {}
-    video_data = {}
-    image_data = {}
+    summary_df = store.take(rows, [AUDIO_DURATION_COLUMN, AUDIO_WAVEFORM_COLUMN])
+    return pd.Series([
+        ("<div style='display: flex; align-items: center; gap: 6px;'>"
+         + waveform_svg(waveform, AUDIO_WAVEFORM_WIDTH, AUDIO_WAVEFORM_HEIGHT)
+         + f"<span style='font-size: 11px; color: #666;'>{format_duration(duration)}</span></div>")
+        if waveform is not None else ''
+        for duration, waveform in zip(summary_df[AUDIO_DURATION_COLUMN], summary_df[AUDIO_WAVEFORM_COLUMN])
+    ], index=rows)
+
+# 행 id(test_case_id)로 미디어 URL 조회 (클릭한 셀의 URL만 저장소에서 읽음)
+def get_media_url(test_case_id, media_type):
+    if test_case_id is None or media_type not in store:
+        return None
     
-    # 테이블 컬럼 정의
+    row = engine.find_row('test_case_id', test_case_id)
+    if row is None:
+        return None
+    
+    url = store.take([row], [media_type])[media_type].iloc[0]
+    return url if isinstance(url, str) and url else None
+
+# 테이블 행 데이터 생성 (행 id는 test_case_id, 저장된 휴먼 라벨 반영)
+def get_table_records(display_df):
+    if 'test_case_id' not in display_df:
+        return display_df.to_dict('records')
+    
+    test_case_ids = display_df['test_case_id'].tolist()
+    display_df['id'] = test_case_ids
+    if 'human_label' in display_df:
+        saved_labels = label_store.get_many(test_case_ids)
+        if saved_labels:
+            display_df['human_label'] = [saved_labels.get(test_case_id, label) for test_case_id, label
+                                         in zip(test_case_ids, display_df['human_label'].tolist())]
+    return display_df.to_dict('records')
+
+# 결과 테이블 컬럼 정의
+def get_table_columns(selected_columns):
     columns = []
     for col in selected_columns:
         if col == 'audio_url':
@@ -482,70 +859,74 @@ def create_data_table(data_df, selected_columns, table_id_suffix):
                 'type': 'numeric' if col in result_metric_vars else 'text'
             })
     
-    # 테이블 데이터 생성
-    display_df = data_df.copy()
+    return columns
+
+# 짝지은 우측 테이블인지 (좌측 대비 diff 컬럼을 표시)
+def has_diff_column(table_state):
+    pair = (table_state or {}).get('pair')
+    return SHOW_TEXT_DIFF and DIFF_TEXT_COLUMN in store and bool(pair) and pair['side'] == 1
+
+# 테이블 상태별 컬럼 정의 (짝지은 우측 테이블에는 diff 컬럼 추가)
+def get_state_table_columns(selected_columns, table_state):
+    columns = get_table_columns(selected_columns)
+    if has_diff_column(table_state):
+        columns.append({
+            'name': f'{DIFF_TEXT_COLUMN} diff',
+            'id': DIFF_COLUMN_ID,
+            'editable': False,
+            'type': 'text',
+            'presentation': 'markdown'
+        })
+    return columns
+
+# diff 컬럼 값 생성 (표시되는 쌍만 계산, start는 표시되는 첫 쌍의 순서)
+def render_diff_cells(display_df, table_state, start):
+    if not has_diff_column(table_state) or len(display_df) == 0:
+        return
     
-    # 오디오 URL 처리
-    if 'audio_url' in display_df.columns:
-        for idx, row in display_df.iterrows():
-            if row['audio_url']:
-                audio_id = f"audio_{table_id_suffix}_{idx}"
-                audio_data[audio_id] = row['audio_url']
-                
-                if SHOW_AUDIO_PLAYER_IN_TABLE:
-                    # 테이블에 오디오 플레이어 직접 표시
-                    filename = extract_filename_from_url(row['audio_url'])
-                    display_df.at[idx, 'audio_url'] = f"<audio controls style='width: 100%; height: 30px;' preload='metadata' title='{filename}'><source src='{row['audio_url']}' />Your browser does not support the audio element.</audio>"
-                    
-                else:
-                    # 기존 방식: 아이콘 또는 파일명 표시
-                    if VISIBLE_AUDIO_FILE_NAME:
-                        filename = extract_filename_from_url(row['audio_url'])
-                        display_df.at[idx, 'audio_url'] = f"🔊 {filename}"
-                    else:
-                        display_df.at[idx, 'audio_url'] = f"🔊"
-            else:
-                display_df.at[idx, 'audio_url'] = ""
-    
-    # 비디오 URL 처리
-    if 'video_url' in display_df.columns:
-        for idx, row in display_df.iterrows():
-            if row['video_url']:
-                video_id = f"video_{table_id_suffix}_{idx}"
-                video_data[video_id] = row['video_url']
-                display_df.at[idx, 'video_url'] = "📹"
-            else:
-                display_df.at[idx, 'video_url'] = ""
-    
-    # 이미지 URL 처리
-    if 'image_url' in display_df.columns:
-        for idx, row in display_df.iterrows():
-            if row['image_url']:
-                image_id = f"image_{table_id_suffix}_{idx}"
-                image_data[image_id] = row['image_url']
-                
-                if SHOW_IMAGE_THUMBNAILS:
-                    # 이미지 썸네일을 마크다운으로 표시
-                    display_df.at[idx, 'image_url'] = f'<img src="{row["image_url"]}" width="{IMAGE_THUMBNAIL_SIZE}" height="{IMAGE_THUMBNAIL_SIZE}" style="object-fit: cover; cursor: pointer;" class="image-thumbnail" data-url="{row["image_url"]}" />'
-                else:
-                    # 아이콘만 표시
-                    display_df.at[idx, 'image_url'] = "🖼️ View"
-            else:
-                display_df.at[idx, 'image_url'] = ""
+    pair = table_state['pair']
+    left_value, right_value = pair['values']
+    left_rows, _ = engine.pair(table_state['conditions'], table_state['target_var'], left_value, right_value,
+                               pair['keys'])
+    left_texts = engine.gather(left_rows[start:start + len(display_df)], [DIFF_TEXT_COLUMN])[DIFF_TEXT_COLUMN]
+    right_texts = engine.gather(display_df.index.to_numpy(), [DIFF_TEXT_COLUMN])[DIFF_TEXT_COLUMN]
+    display_df[DIFF_COLUMN_ID] = text_differ.diff_many(list(zip(left_texts.tolist(), right_texts.tolist())))
+
+# 테이블 생성 헬퍼 함수
+def create_data_table(data_rows, selected_columns, table_id_suffix, table_state):
+    if len(data_rows) == 0:
+        return html.P("No data available for this condition.")
+    
+    # 테이블 컬럼 정의
+    columns = get_state_table_columns(selected_columns, table_state)
+    
+    # 테이블 데이터 생성 (서버 측 처리 시 첫 페이지 행만 읽음)
+    if SERVER_SIDE_TABLE:
+        display_df = engine.gather(engine.page(data_rows, 0, TABLE_PAGE_SIZE), selected_columns + ['test_case_id'])
+    else:
+        display_df = engine.gather(data_rows, selected_columns + ['test_case_id'])
+    
+    # 미디어 URL 처리
+    render_media_cells(display_df)
+    render_diff_cells(display_df, table_state, 0)
     
     table_styles = get_table_style()
     
+    # 짝지은 테이블은 좌우 행 순서가 같아야 하므로 테이블별 정렬/필터를 끔
+    paired = bool(table_state.get('pair'))
+    
     data_table = dash_table.DataTable(
         id={'type': 'results-table', 'suffix': table_id_suffix},
         columns=columns,
-        data=display_df.to_dict('records'),
+        data=get_table_records(display_df),
         editable=True,
-        markdown_options={"html": True} if SHOW_AUDIO_PLAYER_IN_TABLE else {},
-        filter_action="native",
-        sort_action="native",
-        page_action="native",
+        markdown_options={"html": True} if SHOW_AUDIO_PLAYER_IN_TABLE or has_diff_column(table_state) else {},
+        filter_action="none" if paired else "custom" if SERVER_SIDE_TABLE else "native",
+        sort_action="none" if paired else "custom" if SERVER_SIDE_TABLE else "native",
+        page_action="custom" if SERVER_SIDE_TABLE else "native",
         page_current=0,
-        page_size=10,
+        page_size=TABLE_PAGE_SIZE,
+        page_count=math.ceil(len(data_rows) / TABLE_PAGE_SIZE) if SERVER_SIDE_TABLE else None,
         **table_styles,
         fixed_rows={'headers': True},
         # 복사 허용 설정
@@ -563,85 +944,119 @@ def create_data_table(data_df, selected_columns, table_id_suffix):
     )
     
     
-    # 미디어 데이터를 포함한 컨테이너 반환
+    # 테이블과 상태 store를 포함한 컨테이너 반환
     return html.Div([
         data_table,
-        # 미디어 데이터를 숨겨진 div에 저장
-        html.Div(
-            id=f'audio-data-{table_id_suffix}',
-            **{'data-audio-mapping': json.dumps(audio_data)},
-            style={'display': 'none'}
-        ),
-        html.Div(
-            id=f'video-data-{table_id_suffix}',
-            **{'data-video-mapping': json.dumps(video_data)},
-            style={'display': 'none'}
-        ),
-        html.Div(
-            id=f'image-data-{table_id_suffix}',
-            **{'data-image-mapping': json.dumps(image_data)},
-            style={'display': 'none'}
-        )
+        # 서버 측 페이지 계산에 사용할 필터 상태
+        dcc.Store(id={'type': 'results-table-state', 'suffix': table_id_suffix}, data=table_state),
+        # 휴먼 라벨 변경분 (브라우저에서 계산)
+        dcc.Store(id={'type': 'label-changes', 'suffix': table_id_suffix})
     ])
 
+# 기존 테이블의 부분 갱신 값 계산 (레이아웃을 다시 만들어야 하면 None)
+def get_partial_table_update(table_ids, table_states, table_suffixes, columns_to_show, conditions):
+    triggered = {prop_id.rsplit('.', 1)[0] for prop_id in ctx.triggered_prop_ids}
+    existing_suffixes = [table_id['suffix'] for table_id in table_ids]
+    if not triggered or not triggered <= {'table-columns-dropdown', 'control-values-store'} \
+            or existing_suffixes != table_suffixes:
+        return None
+    
+    # 컬럼 변경은 columns만, 통제 변인 변경은 필터 상태만 교체하고 첫 페이지로 이동
+    # (ALL 패턴 출력은 갱신하지 않을 때도 테이블 수만큼의 목록으로 반환)
+    columns_update = [dash.no_update] * len(table_states)
+    if 'table-columns-dropdown' in triggered:
+        columns_update = [get_state_table_columns(columns_to_show, state) for state in table_states]
+    
+    states_update = page_update = [dash.no_update] * len(table_states)
+    if 'control-values-store' in triggered:
+        states_update = [{**state, 'conditions': conditions} for state in table_states]
+        page_update = [0] * len(table_states)
+    
+    return states_update, page_update, columns_update
+
+# 기존 테이블의 ALL 패턴 출력(상태/페이지/컬럼)을 모두 그대로 둘 때의 값 (일치하는 컴포넌트 수만큼의 목록)
+def get_unchanged_table_outputs():
+    return tuple([dash.no_update] * len(outputs) for outputs in ctx.outputs_list[1:])
+
 # 데이터 필터링 및 테이블 업데이트 - 좌우 분할 비교
+# 컬럼/통제 변인 변경은 기존 테이블의 속성만 바로 갱신하고, 테이블 구성이 바뀔 때만 다시 만들 설정을
+# tables-rebuild-store에 기록 (레이아웃은 render_comparison_tables가 백그라운드 작업으로 다시 만듦)
 @app.callback(
-    [Output('comparison-tables-container', 'children'),
-     Output('audio-data-store', 'data'),
-     Output('video-data-store', 'data'),
-     Output('image-data-store', 'data')],
+    [Output('tables-rebuild-store', 'data'),
+     Output({'type': 'results-table-state', 'suffix': ALL}, 'data'),
+     Output({'type': 'results-table', 'suffix': ALL}, 'page_current'),
+     Output({'type': 'results-table', 'suffix': ALL}, 'columns')],
     [Input('target-var-dropdown', 'value'),
      Input('target-values-dropdown', 'value'),
      Input('table-columns-dropdown', 'value'),
-     Input('control-values-store', 'data')]
+     Input('control-values-store', 'data'),
+     Input('pair-keys-dropdown', 'value')],
+    [State({'type': 'results-table-state', 'suffix': ALL}, 'id'),
+     State({'type': 'results-table-state', 'suffix': ALL}, 'data')]
 )
-def update_comparison_tables(target_var, target_values, selected_columns, control_dict):
+def update_comparison_tables(target_var, target_values, selected_columns, control_dict, pair_keys,
+                             table_ids, table_states):
     if not target_var or not target_values or not selected_columns:
-        return [html.P("Please complete the settings.")], {}, {}, {}
+        return ({},) + get_unchanged_table_outputs()
     
     if not control_dict:
         control_dict = {}
     
-    # 데이터 필터링
-    filtered_df = df.copy()
+    # 통제 변인 조건 (행 선택은 비트맵 인덱스로 계산하고, 표시할 컬럼만 마지막에 읽음)
+    conditions = get_control_conditions(control_dict)
     
-    # 통제 변인 필터링
-    for var, value in control_dict.items():
-        if value is not None and value != 'any':
-            filtered_df = filtered_df[filtered_df[var] == value]
+    # 실제 데이터에 존재하는 컬럼만 표시
+    columns_to_show = [col for col in selected_columns if col in store]
     
-    # 미디어 데이터 수집
-    audio_data_store = {}
-    video_data_store = {}
-    image_data_store = {}
+    # 같은 구성의 테이블이 이미 있으면 바뀐 속성만 갱신 (데이터는 테이블별 페이지 콜백이 다시 읽음)
+    table_suffixes = ['left', 'right'] if len(target_values) == 2 else ['single']
+    partial_update = get_partial_table_update(table_ids, table_states, table_suffixes, columns_to_show, conditions)
+    if partial_update is not None:
+        return (dash.no_update,) + partial_update
     
+    rebuild = {'target_var': target_var, 'target_values': list(target_values), 'columns': columns_to_show,
+               'conditions': conditions, 'pair_keys': pair_keys or []}
+    return (rebuild,) + get_unchanged_table_outputs()
+
+# 테이블 레이아웃 생성 (행 선택과 첫 페이지 읽기가 있어 백그라운드 작업으로 실행)
+@heavy_callback(
+    'tables',
+    Output('comparison-tables-container', 'children'),
+    Input('tables-rebuild-store', 'data'),
+    prevent_initial_call=True
+)
+def render_comparison_tables(set_progress, rebuild):
+    if not rebuild:
+        return [html.P("Please complete the settings.")]
+    
+    target_var, target_values = rebuild['target_var'], rebuild['target_values']
+    conditions, columns_to_show, pair_keys = rebuild['conditions'], rebuild['columns'], rebuild['pair_keys']
+    
+    set_progress("Filtering test cases...")
     # 조건: target_var가 존재하고 target_values가 정확히 2개일 때만 좌우 분할 비교
     if len(target_values) == 2:
-        # 실제 데이터프레임에 존재하는 컬럼만 필터링
-        columns_to_show = [col for col in selected_columns if col in filtered_df.columns]
-        
         # 첫 번째와 두 번째 값으로 분할
         left_value = target_values[0]
         right_value = target_values[1]
         
-        left_filtered_df = filtered_df[filtered_df[target_var] == left_value]
-        right_filtered_df = filtered_df[filtered_df[target_var] == right_value]
+        # 테이블별 필터 상태 (서버 측 페이지 요청 시 같은 행을 다시 선택)
+        left_state = {'conditions': conditions, 'target_var': target_var, 'target_values': [left_value]}
+        right_state = {'conditions': conditions, 'target_var': target_var, 'target_values': [right_value]}
         
-        left_display_df = left_filtered_df[columns_to_show]
-        right_display_df = right_filtered_df[columns_to_show]
+        # 쌍 키가 있으면 키 값이 같은 행끼리 짝지어 같은 순서로 표시 (짝이 없는 행은 제외)
+        pair_keys = [col for col in pair_keys or [] if col in store and col != target_var]
+        if pair_keys:
+            left_rows, right_rows = engine.pair(conditions, target_var, left_value, right_value, pair_keys)
+            pair = {'keys': pair_keys, 'values': [left_value, right_value]}
+            left_state['pair'] = {**pair, 'side': 0}
+            right_state['pair'] = {**pair, 'side': 1}
+        else:
+            left_rows, right_rows = engine.split(conditions, target_var, [left_value, right_value])
+        count_label = "# of Paired Test Cases" if pair_keys else "# of Test Cases"
+        set_progress(f"Rendering {len(left_rows):,} / {len(right_rows):,} test cases...")
         
-        # 미디어 데이터 수집
-        for media_type, data_store in [('audio_url', audio_data_store), ('video_url', video_data_store), ('image_url', image_data_store)]:
-            if media_type in columns_to_show:
-                for idx, row in left_display_df.iterrows():
-                    if row[media_type]:
-                        media_id = f"{media_type.split('_')[0]}_left_{idx}"
-                        data_store[media_id] = row[media_type]
-                
-                for idx, row in right_display_df.iterrows():
-                    if row[media_type]:
-                        media_id = f"{media_type.split('_')[0]}_right_{idx}"
-                        data_store[media_id] = row[media_type]
+        left_table = create_data_table(left_rows, columns_to_show, 'left', left_state)
+        right_table = create_data_table(right_rows, columns_to_show, 'right', right_state)
         
         tables_content = [
             html.H4("Side-by-Side Comparison of Test Results", style={'margin-bottom': '20px'}),
@@ -651,12 +1066,12 @@ def update_comparison_tables(target_var, target_values, selected_columns, contro
                     html.Div([
                         html.H5(f"{target_var}: {left_value}", 
                                style={'text-align': 'center', 'color': '#1f77b4', 'margin': '0 0 5px 0'}),
-                        html.P(f"# of Test Cases: {len(left_display_df)}", 
+                        html.P(f"{count_label}: {len(left_rows)}", id={'type': 'results-count', 'suffix': 'left'}, 
                                style={'font-weight': 'bold', 'margin': '0 0 15px 0', 'text-align': 'center'}),
                     ], style={'height': '50px', 'display': 'flex', 'flex-direction': 'column', 'justify-content': 'center'}),
                     html.Div([
-                        create_data_table(left_display_df, columns_to_show, 'left')
-                    ], style={'height': f'calc({TABLE_MAX_HEIGHT} + 100px)'})
+                        left_table
+                    ], style={'height': f'calc({TABLE_MAX_HEIGHT} + 100px)'}, className='sync-scroll-table')
                 ], style={'width': '48%', 'display': 'inline-block', 'vertical-align': 'top',
                          'padding': '10px', 'border': '1px solid #1f77b4', 'border-radius': '5px', 
                          'margin-right': '2%', 'box-sizing': 'border-box'}),
@@ -666,375 +1081,405 @@ def update_comparison_tables(target_var, target_values, selected_columns, contro
                     html.Div([
                         html.H5(f"{target_var}: {right_value}", 
                                style={'text-align': 'center', 'color': '#ff7f0e', 'margin': '0 0 5px 0'}),
-                        html.P(f"# of Test Cases: {len(right_display_df)}", 
+                        html.P(f"{count_label}: {len(right_rows)}", id={'type': 'results-count', 'suffix': 'right'}, 
                                style={'font-weight': 'bold', 'margin': '0 0 15px 0', 'text-align': 'center'}),
                     ], style={'height': '50px', 'display': 'flex', 'flex-direction': 'column', 'justify-content': 'center'}),
                     html.Div([
-                        create_data_table(right_display_df, columns_to_show, 'right')
-                    ], style={'height': f'calc({TABLE_MAX_HEIGHT} + 100px)'})
+                        right_table
+                    ], style={'height': f'calc({TABLE_MAX_HEIGHT} + 100px)'}, className='sync-scroll-table')
                 ], style={'width': '48%', 'display': 'inline-block', 'vertical-align': 'top',
                          'padding': '10px', 'border': '1px solid #ff7f0e', 'border-radius': '5px',
                          'box-sizing': 'border-box'})
             ], style={'width': '100%', 'display': 'block', 'margin-bottom': '30px'})
         ]
         
-        return tables_content, audio_data_store, video_data_store, image_data_store
+        return tables_content
     else:
         # 조건이 맞지 않으면 단일 테이블 표시
-        single_filtered_df = filtered_df[filtered_df[target_var].isin(target_values)]
-        
-        # selected_columns만 사용
-        columns_to_show = [col for col in selected_columns if col in single_filtered_df.columns]
-        single_display_df = single_filtered_df[columns_to_show]
+        single_rows = engine.select(conditions, target_var, target_values)
+        single_state = {'conditions': conditions, 'target_var': target_var, 'target_values': list(target_values)}
+        set_progress(f"Rendering {len(single_rows):,} test cases...")
         
-        # 미디어 데이터 수집
-        for media_type, data_store in [('audio_url', audio_data_store), ('video_url', video_data_store), ('image_url', image_data_store)]:
-            if media_type in columns_to_show:
-                for idx, row in single_display_df.iterrows():
-                    if row[media_type]:
-                        media_id = f"{media_type.split('_')[0]}_single_{idx}"
-                        data_store[media_id] = row[media_type]
+        single_table = create_data_table(single_rows, columns_to_show, 'single', single_state)
         
         tables_content = [
             html.H4("Results of Filtered Test Cases"),
-            html.P(f"# of Test Cases: {len(single_display_df)}", 
+            html.P(f"# of Test Cases: {len(single_rows)}", id={'type': 'results-count', 'suffix': 'single'}, 
                    style={'font-weight': 'bold', 'margin-bottom': '10px'}),
             html.P("Note: Side-by-side comparison is available when exactly 2 target values are selected.", 
                    style={'color': '#666', 'font-style': 'italic', 'margin-bottom': '15px'}) 
                    if len(target_values) != 2 else None,
-            create_data_table(single_display_df, columns_to_show, 'single')
+            single_table
         ]
         
-        return tables_content, audio_data_store, video_data_store, image_data_store
+        return tables_content
+
+# 비교 통계 값 표시 형식 (계산할 수 없으면 빈 문자열)
+def format_stat(value, digits=4):
+    return '' if value is None or not np.isfinite(value) else f"{value:.{digits}g}"
+
+# 좌우 비교 통계 테이블 생성 (유의수준 미만인 p값은 강조)
+def create_comparison_stats_table(stats_df, target_var, left_value, right_value):
+    confidence = int(round(CONFIDENCE_LEVEL * 100))
+    data = [{
+        'metric': row.metric,
+        'method': row.method or '-',
+        'n': f"{row.pairs} pairs" if row.method == 'paired' else f"{row.n_left} / {row.n_right}",
+        'left_mean': format_stat(row.left_mean),
+        'right_mean': format_stat(row.right_mean),
+        'delta': format_stat(row.delta),
+        'delta_pct': f"{row.delta_pct:+.1f}%" if np.isfinite(row.delta_pct) else '',
+        'ci': f"[{format_stat(row.ci_low)}, {format_stat(row.ci_high)}]" if np.isfinite(row.ci_low) else '',
+        'p_value': round(float(row.p_value), 4) if np.isfinite(row.p_value) else None
+    } for row in stats_df.itertuples()]
+    
+    return html.Div([
+        html.H5(f"Metric Comparison: {right_value} vs {left_value}", style={'margin': '0 0 10px 0'}),
+        dash_table.DataTable(
+            columns=[
+                {'name': 'Metric', 'id': 'metric'},
+                {'name': 'Method', 'id': 'method'},
+                {'name': 'N', 'id': 'n'},
+                {'name': f'{target_var}: {left_value}', 'id': 'left_mean'},
+                {'name': f'{target_var}: {right_value}', 'id': 'right_mean'},
+                {'name': 'Δ (right - left)', 'id': 'delta'},
+                {'name': 'Δ %', 'id': 'delta_pct'},
+                {'name': f'{confidence}% CI', 'id': 'ci'},
+                {'name': 'p-value', 'id': 'p_value', 'type': 'numeric'}
+            ],
+            data=data,
+            style_cell={'textAlign': 'center', 'padding': TABLE_CELL_PADDING},
+            style_header={'backgroundColor': 'rgb(230, 230, 230)', 'fontWeight': 'bold'},
+            style_data_conditional=[{
+                'if': {'filter_query': f'{{p_value}} < {1 - CONFIDENCE_LEVEL:.4g}', 'column_id': 'p_value'},
+                'fontWeight': 'bold',
+                'color': '#d62728'
+            }]
+        ),
+        html.P("Paired by content_id when enough contents appear on both sides; CI from bootstrap, "
+               "p-value from a permutation test.",
+               style={'color': '#666', 'font-style': 'italic', 'font-size': '12px', 'margin': '5px 0 0 0'})
+    ], style={'margin-bottom': '30px'})
 
-# 오디오 셀 클릭 이벤트 처리
+# 좌우 비교 통계 콜백 (조작 변인 값이 정확히 2개일 때 result_metric_vars별 차이/신뢰구간/p값)
 @app.callback(
-    Output('audio-modal', 'children'),
-    Output('audio-modal', 'style'),
-    [Input({'type': 'results-table', 'suffix': ALL}, 'active_cell')],
-    [State({'type': 'results-table', 'suffix': ALL}, 'data'),
-     State({'type': 'results-table', 'suffix': ALL}, 'id'),
-     State('audio-data-store', 'data')],
+    Output('comparison-stats-container', 'children'),
+    [Input('target-var-dropdown', 'value'),
+     Input('target-values-dropdown', 'value'),
+     Input('control-values-store', 'data'),
+     Input('data-version-store', 'data')]
+)
+def update_comparison_stats(target_var, target_values, control_dict, data_version):
+    if not SHOW_COMPARISON_STATS or not target_var or not target_values or len(target_values) != 2:
+        return []
+    
+    conditions = get_control_conditions(control_dict or {})
+    left_rows, right_rows = engine.split(conditions, target_var, target_values)
+    
+    # content_id가 있으면 같은 컨텐츠끼리 대응 비교 (지표와 쌍 키 컬럼만 읽음)
+    metrics = [col for col in result_metric_vars if col in store]
+    pair_key = 'content_id' if 'content_id' in store and target_var != 'content_id' else None
+    columns = metrics + ([pair_key] if pair_key else [])
+    stats_df = compare_groups(engine.gather(left_rows, columns), engine.gather(right_rows, columns),
+                              metrics, pair_key=pair_key)
+    return create_comparison_stats_table(stats_df, target_var, target_values[0], target_values[1])
+
+# 테이블 필터 상태로 행 번호 선택 (짝지은 테이블은 같은 쌍 배열의 자기 쪽 행)
+def select_table_rows(table_state):
+    pair = table_state.get('pair')
+    if pair:
+        left_value, right_value = pair['values']
+        pairs = engine.pair(table_state['conditions'], table_state['target_var'], left_value, right_value,
+                            pair['keys'])
+        return pairs[pair['side']]
+    return engine.select(table_state['conditions'], table_state['target_var'], table_state['target_values'])
+
+# 짝지은 테이블의 페이지 동기화 (한쪽 페이지를 넘기면 다른 쪽도 같은 페이지로 이동)
+@app.callback(
+    Output({'type': 'results-table', 'suffix': ALL}, 'page_current', allow_duplicate=True),
+    Input({'type': 'results-table', 'suffix': ALL}, 'page_current'),
+    State({'type': 'results-table-state', 'suffix': ALL}, 'data'),
     prevent_initial_call=True
 )
-def handle_audio_cell_click(active_cells, table_data_list, table_ids, audio_data):
-    # 오디오 플레이어가 테이블에 직접 표시되는 경우 모달 비활성화
-    if SHOW_AUDIO_PLAYER_IN_TABLE:
-        return [], {'display': 'none'}
-    
-    # 클릭된 테이블과 셀 찾기
-    active_cell = None
-    table_data = None
-    table_suffix = None
-    
-    for i, cell in enumerate(active_cells):
-        if cell and cell.get('column_id') == 'audio_url':
-            active_cell = cell
-            if i < len(table_data_list):
-                table_data = table_data_list[i]
-            if i < len(table_ids):
-                table_suffix = table_ids[i]['suffix']
-            break
-    
-    if not active_cell or not table_data or not table_suffix:
-        return [], {'display': 'none'}
-    
-    row_index = active_cell['row']
-    
-    # 해당 행의 오디오 데이터 확인
-    if row_index < len(table_data):
-        row_data = table_data[row_index]
-        audio_cell_value = row_data.get('audio_url', '')
-        if audio_cell_value and ('🔊' in audio_cell_value):
-            # 저장된 실제 URL 찾기
-            audio_id = f"audio_{table_suffix}_{row_index}"
-            actual_url = audio_data.get(audio_id)
-            
-            if actual_url:
-                filename = extract_filename_from_url(actual_url)
-                
-                # 오디오 플레이어 모달 생성
-                modal_content = html.Div([
-                    html.Div([
-                        html.Div([
-                            html.H3("Audio Player", style={'margin': '0', 'color': '#333'}),
-                            html.Button("✕", 
-                                      id={'type': 'close-audio-modal', 'index': f"close_{table_suffix}_{row_index}"}, 
-                                      style={'background': 'none', 'border': 'none', 
-                                            'font-size': '20px', 'cursor': 'pointer',
-                                            'float': 'right', 'color': '#666'})
-                        ], style={'display': 'flex', 'justify-content': 'space-between', 
-                                 'align-items': 'center', 'margin-bottom': '20px', 
-                                 'border-bottom': '1px solid #eee', 'padding-bottom': '10px'}),
-                        
-                        # 오디오 플레이어
-                        html.Audio(
-                            src=actual_url,
-                            controls=True,
-                            autoPlay=False,
-                            preload='metadata',
-                            style={'width': '100%', 'margin-bottom': '15px'},
-                            title=f'Audio file: {filename}'
-                        ),
-                        
-                        # 추가 정보
-                        html.Div([
-                            html.P(f"File: {filename}", style={'margin': '5px 0', 'color': '#333', 'font-weight': 'bold'}),
-                            html.P(f"Row: {row_index + 1}", style={'margin': '5px 0', 'color': '#666'}),
-                            html.P(f"Table: {table_suffix.title()}", style={'margin': '5px 0', 'color': '#666'}),
-                            html.P(f"URL: {actual_url}", style={'margin': '5px 0', 'color': '#888', 'font-size': '12px', 'word-break': 'break-all'})
-                        ])
-                        
-                    ], style={
-                        'background': 'white',
-                        'padding': '25px',
-                        'border-radius': '10px',
-                        'box-shadow': '0 4px 20px rgba(0, 0, 0, 0.15)',
-                        'max-width': '600px',
-                        'width': '90%',
-                        'margin': '10% auto',
-                        'position': 'relative'
-                    })
-                ], style={
-                    'position': 'fixed',
-                    'top': '0',
-                    'left': '0',
-                    'width': '100%',
-                    'height': '100%',
-                    'background': 'rgba(0, 0, 0, 0.5)',
-                    'z-index': '1000',
-                    'display': 'flex',
-                    'align-items': 'flex-start',
-                    'justify-content': 'center',
-                    'animation': 'fadeIn 0.3s ease-in-out'
-                })
-                
-                return modal_content, {'display': 'block'}
+def sync_paired_pages(pages, table_states):
+    if not isinstance(ctx.triggered_id, dict) or not any(state and state.get('pair') for state in table_states):
+        return [dash.no_update] * len(pages)
     
-    return [], {'display': 'none'}
+    page = next(item.get('value') for item in ctx.inputs_list[0] if item['id'] == ctx.triggered_id)
+    return [dash.no_update if item.get('value') == page else page for item in ctx.inputs_list[0]]
 
-# 비디오 셀 클릭 이벤트 처리
+# 서버 측 페이지/정렬/필터 처리 (현재 페이지 행만 전송)
 @app.callback(
-    Output('video-modal', 'children'),
-    Output('video-modal', 'style'),
-    [Input({'type': 'results-table', 'suffix': ALL}, 'active_cell')],
-    [State({'type': 'results-table', 'suffix': ALL}, 'data'),
-     State({'type': 'results-table', 'suffix': ALL}, 'id'),
-     State('video-data-store', 'data')],
+    Output({'type': 'results-table', 'suffix': MATCH}, 'data'),
+    Output({'type': 'results-table', 'suffix': MATCH}, 'page_count'),
+    Output({'type': 'results-count', 'suffix': MATCH}, 'children'),
+    [Input({'type': 'results-table', 'suffix': MATCH}, 'page_current'),
+     Input({'type': 'results-table', 'suffix': MATCH}, 'page_size'),
+     Input({'type': 'results-table', 'suffix': MATCH}, 'sort_by'),
+     Input({'type': 'results-table', 'suffix': MATCH}, 'filter_query'),
+     Input({'type': 'results-table-state', 'suffix': MATCH}, 'data'),
+     Input({'type': 'results-table', 'suffix': MATCH}, 'columns'),
+     Input('data-version-store', 'data')],
     prevent_initial_call=True
 )
-def handle_video_cell_click(active_cells, table_data_list, table_ids, video_data):
-    
-    # 클릭된 테이블과 셀 찾기
-    active_cell = None
-    table_data = None
-    table_suffix = None
-    
-    for i, cell in enumerate(active_cells):
-        if cell and cell.get('column_id') == 'video_url':
-            active_cell = cell
-            if i < len(table_data_list):
-                table_data = table_data_list[i]
-            if i < len(table_ids):
-                table_suffix = table_ids[i]['suffix']
-            break
-    
-    if not active_cell or not table_data or not table_suffix:
-        return [], {'display': 'none'}
-    
-    row_index = active_cell['row']
-    
-    # 해당 행의 비디오 데이터 확인
-    if row_index < len(table_data):
-        row_data = table_data[row_index]
-        video_cell_value = row_data.get('video_url', '')
-        if video_cell_value and ('📹' in video_cell_value):
-            # 저장된 실제 URL 찾기
-            video_id = f"video_{table_suffix}_{row_index}"
-            actual_url = video_data.get(video_id)
+def update_table_page(page_current, page_size, sort_by, filter_query, table_state, columns, data_version):
+    if not table_state:
+        return dash.no_update, dash.no_update, dash.no_update
+    
+    # 테이블 생성 시와 같은 필터 상태로 행을 선택 (새 데이터가 반영된 경우 새 행 포함)
+    rows = select_table_rows(table_state)
+    count_text = f"# of {'Paired ' if table_state.get('pair') else ''}Test Cases: {len(rows)}"
+    
+    if not SERVER_SIDE_TABLE:
+        # 브라우저에서 페이지/정렬/필터를 처리하므로 필터 상태/컬럼/데이터가 바뀐 경우에만 전체 행을 다시 전송
+        triggered_props = {prop_id.rsplit('.', 1)[1] for prop_id in ctx.triggered_prop_ids}
+        if triggered_props <= {'page_current', 'page_size', 'sort_by', 'filter_query'}:
+            return dash.no_update, dash.no_update, dash.no_update
+        display_df = engine.gather(rows, [col['id'] for col in columns] + ['test_case_id'])
+        render_media_cells(display_df)
+        render_diff_cells(display_df, table_state, 0)
+        return get_table_records(display_df), dash.no_update, count_text
+    
+    # 테이블 필터/정렬 적용
+    rows = engine.query(rows, filter_query)
+    rows = engine.sort(rows, sort_by)
+    
+    # 현재 페이지 행과 표시 컬럼만 읽어서 렌더링
+    page_rows = engine.page(rows, page_current, page_size)
+    display_df = engine.gather(page_rows, [col['id'] for col in columns] + ['test_case_id'])
+    render_media_cells(display_df)
+    render_diff_cells(display_df, table_state, (page_current or 0) * page_size)
+    
+    return get_table_records(display_df), max(1, math.ceil(len(rows) / page_size)), count_text
+
+# 오디오 플레이어 모달 생성
+def create_audio_modal(actual_url, table_suffix, row_index):
+    filename = extract_filename_from_url(actual_url)
+    
+    modal_content = html.Div([
+        html.Div([
+            html.Div([
+                html.H3("Audio Player", style={'margin': '0', 'color': '#333'}),
+                html.Button("✕", 
+                          id={'type': 'close-audio-modal', 'index': f"close_{table_suffix}_{row_index}"}, 
+                          style={'background': 'none', 'border': 'none', 
+                                'font-size': '20px', 'cursor': 'pointer',
+                                'float': 'right', 'color': '#666'})
+            ], style={'display': 'flex', 'justify-content': 'space-between', 
+                     'align-items': 'center', 'margin-bottom': '20px', 
+                     'border-bottom': '1px solid #eee', 'padding-bottom': '10px'}),
             
-            if actual_url:
-                filename = extract_filename_from_url(actual_url)
-                
-                # 비디오 플레이어 컴포넌트
-                if DASH_PLAYER_AVAILABLE:
-                    video_player = dp.DashPlayer(
-                        id=f'video-player-{table_suffix}-{row_index}',
-                        url=actual_url,
-                        controls=True,
-                        width="100%",
-                        height="400px",
-                        style={'margin-bottom': '15px'}
-                    )
-                else:
-                    # dash_player가 없으면 HTML video 태그 사용
-                    video_player = html.Video(
-                        src=actual_url,
-                        controls=True,
-                        style={'width': '100%', 'height': '400px', 'margin-bottom': '15px'}
-                    )
-                
-                # 비디오 플레이어 모달 생성
-                modal_content = html.Div([
-                    html.Div([
-                        html.Div([
-                            html.H3("Video Player", style={'margin': '0', 'color': '#333'}),
-                            html.Button("✕", 
-                                      id={'type': 'close-video-modal', 'index': f"close_{table_suffix}_{row_index}"}, 
-                                      style={'background': 'none', 'border': 'none', 
-                                            'font-size': '20px', 'cursor': 'pointer',
-                                            'float': 'right', 'color': '#666'})
-                        ], style={'display': 'flex', 'justify-content': 'space-between', 
-                                 'align-items': 'center', 'margin-bottom': '20px', 
-                                 'border-bottom': '1px solid #eee', 'padding-bottom': '10px'}),
-                        
-                        # 비디오 플레이어
-                        video_player,
-                        
-                        # 추가 정보
-                        html.Div([
-                            html.P(f"File: {filename}", style={'margin': '5px 0', 'color': '#333', 'font-weight': 'bold'}),
-                            html.P(f"Row: {row_index + 1}", style={'margin': '5px 0', 'color': '#666'}),
-                            html.P(f"Table: {table_suffix.title()}", style={'margin': '5px 0', 'color': '#666'}),
-                            html.P(f"URL: {actual_url}", style={'margin': '5px 0', 'color': '#888', 'font-size': '12px', 'word-break': 'break-all'})
-                        ])
-                        
-                    ], style={
-                        'background': 'white',
-                        'padding': '25px',
-                        'border-radius': '10px',
-                        'box-shadow': '0 4px 20px rgba(0, 0, 0, 0.15)',
-                        'max-width': '800px',
-                        'width': '90%',
-                        'margin': '5% auto',
-                        'position': 'relative'
-                    })
-                ], style={
-                    'position': 'fixed',
-                    'top': '0',
-                    'left': '0',
-                    'width': '100%',
-                    'height': '100%',
-                    'background': 'rgba(0, 0, 0, 0.5)',
-                    'z-index': '1000',
-                    'display': 'flex',
-                    'align-items': 'flex-start',
-                    'justify-content': 'center',
-                    'animation': 'fadeIn 0.3s ease-in-out'
-                })
-                
-                return modal_content, {'display': 'block'}
+            # 오디오 플레이어
+            html.Audio(
+                src=media_url(actual_url),
+                controls=True,
+                autoPlay=False,
+                preload='metadata',
+                style={'width': '100%', 'margin-bottom': '15px'},
+                title=f'Audio file: {filename}'
+            ),
+            
+            # 추가 정보
+            html.Div([
+                html.P(f"File: {filename}", style={'margin': '5px 0', 'color': '#333', 'font-weight': 'bold'}),
+                html.P(f"Row: {row_index + 1}", style={'margin': '5px 0', 'color': '#666'}),
+                html.P(f"Table: {table_suffix.title()}", style={'margin': '5px 0', 'color': '#666'}),
+                html.P(f"URL: {actual_url}", style={'margin': '5px 0', 'color': '#888', 'font-size': '12px', 'word-break': 'break-all'})
+            ])
+            
+        ], style={
+            'background': 'white',
+            'padding': '25px',
+            'border-radius': '10px',
+            'box-shadow': '0 4px 20px rgba(0, 0, 0, 0.15)',
+            'max-width': '600px',
+            'width': '90%',
+            'margin': '10% auto',
+            'position': 'relative'
+        })
+    ], style={
+        'position': 'fixed',
+        'top': '0',
+        'left': '0',
+        'width': '100%',
+        'height': '100%',
+        'background': 'rgba(0, 0, 0, 0.5)',
+        'z-index': '1000',
+        'display': 'flex',
+        'align-items': 'flex-start',
+        'justify-content': 'center',
+        'animation': 'fadeIn 0.3s ease-in-out'
+    })
+    
+    return modal_content
+
+# 비디오 플레이어 모달 생성
+def create_video_modal(actual_url, table_suffix, row_index):
+    filename = extract_filename_from_url(actual_url)
+    
+    # 비디오 플레이어 컴포넌트
+    if DASH_PLAYER_AVAILABLE:
+        video_player = dp.DashPlayer(
+            id=f'video-player-{table_suffix}-{row_index}',
+            url=media_url(actual_url),
+            controls=True,
+            width="100%",
+            height="400px",
+            style={'margin-bottom': '15px'}
+        )
+    else:
+        # dash_player가 없으면 HTML video 태그 사용
+        video_player = html.Video(
+            src=media_url(actual_url),
+            controls=True,
+            style={'width': '100%', 'height': '400px', 'margin-bottom': '15px'}
+        )
+    
+    modal_content = html.Div([
+        html.Div([
+            html.Div([
+                html.H3("Video Player", style={'margin': '0', 'color': '#333'}),
+                html.Button("✕", 
+                          id={'type': 'close-video-modal', 'index': f"close_{table_suffix}_{row_index}"}, 
+                          style={'background': 'none', 'border': 'none', 
+                                'font-size': '20px', 'cursor': 'pointer',
+                                'float': 'right', 'color': '#666'})
+            ], style={'display': 'flex', 'justify-content': 'space-between', 
+                     'align-items': 'center', 'margin-bottom': '20px', 
+                     'border-bottom': '1px solid #eee', 'padding-bottom': '10px'}),
+            
+            # 비디오 플레이어
+            video_player,
+            
+            # 추가 정보
+            html.Div([
+                html.P(f"File: {filename}", style={'margin': '5px 0', 'color': '#333', 'font-weight': 'bold'}),
+                html.P(f"Row: {row_index + 1}", style={'margin': '5px 0', 'color': '#666'}),
+                html.P(f"Table: {table_suffix.title()}", style={'margin': '5px 0', 'color': '#666'}),
+                html.P(f"URL: {actual_url}", style={'margin': '5px 0', 'color': '#888', 'font-size': '12px', 'word-break': 'break-all'})
+            ])
+            
+        ], style={
+            'background': 'white',
+            'padding': '25px',
+            'border-radius': '10px',
+            'box-shadow': '0 4px 20px rgba(0, 0, 0, 0.15)',
+            'max-width': '800px',
+            'width': '90%',
+            'margin': '5% auto',
+            'position': 'relative'
+        })
+    ], style={
+        'position': 'fixed',
+        'top': '0',
+        'left': '0',
+        'width': '100%',
+        'height': '100%',
+        'background': 'rgba(0, 0, 0, 0.5)',
+        'z-index': '1000',
+        'display': 'flex',
+        'align-items': 'flex-start',
+        'justify-content': 'center',
+        'animation': 'fadeIn 0.3s ease-in-out'
+    })
+    
+    return modal_content
+
+# 이미지 뷰어 모달 생성
+def create_image_modal(actual_url, table_suffix, row_index):
+    filename = extract_filename_from_url(actual_url)
+    
+    modal_content = html.Div([
+        html.Div([
+            html.Div([
+                html.H3("Image Viewer", style={'margin': '0', 'color': '#333'}),
+                html.Button("✕", 
+                          id={'type': 'close-image-modal', 'index': f"close_{table_suffix}_{row_index}"}, 
+                          style={'background': 'none', 'border': 'none', 
+                                'font-size': '20px', 'cursor': 'pointer',
+                                'float': 'right', 'color': '#666'})
+            ], style={'display': 'flex', 'justify-content': 'space-between', 
+                     'align-items': 'center', 'margin-bottom': '20px', 
+                     'border-bottom': '1px solid #eee', 'padding-bottom': '10px'}),
+            
+            # 이미지 표시
+            html.Div([
+                html.Img(
+                    src=media_url(actual_url),
+                    style={
+                        'max-width': '100%',
+                        'max-height': '500px',
+                        'width': 'auto',
+                        'height': 'auto',
+                        'border-radius': '8px',
+                        'box-shadow': '0 2px 10px rgba(0,0,0,0.1)'
+                    }
+                )
+            ], style={'text-align': 'center', 'margin-bottom': '15px'}),
+            
+            # 추가 정보
+            html.Div([
+                html.P(f"File: {filename}", style={'margin': '5px 0', 'color': '#333', 'font-weight': 'bold'}),
+                html.P(f"Row: {row_index + 1}", style={'margin': '5px 0', 'color': '#666'}),
+                html.P(f"Table: {table_suffix.title()}", style={'margin': '5px 0', 'color': '#666'}),
+                html.P(f"URL: {actual_url}", style={'margin': '5px 0', 'color': '#888', 'font-size': '12px', 'word-break': 'break-all'})
+            ])
+            
+        ], style={
+            'background': 'white',
+            'padding': '25px',
+            'border-radius': '10px',
+            'box-shadow': '0 4px 20px rgba(0, 0, 0, 0.15)',
+            'max-width': '700px',
+            'width': '90%',
+            'margin': '5% auto',
+            'position': 'relative'
+        })
+    ], style={
+        'position': 'fixed',
+        'top': '0',
+        'left': '0',
+        'width': '100%',
+        'height': '100%',
+        'background': 'rgba(0, 0, 0, 0.5)',
+        'z-index': '1000',
+        'display': 'flex',
+        'align-items': 'flex-start',
+        'justify-content': 'center',
+        'animation': 'fadeIn 0.3s ease-in-out'
+    })
     
-    return [], {'display': 'none'}
+    return modal_content
 
-# 이미지 셀 클릭 이벤트 처리
+# 미디어 셀 클릭 이벤트 처리
+# 클릭된 테이블의 active_cell과 행 id만 확인하여 해당 미디어 모달을 표시하고 나머지 모달은 닫음
 @app.callback(
+    Output('audio-modal', 'children'),
+    Output('audio-modal', 'style'),
+    Output('video-modal', 'children'),
+    Output('video-modal', 'style'),
     Output('image-modal', 'children'),
     Output('image-modal', 'style'),
-    [Input({'type': 'results-table', 'suffix': ALL}, 'active_cell')],
-    [State({'type': 'results-table', 'suffix': ALL}, 'data'),
-     State({'type': 'results-table', 'suffix': ALL}, 'id'),
-     State('image-data-store', 'data')],
+    Input({'type': 'results-table', 'suffix': ALL}, 'active_cell'),
     prevent_initial_call=True
 )
-def handle_image_cell_click(active_cells, table_data_list, table_ids, image_data):
-    
-    # 클릭된 테이블과 셀 찾기
-    active_cell = None
-    table_data = None
-    table_suffix = None
-    
-    for i, cell in enumerate(active_cells):
-        if cell and cell.get('column_id') == 'image_url':
-            active_cell = cell
-            if i < len(table_data_list):
-                table_data = table_data_list[i]
-            if i < len(table_ids):
-                table_suffix = table_ids[i]['suffix']
-            break
-    
-    if not active_cell or not table_data or not table_suffix:
-        return [], {'display': 'none'}
-    
-    row_index = active_cell['row']
-    
-    # 해당 행의 이미지 데이터 확인
-    if row_index < len(table_data):
-        row_data = table_data[row_index]
-        image_cell_value = row_data.get('image_url', '')
-        # 썸네일 또는 아이콘 텍스트 확인
-        if image_cell_value and ('img' in image_cell_value or '🖼️' in image_cell_value):
-            # 저장된 실제 URL 찾기
-            image_id = f"image_{table_suffix}_{row_index}"
-            actual_url = image_data.get(image_id)
-            
-            if actual_url:
-                filename = extract_filename_from_url(actual_url)
-                
-                # 이미지 뷰어 모달 생성
-                modal_content = html.Div([
-                    html.Div([
-                        html.Div([
-                            html.H3("Image Viewer", style={'margin': '0', 'color': '#333'}),
-                            html.Button("✕", 
-                                      id={'type': 'close-image-modal', 'index': f"close_{table_suffix}_{row_index}"}, 
-                                      style={'background': 'none', 'border': 'none', 
-                                            'font-size': '20px', 'cursor': 'pointer',
-                                            'float': 'right', 'color': '#666'})
-                        ], style={'display': 'flex', 'justify-content': 'space-between', 
-                                 'align-items': 'center', 'margin-bottom': '20px', 
-                                 'border-bottom': '1px solid #eee', 'padding-bottom': '10px'}),
-                        
-                        # 이미지 표시
-                        html.Div([
-                            html.Img(
-                                src=actual_url,
-                                style={
-                                    'max-width': '100%',
-                                    'max-height': '500px',
-                                    'width': 'auto',
-                                    'height': 'auto',
-                                    'border-radius': '8px',
-                                    'box-shadow': '0 2px 10px rgba(0,0,0,0.1)'
-                                }
-                            )
-                        ], style={'text-align': 'center', 'margin-bottom': '15px'}),
-                        
-                        # 추가 정보
-                        html.Div([
-                            html.P(f"File: {filename}", style={'margin': '5px 0', 'color': '#333', 'font-weight': 'bold'}),
-                            html.P(f"Row: {row_index + 1}", style={'margin': '5px 0', 'color': '#666'}),
-                            html.P(f"Table: {table_suffix.title()}", style={'margin': '5px 0', 'color': '#666'}),
-                            html.P(f"URL: {actual_url}", style={'margin': '5px 0', 'color': '#888', 'font-size': '12px', 'word-break': 'break-all'})
-                        ])
-                        
-                    ], style={
-                        'background': 'white',
-                        'padding': '25px',
-                        'border-radius': '10px',
-                        'box-shadow': '0 4px 20px rgba(0, 0, 0, 0.15)',
-                        'max-width': '700px',
-                        'width': '90%',
-                        'margin': '5% auto',
-                        'position': 'relative'
-                    })
-                ], style={
-                    'position': 'fixed',
-                    'top': '0',
-                    'left': '0',
-                    'width': '100%',
-                    'height': '100%',
-                    'background': 'rgba(0, 0, 0, 0.5)',
-                    'z-index': '1000',
-                    'display': 'flex',
-                    'align-items': 'flex-start',
-                    'justify-content': 'center',
-                    'animation': 'fadeIn 0.3s ease-in-out'
-                })
-                
-                return modal_content, {'display': 'block'}
+def handle_media_cell_click(active_cells):
+    create_modal = {'audio_url': create_audio_modal, 'video_url': create_video_modal, 'image_url': create_image_modal}
+    modals = {media_type: ([], {'display': 'none'}) for media_type in create_modal}
+    
+    table_id = ctx.triggered_id
+    active_cell = ctx.triggered[0]['value'] if table_id else None
+    media_type = active_cell.get('column_id') if active_cell else None
+    
+    # 오디오 플레이어가 테이블에 직접 표시되는 경우 오디오 모달 비활성화
+    if media_type in create_modal and not (media_type == 'audio_url' and SHOW_AUDIO_PLAYER_IN_TABLE):
+        # 클릭한 행의 실제 URL을 행 id(test_case_id)로 저장소에서 조회
+        actual_url = get_media_url(active_cell.get('row_id'), media_type)
+        if actual_url:
+            modal_content = create_modal[media_type](actual_url, table_id['suffix'], active_cell['row'])
+            modals[media_type] = (modal_content, {'display': 'block'})
     
-    return [], {'display': 'none'}
+    return [value for modal in modals.values() for value in modal]
 
 # 모달 닫기 콜백들
 @app.callback(
@@ -1070,16 +1515,57 @@ def close_image_modal(n_clicks_list, current_style):
         return {'display': 'none'}
     return current_style or {'display': 'block'}
 
+# 요약이 있는 그룹 번호 (조작 변인 값 순서로 정렬)
+def get_summary_groups(summary):
+    return sorted(summary.present(), key=lambda g: summary.groups[g])
+
+# 그룹별 평균 DataFrame (막대/선 차트용)
+def get_summary_means(summary, target_var, dependent_var):
+    groups = get_summary_groups(summary)
+    return pd.DataFrame({target_var: [summary.groups[g] for g in groups],
+                         dependent_var: summary.mean()[groups]})
+
+# 미리 계산한 분위수로 박스 플롯 생성 (수염은 1.5 IQR 이내에서 최소/최대값까지)
+def create_summary_box(summary, target_var, dependent_var):
+    groups = [g for g in get_summary_groups(summary) if summary.count[g] > 0]
+    q1, median, q3 = (summary.quantile(q)[groups] for q in (0.25, 0.5, 0.75))
+    iqr = q3 - q1
+    fig = go.Figure(go.Box(
+        x=[summary.groups[g] for g in groups],
+        q1=q1, median=median, q3=q3, mean=summary.mean()[groups],
+        lowerfence=np.maximum(summary.minimum[groups], q1 - 1.5 * iqr),
+        upperfence=np.minimum(summary.maximum[groups], q3 + 1.5 * iqr),
+        name=dependent_var
+    ))
+    fig.update_layout(title=f'{dependent_var} by {target_var} (Box Plot)',
+                      xaxis_title=target_var, yaxis_title=dependent_var)
+    return fig
+
+# 분위수 스케치를 같은 간격 구간으로 나눈 행 수로 히스토그램 생성 (조작 변인 값별로 쌓아서 표시)
+def create_summary_histogram(summary, target_var, dependent_var):
+    edges, hist = summary.histogram()
+    centers = (edges[:-1] + edges[1:]) / 2
+    widths = np.diff(edges)
+    fig = go.Figure([
+        go.Bar(x=centers, y=hist[g], width=widths, name=str(summary.groups[g]))
+        for g in get_summary_groups(summary)
+    ])
+    fig.update_layout(title=f'{dependent_var} Distribution by {target_var}', barmode='stack', bargap=0,
+                      xaxis_title=dependent_var, yaxis_title='count', legend_title_text=target_var)
+    return fig
+
 # 차트 생성 콜백
-@app.callback(
+@heavy_callback(
+    'charts',
     Output('charts-container', 'children'),
     [Input('target-var-dropdown', 'value'),
      Input('target-values-dropdown', 'value'),
      Input('dependent-var-dropdown', 'value'),
      Input('chart-type-checklist', 'value'),
-     Input('control-values-store', 'data')]
+     Input('control-values-store', 'data'),
+     Input('data-version-store', 'data')]
 )
-def update_charts(target_var, target_values, dependent_var, chart_types, control_dict):
+def update_charts(set_progress, target_var, target_values, dependent_var, chart_types, control_dict, data_version):
     if not SHOW_VISUALIZATION_METRIC:
         return []
         
@@ -1089,40 +1575,45 @@ def update_charts(target_var, target_values, dependent_var, chart_types, control
     if not control_dict:
         control_dict = {}
     
-    # 데이터 필터링
-    filtered_df = df.copy()
-    
-    # 조작 변인 필터링
-    filtered_df = filtered_df[filtered_df[target_var].isin(target_values)]
+    # 조작 변인 및 통제 변인 조건
+    conditions = get_control_conditions(control_dict)
     
-    # 통제 변인 필터링
-    for var, value in control_dict.items():
-        if value is not None and value != 'any':
-            filtered_df = filtered_df[filtered_df[var] == value]
+    # 막대/선/박스/히스토그램은 미리 집계한 큐브에서 요약 (큐브 차원이 아닌 조건이면 선택된 행으로 계산)
+    set_progress(f"Summarizing {dependent_var}...")
+    summary = cube.summarize(conditions, target_var, target_values, dependent_var)
+    if summary is None:
+        summary_rows = engine.select(conditions, target_var, target_values)
+        summary = cube.summarize_frame(engine.gather(summary_rows, [target_var, dependent_var]),
+                                       target_var, target_values, dependent_var)
     
-    if len(filtered_df) == 0:
+    if summary.rows.sum() == 0:
         return [html.P("No data available to generate charts.")]
     
     charts = []
     
-    for chart_type in chart_types:
+    for i, chart_type in enumerate(chart_types, 1):
+        set_progress(f"Building {chart_type} chart ({i}/{len(chart_types)})...")
         if chart_type == 'box':
-            fig = px.box(filtered_df, x=target_var, y=dependent_var, 
-                        title=f'{dependent_var} by {target_var} (Box Plot)')
+            fig = create_summary_box(summary, target_var, dependent_var)
         elif chart_type == 'bar':
-            avg_df = filtered_df.groupby(target_var)[dependent_var].mean().reset_index()
+            avg_df = get_summary_means(summary, target_var, dependent_var)
             fig = px.bar(avg_df, x=target_var, y=dependent_var, 
                         title=f'Average {dependent_var} by {target_var}')
         elif chart_type == 'scatter':
-            fig = px.scatter(filtered_df, x=target_var, y=dependent_var, 
-                           title=f'{dependent_var} by {target_var} (Scatter Plot)')
+            # 산점도만 선택된 행을 읽음 (점이 많으면 샘플링하여 figure 크기를 제한)
+            sampled_rows, total_rows = engine.sample(conditions, target_var, target_values, MAX_SCATTER_POINTS)
+            filtered_df = engine.gather(sampled_rows, [target_var, dependent_var])
+            title = f'{dependent_var} by {target_var} (Scatter Plot)'
+            if len(sampled_rows) < total_rows:
+                title += f' - {len(sampled_rows):,} of {total_rows:,} points'
+            fig = px.scatter(filtered_df, x=target_var, y=dependent_var, title=title,
+                           render_mode='webgl' if len(filtered_df) >= WEBGL_MIN_POINTS else 'svg')
         elif chart_type == 'line':
-            avg_df = filtered_df.groupby(target_var)[dependent_var].mean().reset_index()
+            avg_df = get_summary_means(summary, target_var, dependent_var)
             fig = px.line(avg_df, x=target_var, y=dependent_var, 
                          title=f'Average {dependent_var} by {target_var}')
         elif chart_type == 'histogram':
-            fig = px.histogram(filtered_df, x=dependent_var, color=target_var, 
-                             title=f'{dependent_var} Distribution by {target_var}')
+            fig = create_summary_histogram(summary, target_var, dependent_var)
         
         fig.update_layout(height=400, margin=dict(l=20, r=20, t=40, b=20))
         
@@ -1133,15 +1624,81 @@ def update_charts(target_var, target_values, dependent_var, chart_types, control
     
     return charts
 
-# 휴먼 라벨링 저장 콜백
+# 좌우 테이블 스크롤 동기화 (테이블이 다시 그려져도 유지되도록 문서에 한 번만 등록)
+# 한쪽 테이블 안에서 스크롤된 요소와 같은 위치의 요소를 다른 쪽에서 찾아 스크롤 위치를 맞춤
+app.clientside_callback(
+    """
+    function(children) {
+        if (window.syncScrollInstalled) {
+            return window.dash_clientside.no_update;
+        }
+        window.syncScrollInstalled = true;
+        let syncing = null;
+        document.addEventListener('scroll', function(e) {
+            const target = e.target;
+            if (target === syncing) {
+                syncing = null;
+                return;
+            }
+            const container = target.closest ? target.closest('.sync-scroll-table') : null;
+            const containers = document.querySelectorAll('.sync-scroll-table');
+            if (!container || containers.length !== 2) {
+                return;
+            }
+            const other = containers[0] === container ? containers[1] : containers[0];
+            const index = Array.prototype.indexOf.call(container.getElementsByTagName(target.tagName), target);
+            const peer = target === container ? other : other.getElementsByTagName(target.tagName)[index];
+            if (peer && (peer.scrollTop !== target.scrollTop || peer.scrollLeft !== target.scrollLeft)) {
+                syncing = peer;
+                peer.scrollTop = target.scrollTop;
+                peer.scrollLeft = target.scrollLeft;
+            }
+        }, true);
+        return window.dash_clientside.no_update;
+    }
+    """,
+    Output('hidden-div', 'children', allow_duplicate=True),
+    Input('comparison-tables-container', 'children'),
+    prevent_initial_call=True
+)
+
+# 휴먼 라벨 변경 감지 (사용자가 편집한 셀만 서버로 전송)
+# data_timestamp는 사용자 편집 때만 바뀌므로 서버의 페이지/정렬/새 데이터 갱신으로는 전송하지 않음
+app.clientside_callback(
+    """
+    function(dataTimestamp, data, activeCell) {
+        if (!data || !activeCell || activeCell.column_id !== 'human_label') {
+            return window.dash_clientside.no_update;
+        }
+        const row = data.find(row => row.id === activeCell.row_id);
+        if (!row) {
+            return window.dash_clientside.no_update;
+        }
+        return [{id: row.id, human_label: row.human_label}];
+    }
+    """,
+    Output({'type': 'label-changes', 'suffix': MATCH}, 'data'),
+    Input({'type': 'results-table', 'suffix': MATCH}, 'data_timestamp'),
+    State({'type': 'results-table', 'suffix': MATCH}, 'data'),
+    State({'type': 'results-table', 'suffix': MATCH}, 'active_cell'),
+    prevent_initial_call=True
+)
+
+# 휴먼 라벨링 저장 콜백 (변경된 셀만 저장 대기열에 추가)
 @app.callback(
     Output('hidden-div', 'children'),
-    [Input({'type': 'results-table', 'suffix': ALL}, 'data')],
+    [Input({'type': 'label-changes', 'suffix': ALL}, 'data')],
     prevent_initial_call=True
 )
-def save_human_labels(table_data_list):
-    # 여기서 human_label 변경사항을 저장할 수 있습니다
-    # 실제 구현에서는 데이터베이스나 파일에 저장하면 됩니다
+def save_human_labels(label_changes_list):
+    for triggered in ctx.triggered:
+        changes = {change['id']: change['human_label'] for change in triggered['value'] or []}
+        # 이미 저장된 라벨과 같은 값은 다시 저장하지 않음 (다른 작업자의 라벨을 현재 작업자로 덮어쓰지 않음)
+        saved_labels = label_store.get_many(list(changes))
+        changes = {test_case_id: label for test_case_id, label in changes.items()
+                   if test_case_id not in saved_labels or saved_labels[test_case_id] != label}
+        if changes:
+            label_store.save(changes, annotator=flask.request.remote_addr)
     return ""
 
 # CSS 스타일 추가
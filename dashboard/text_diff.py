@@ -0,0 +1,157 @@
+import difflib
+import hashlib
+import multiprocessing
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+# diff 결과 LRU 캐시 최대 항목 수
+DIFF_CACHE_SIZE = 10000
+# diff를 계산하는 워커 프로세스 수 (0이면 워커 없이 요청 스레드에서 계산, 서버 워커마다 이 수만큼 생성됨)
+DIFF_WORKERS = 0
+# 캐시에 없는 쌍이 이 개수 이하면 워커로 보내지 않고 바로 계산 (테이블 한 페이지는 항상 바로 계산)
+DIFF_INLINE_MAX = 64
+# 단어 수가 이보다 많은 텍스트는 줄 단위로 비교 (비교 시간이 길이의 제곱에 비례할 수 있음)
+DIFF_MAX_WORDS = 5000
+
+# 단어와 그 뒤의 공백을 한 토큰으로 분리 (공백 변경은 앞 단어의 변경으로 표시)
+_TOKEN_PATTERN = re.compile(r'\S+\s*|\s+')
+# HTML/마크다운으로 해석될 수 있는 기호 (diff는 마크다운 셀에 표시되므로 문자 그대로 보이도록 엔티티로 변환)
+_ESCAPES = {ord(c): f'&#{ord(c)};' for c in '&<>"\'\\`*_{}[]()#+-.!|~=^'}
+_ESCAPES[ord('\n')] = '<br>'
+
+
+def _tokens(text):
+    words = _TOKEN_PATTERN.findall(text)
+    return words if len(words) <= DIFF_MAX_WORDS else text.splitlines(keepends=True)
+
+
+def _escape(text):
+    # 줄바꿈도 <br>로 바꾸어 전체를 한 줄의 인라인 HTML로 만듦 (마크다운 블록으로 나뉘지 않음)
+    return text.translate(_ESCAPES)
+
+
+def diff_html(left, right):
+    """
+    left → right 변경을 표시한 HTML (삭제는 <del>, 추가는 <ins>).
+    텍스트는 HTML/마크다운 기호를 모두 이스케이프하므로 테이블 마크다운의 html 옵션에서 원문 그대로 보입니다.
+    """
+    left = left if isinstance(left, str) else ''
+    right = right if isinstance(right, str) else ''
+    a, b = _tokens(left), _tokens(right)
+    parts = []
+    for tag, i1, i2, j1, j2 in difflib.SequenceMatcher(None, a, b, autojunk=False).get_opcodes():
+        if tag == 'equal':
+            parts.append(_escape(''.join(a[i1:i2])))
+            continue
+        if i2 > i1:
+            parts.append('<del style="background:#ffebe9;color:#cf222e">'
+                         f'{_escape("".join(a[i1:i2]))}</del>')
+        if j2 > j1:
+            parts.append('<ins style="background:#dafbe1;color:#116329;text-decoration:none">'
+                         f'{_escape("".join(b[j1:j2]))}</ins>')
+    return ''.join(parts)
+
+
+def _diff_batch(pairs):
+    # 워커 프로세스에서 실행 (모듈 최상위 함수여야 전달 가능)
+    return [diff_html(left, right) for left, right in pairs]
+
+
+def _digest(text):
+    return hashlib.blake2b(text.encode('utf-8') if isinstance(text, str) else b'', digest_size=16).digest()
+
+
+class TextDiffer:
+    """
+    텍스트 쌍의 diff HTML 계산기.
+
+    결과는 두 텍스트의 해시를 키로 LRU 캐시에 보관하므로 같은 쌍은 다시 계산하지 않습니다.
+    max_workers가 1 이상이면 생성할 때 고정 크기 워커 풀을 만들어 inline_max보다 많은 쌍을 나누어 계산합니다.
+    워커는 스레드가 있는 서버 프로세스를 fork하지 않도록 forkserver(없으면 spawn)로 시작하므로,
+    스크립트로 실행한 경우 워커가 메인 모듈을 다시 읽습니다.
+    """
+
+    def __init__(self, max_entries=DIFF_CACHE_SIZE, max_workers=DIFF_WORKERS, inline_max=DIFF_INLINE_MAX):
+        self.max_entries = max_entries
+        self.max_workers = max_workers
+        self.inline_max = inline_max
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor = self._create_executor() if max_workers else None
+        self.hits = 0
+        self.misses = 0
+
+    def diff_many(self, pairs):
+        """(left, right) 텍스트 쌍 목록의 diff HTML 목록"""
+        keys = [(_digest(left), _digest(right)) for left, right in pairs]
+        results = [None] * len(pairs)
+        missing = {}
+        with self._lock:
+            for i, key in enumerate(keys):
+                cached = self._entries.get(key)
+                if cached is not None:
+                    self._entries.move_to_end(key)
+                    results[i] = cached
+                    self.hits += 1
+                else:
+                    # 같은 쌍이 여러 번 있으면 한 번만 계산
+                    missing.setdefault(key, []).append(i)
+            self.misses += len(missing)
+
+        if missing:
+            positions = list(missing.values())
+            computed = self._compute([pairs[indices[0]] for indices in positions])
+            with self._lock:
+                for key, indices, value in zip(missing, positions, computed):
+                    self._entries[key] = value
+                    self._entries.move_to_end(key)
+                    for i in indices:
+                        results[i] = value
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return results
+
+    def _compute(self, pairs):
+        with self._lock:
+            executor = self._executor
+        if executor is None or len(pairs) <= self.inline_max:
+            return _diff_batch(pairs)
+
+        # 워커 수만큼 나누어 한 번에 전송 (쌍마다 전송하면 프로세스 간 통신 비용이 커짐)
+        chunk_size = -(-len(pairs) // self.max_workers)
+        chunks = [pairs[i:i + chunk_size] for i in range(0, len(pairs), chunk_size)]
+        try:
+            return [value for chunk in executor.map(_diff_batch, chunks) for value in chunk]
+        except BrokenProcessPool:
+            # 워커가 비정상 종료되면 풀을 새로 만들고 이번 요청은 바로 계산
+            with self._lock:
+                if self._executor is executor:
+                    self._executor = self._create_executor()
+            executor.shutdown(wait=False)
+            return _diff_batch(pairs)
+
+    def _create_executor(self):
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+        return ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context)
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def stats(self):
+        """모니터링용 캐시 통계"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+            }
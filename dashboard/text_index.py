@@ -0,0 +1,214 @@
+import json
+import os
+import re
+import threading
+from functools import reduce
+
+import numpy as np
+import pandas as pd
+
+# 필터 조건에서 검색어를 나타내는 키 (독립변수 이름과 겹치지 않도록 밑줄로 시작)
+TEXT_SEARCH_KEY = '_text_search'
+# 인덱스를 만들 때 한 번에 읽는 행 수
+TEXT_INDEX_BATCH_ROWS = 10000
+# 세그먼트가 이 개수를 넘으면 하나로 병합 (수집할 때마다 작은 세그먼트가 추가됨)
+MAX_SEGMENTS = 8
+# 인덱스 저장 시 필드 목록을 기록하는 파일
+TEXT_MANIFEST_FILE = 'text_index.json'
+
+# 큰따옴표로 묶은 구절 또는 공백으로 구분한 단어
+_TERM_PATTERN = re.compile(r'"([^"]+)"|(\S+)')
+
+
+def parse_query(query):
+    """검색어를 소문자로 바꾼 검색어 목록으로 분리 (모든 검색어를 포함하는 행을 찾음)"""
+    return [(phrase or word).casefold() for phrase, word in _TERM_PATTERN.findall(query or '')]
+
+
+def _ranges(values, starts, ends):
+    # values[starts[i]:ends[i]]들을 한 배열로 이어 붙임 (구간이 많아도 파이썬 반복 없이)
+    lengths = ends - starts
+    positions = np.repeat(starts - np.concatenate(([0], np.cumsum(lengths)[:-1])), lengths) \
+        + np.arange(lengths.sum())
+    return values[positions]
+
+
+class _Segment:
+    """
+    단어 → 행 번호 목록 (단어 목록 + 단어별 오프셋 + 행 번호 배열).
+    단어는 공백으로 나눈 조각이므로, 공백이 없는 검색 조각은 항상 한 단어 안에 들어 있습니다.
+    """
+
+    def __init__(self, codes, words, rows):
+        # 단어 순서로 정렬 (같은 단어 안에서는 행 번호 순서 유지), 행 번호는 int32로 보관
+        order = np.argsort(codes, kind='stable')
+        self.offsets = np.concatenate(([0], np.cumsum(np.bincount(codes, minlength=len(words)))))
+        self.rows = rows[order].astype(np.int32)
+        # 단어들을 줄바꿈으로 이어 붙인 문자열 (단어 목록의 부분 문자열 검색을 문자열 탐색 한 번으로 처리)
+        self.vocabulary = '\n'.join(words)
+        lengths = np.fromiter(map(len, words), dtype=np.int64, count=len(words))
+        self.word_starts = np.cumsum(lengths + 1) - (lengths + 1)
+
+    @classmethod
+    def load(cls, path, mmap_mode='r'):
+        """save로 저장한 세그먼트를 엶 (행 번호 배열은 메모리 매핑)"""
+        segment = cls.__new__(cls)
+        segment.offsets = np.load(path + '_offsets.npy')
+        segment.rows = np.asarray(np.load(path + '_rows.npy', mmap_mode=mmap_mode))
+        segment.word_starts = np.load(path + '_word_starts.npy')
+        with open(path + '_vocabulary.txt', encoding='utf-8', newline='') as f:
+            segment.vocabulary = f.read()
+        return segment
+
+    def save(self, path):
+        np.save(path + '_offsets.npy', self.offsets)
+        np.save(path + '_rows.npy', self.rows)
+        np.save(path + '_word_starts.npy', self.word_starts)
+        with open(path + '_vocabulary.txt', 'w', encoding='utf-8', newline='') as f:
+            f.write(self.vocabulary)
+
+    @classmethod
+    def from_texts(cls, texts, offset):
+        """텍스트 목록(행 번호 offset부터)으로 세그먼트 생성 (행마다 같은 단어는 한 번만)"""
+        tokens, counts = [], []
+        for text in texts:
+            words = set(text.casefold().split()) if isinstance(text, str) else ()
+            tokens.extend(words)
+            counts.append(len(words))
+        codes, words = pd.factorize(np.array(tokens, dtype=object))
+        rows = np.repeat(np.arange(offset, offset + len(counts), dtype=np.int64), counts)
+        return cls(codes, words, rows)
+
+    @classmethod
+    def merge(cls, segments):
+        codes, words = pd.factorize(np.array([word for s in segments for word in s.words()], dtype=object))
+        # 세그먼트별 단어 코드 → 병합된 단어 코드
+        position = 0
+        posting_codes = []
+        for s in segments:
+            mapping = codes[position:position + len(s.word_starts)]
+            posting_codes.append(np.repeat(mapping, np.diff(s.offsets)))
+            position += len(s.word_starts)
+        return cls(np.concatenate(posting_codes), words, np.concatenate([s.rows for s in segments]))
+
+    def words(self):
+        return self.vocabulary.split('\n') if len(self.word_starts) else []
+
+    def containing(self, piece):
+        """piece를 포함하는 단어가 있는 행 번호 배열 (정렬됨)"""
+        positions = np.fromiter((m.start() for m in re.finditer(re.escape(piece), self.vocabulary)), dtype=np.int64)
+        matched = np.unique(np.searchsorted(self.word_starts, positions, side='right') - 1)
+        if len(matched) == 1:
+            return self.rows[self.offsets[matched[0]]:self.offsets[matched[0] + 1]]
+        return np.unique(_ranges(self.rows, self.offsets[matched], self.offsets[matched + 1]))
+
+    def __len__(self):
+        return len(self.rows)
+
+
+class TextIndex:
+    """
+    결과 텍스트 컬럼(answer, think 등)의 단어 역색인.
+
+    검색어를 공백으로 나눈 조각마다 그 조각을 포함하는 단어의 행을 모아 후보를 좁힌 뒤, 후보 행의 텍스트만 읽어
+    부분 문자열 포함 여부를 확인하므로 결과는 대소문자를 무시한 정확한 부분 문자열 검색과 같습니다.
+    새 행은 작은 세그먼트로 추가하고, 세그먼트가 많아지면 하나로 병합합니다.
+    """
+
+    def __init__(self, fields):
+        self.fields = list(fields)
+        self.num_rows = 0
+        self._segments = {field: [] for field in self.fields}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def build(cls, store, fields, batch_size=TEXT_INDEX_BATCH_ROWS):
+        """저장소의 텍스트 컬럼들로 인덱스 생성"""
+        text_index = cls([field for field in fields if field in store])
+        text_index.extend(store, 0, batch_size)
+        return text_index
+
+    def extend(self, store, start, batch_size=TEXT_INDEX_BATCH_ROWS):
+        """start 이후에 추가된 행만 읽어 인덱스에 반영"""
+        end = len(store)
+        with self._lock:
+            segments = {field: list(self._segments[field]) for field in self.fields}
+            for batch_start, texts_df in store.scan(self.fields, start, batch_size):
+                if batch_start >= end:
+                    break
+                texts_df = texts_df.loc[:end - 1]
+                for field in self.fields:
+                    segments[field].append(_Segment.from_texts(texts_df[field].tolist(), batch_start))
+
+            for field, field_segments in segments.items():
+                if len(field_segments) > MAX_SEGMENTS:
+                    segments[field] = [_Segment.merge(field_segments)]
+            # 새 세그먼트 목록을 모두 만든 뒤 한 번에 교체 (검색 중인 요청은 이전 목록을 그대로 사용)
+            self._segments = segments
+            self.num_rows = max(self.num_rows, end)
+
+    def save(self, directory):
+        """필드별로 세그먼트를 하나로 병합하여 디렉터리에 저장"""
+        segments = self._segments
+        for i, field in enumerate(self.fields):
+            field_segments = segments[field] or [_Segment.from_texts([], 0)]
+            merged = field_segments[0] if len(field_segments) == 1 else _Segment.merge(field_segments)
+            merged.save(os.path.join(directory, f'text_{i}'))
+        with open(os.path.join(directory, TEXT_MANIFEST_FILE), 'w', encoding='utf-8') as f:
+            json.dump({'num_rows': self.num_rows, 'fields': self.fields}, f)
+
+    @classmethod
+    def load(cls, directory, mmap_mode='r'):
+        """
+        save로 저장한 인덱스를 엶.
+        행 번호 배열을 메모리 매핑하므로 같은 파일을 연 프로세스들이 페이지 캐시를 공유합니다.
+        """
+        with open(os.path.join(directory, TEXT_MANIFEST_FILE), encoding='utf-8') as f:
+            manifest = json.load(f)
+        text_index = cls(manifest['fields'])
+        text_index.num_rows = manifest['num_rows']
+        for i, field in enumerate(text_index.fields):
+            text_index._segments[field] = [_Segment.load(os.path.join(directory, f'text_{i}'), mmap_mode)]
+        return text_index
+
+    def search(self, store, query, rows=None):
+        """
+        검색어를 모두 포함하는 행 번호 배열 (정렬됨).
+        검색어마다 인덱스의 어느 텍스트 컬럼에 포함되어도 되며, rows가 있으면 그 행들 중에서만 찾습니다.
+        """
+        rows = np.arange(self.num_rows) if rows is None else np.asarray(rows, dtype=np.int64)
+        if not self.fields:
+            return rows[:0]
+
+        segments = self._segments
+        for term in parse_query(query):
+            if len(rows) == 0:
+                break
+            rows = reduce(np.union1d, [self._search_field(store, segments[field], field, term, rows)
+                                       for field in self.fields])
+        return rows
+
+    def _search_field(self, store, segments, field, term, rows):
+        # 긴 조각부터 후보를 좁힘 (공백만 있는 구절은 모든 행이 후보)
+        candidates = rows
+        for piece in sorted(set(term.split()), key=len, reverse=True):
+            matched = np.concatenate([segment.containing(piece) for segment in segments] or [rows[:0]])
+            candidates = np.intersect1d(candidates, matched, assume_unique=True)
+            if len(candidates) == 0:
+                return candidates
+
+        # 조각이 모두 있어도 순서나 사이의 공백이 다를 수 있으므로 후보 행의 텍스트로 확인
+        texts = store.take(candidates, [field])[field].fillna('').astype(str)
+        matches = texts.str.casefold().str.contains(term, regex=False).to_numpy(dtype=bool)
+        return candidates[matches]
+
+    def stats(self):
+        """모니터링용 인덱스 통계"""
+        segments = self._segments
+        return {
+            'rows': self.num_rows,
+            'fields': {field: {'segments': len(segments[field]),
+                               'words': int(sum(len(s.word_starts) for s in segments[field])),
+                               'postings': int(sum(len(s) for s in segments[field]))}
+                       for field in self.fields},
+        }
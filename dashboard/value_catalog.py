@@ -0,0 +1,76 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+from bitmap_index import normalize_value
+
+
+class ValueCatalog:
+    """
+    컬럼별 고유값과 행 수 목록.
+
+    데이터 로드 시 한 번 만들어 두고, 데이터가 추가되면 새로 들어온 행만 읽어 갱신합니다.
+    드롭다운 옵션은 컬럼별로 미리 만들어 두므로 콜백에서는 조회만 합니다.
+    """
+
+    def __init__(self, columns):
+        self._columns = list(columns)
+        self.num_rows = 0
+        self._counts = {}
+        self._numeric = {}
+        self._options = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def build(cls, store, columns):
+        """저장소의 지정한 컬럼들에 대해 목록 생성"""
+        catalog = cls([col for col in columns if col in store])
+        catalog.refresh(store)
+        return catalog
+
+    def refresh(self, store):
+        """마지막 갱신 이후 추가된 행만 읽어 고유값/행 수를 갱신"""
+        with self._lock:
+            start = self.num_rows
+            if len(store) <= start:
+                return
+
+            for col in self._columns:
+                values = store.column(col)
+                self._add(col, values[start:])
+                self._numeric.setdefault(col, pd.api.types.is_numeric_dtype(values.dtype))
+            self.num_rows = len(store)
+
+    def _add(self, column, values):
+        codes, uniques = pd.factorize(values)
+        counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+
+        # 기존 값 뒤에 새 값을 처음 등장한 순서대로 추가
+        column_counts = self._counts.setdefault(column, {})
+        for value, count in zip(uniques, counts.tolist()):
+            value = normalize_value(value)
+            column_counts[value] = column_counts.get(value, 0) + count
+        self._options[column] = [{'label': str(val), 'value': val} for val in column_counts]
+
+    @property
+    def columns(self):
+        return list(self._columns)
+
+    def __contains__(self, column):
+        return column in self._counts
+
+    def values(self, column):
+        """컬럼의 고유값 목록 (처음 등장한 순서)"""
+        return list(self._counts.get(column, {}))
+
+    def counts(self, column):
+        """컬럼의 값 → 행 수"""
+        return dict(self._counts.get(column, {}))
+
+    def options(self, column):
+        """드롭다운 옵션 목록 ({'label', 'value'})"""
+        return self._options.get(column, [])
+
+    def is_numeric(self, column):
+        return self._numeric.get(column, False)